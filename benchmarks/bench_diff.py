@@ -0,0 +1,81 @@
+# Model diff benchmark: two synthetic snapshots of ~50k elements, the second edited at random (labels
+# changed, elements removed and added, relations rewired). Times diff_models() between them and
+# diff_states() (as-is vs to-be) on one, checks the diff found every edit, and fails (exit 1) over budget.
+#
+#   python benchmarks/bench_diff.py --capabilities 2900 --edits 500 --budget-s 2
+import argparse
+import random
+import sys
+import time
+
+from landscape import synthetic_model
+
+import leanix
+
+
+def edit(model, edits, seed=7):
+    # Apply edits random changes, spread over the four kinds; returns what was done for the check
+    rng = random.Random(seed)
+    ids = [id for id in model.elements if not id.startswith('T')]  # keep the roadmap schedulable
+    done = {'changed': set(), 'removed': set(), 'added': set(), 'rewired': 0}
+    for i in range(edits):
+        kind = i % 4
+        if kind == 0:
+            id = rng.choice(ids)
+            if id in model.elements and id not in done['added']:
+                model.update(id, label=model[id].label + ' v2')
+                done['changed'].add(id)
+        elif kind == 1:
+            id = rng.choice(ids)
+            if id in model.elements and id not in done['added']:
+                model.remove(id)
+                done['removed'].add(id)
+                done['changed'].discard(id)
+        elif kind == 2:
+            id = f'NEW_APP{i}'
+            model.add(id, 'application', f'New App {i}', 'application', 'to-be')
+            model.relate(id, 'RT1', 'uses')
+            done['added'].add(id)
+        else:
+            relation = rng.choice(model.relations)
+            model.unrelate(relation)
+            done['rewired'] += 1
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Model diff benchmark')
+    parser.add_argument('--capabilities', type=int, default=2900, help='landscape size (2900 ~ 50k elements)')
+    parser.add_argument('--edits', type=int, default=500)
+    parser.add_argument('--budget-s', type=float, default=2.0, help='bound on one diff')
+    args = parser.parse_args()
+
+    old = synthetic_model(args.capabilities)
+    new = synthetic_model(args.capabilities)
+    done = edit(new, args.edits)
+    print(f'{len(old.elements)} / {len(new.elements)} elements, {len(old.relations)} / {len(new.relations)} relations')
+
+    start = time.perf_counter()
+    diff = leanix.diff_models(old, new)
+    snapshot_s = time.perf_counter() - start
+    print(f'diff_models: {snapshot_s:.3f} s  {diff}')
+
+    start = time.perf_counter()
+    states = leanix.diff_states(new)
+    states_s = time.perf_counter() - start
+    print(f'diff_states: {states_s:.3f} s  {states}')
+
+    failed = False
+    for kind in ('changed', 'removed', 'added'):
+        found = {pair[1].id if kind == 'changed' else pair.id for pair in getattr(diff, kind)}
+        if found != done[kind]:
+            print(f'FAIL: {kind}: {len(found)} found, {len(done[kind])} expected')
+            failed = True
+    if max(snapshot_s, states_s) > args.budget_s:
+        print(f'FAIL: diff over the {args.budget_s:.1f} s budget')
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
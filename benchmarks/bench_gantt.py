@@ -0,0 +1,67 @@
+# Gantt benchmark: plot_gantt on a synthetic roadmap of N components with a few phases each.
+# Reports build + Agg draw time and the number of artists on the axes, which should stay flat
+# as N grows. Fails (exit 1) when the largest size goes over --budget-s.
+#
+#   python benchmarks/bench_gantt.py --sizes 100 1000 10000
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib  # noqa: E402
+
+matplotlib.use('Agg')
+
+import leanix  # noqa: E402
+
+PHASES = [('Deployed', 'As-Is'), ('Phased Out', 'As-Is'), ('Development', 'To-Be'), ('Parallel Run', 'To-Be'),
+          ('Go Live', 'To-Be')]
+
+
+def roadmap(rows, seed=42):
+    import pandas as pd
+
+    rng = random.Random(seed)
+    base = pd.Timestamp('2025-01-01')
+    data = []
+    while len(data) < rows:
+        component = f'Component{len(data):05d}'
+        day = rng.randrange(365)
+        for phase, kind in PHASES[:rng.randint(2, len(PHASES))]:
+            length = rng.randint(7, 90)
+            data.append((component, phase, base + pd.Timedelta(days=day), base + pd.Timedelta(days=day + length), kind))
+            day += length + 1
+    return leanix.roadmap_frame(data[:rows])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gantt renderer benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--budget-s', type=float, default=1.0)
+    args = parser.parse_args()
+
+    import matplotlib.pyplot as plt
+
+    print(f'{"rows":>8} {"plot s":>8} {"draw s":>8} {"artists":>8}')
+    seconds = 0.0
+    for n in args.sizes:
+        df = roadmap(n)
+        start = time.perf_counter()
+        fig = leanix.plot_gantt(df)
+        plotted = time.perf_counter()
+        fig.canvas.draw()
+        seconds = time.perf_counter() - start
+        artists = len(fig.axes[0].get_children())
+        print(f'{n:>8} {plotted - start:>8.3f} {seconds - (plotted - start):>8.3f} {artists:>8}')
+        plt.close(fig)
+    if seconds > args.budget_s:
+        print(f'FAIL: {args.sizes[-1]} rows took {seconds:.2f}s (budget {args.budget_s:.2f}s)')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+# Impact-analysis benchmark: ImpactIndex on a synthetic landscape with ~100k relationships.
+# Times the index build, the first query from the most shared platform (computes and memoises the impact
+# sets on the way), repeated queries, and an edit followed by a query (the incremental path). Fails
+# (exit 1) when a query goes over the interactive budget.
+#
+#   python benchmarks/bench_impact.py --capabilities 2800 --budget-ms 100
+import argparse
+import random
+import sys
+import time
+
+from landscape import synthetic_model
+
+import leanix
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Impact-analysis benchmark')
+    parser.add_argument('--capabilities', type=int, default=2800, help='landscape size (2800 ~ 100k relations)')
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--budget-ms', type=float, default=100, help='bound on any single query')
+    args = parser.parse_args()
+
+    model = synthetic_model(args.capabilities)
+    print(f'{len(model.elements)} elements, {len(model.relations)} relations')
+    rng = random.Random(42)
+    ids = list(model.elements)
+
+    build_s, index = timed(leanix.ImpactIndex, model)
+    sync_s, _ = timed(index._sync)
+    first_s, hit = timed(index.impacted, 'INF0')
+    print(f'index build: {(build_s + sync_s) * 1000:.1f} ms')
+    print(f'first query (INF0, {len(hit)} impacted): {first_s * 1000:.1f} ms')
+
+    worst, total = 0.0, 0.0
+    for _ in range(args.queries):
+        seconds, _ = timed(index.impacted, rng.choice(ids), types='capability')
+        worst, total = max(worst, seconds), total + seconds
+    print(f'{args.queries} random queries: {total / args.queries * 1e6:.0f} us mean, {worst * 1000:.1f} ms worst')
+
+    edit_worst = 0.0
+    for i in range(100):
+        app, infra = f'APP{rng.randrange(2 * args.capabilities)}', f'INF{rng.randrange(args.capabilities // 2)}'
+        relation = model.relate(app, infra, 'hosted_on')
+        seconds, _ = timed(index.impacted, infra, types='capability')
+        model.unrelate(relation)
+        seconds2, _ = timed(index.impacted, infra, types='capability')
+        edit_worst = max(edit_worst, seconds, seconds2)
+    print(f'edit + query: {edit_worst * 1000:.1f} ms worst')
+
+    worst_ms = max(first_s, worst, edit_worst) * 1000
+    if worst_ms > args.budget_ms:
+        print(f'FAIL: slowest query {worst_ms:.1f} ms over the {args.budget_ms:.0f} ms budget')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
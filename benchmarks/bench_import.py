@@ -0,0 +1,55 @@
+# Cold-import benchmark for leanix.py.
+# Runs `import leanix` in fresh interpreters and fails (exit 1) when the best time goes over budget
+# or when one of the heavy dependencies got imported eagerly again.
+#
+#   python benchmarks/bench_import.py --budget-ms 150 --runs 5
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('graphviz', 'IPython', 'matplotlib', 'pandas', 'numpy')
+
+PROBE = '''
+import sys, time
+start = time.perf_counter()
+import leanix
+elapsed = time.perf_counter() - start
+loaded = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed, ','.join(loaded))
+'''
+
+
+def measure(runs):
+    best, loaded = None, set()
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', PROBE.format(heavy=HEAVY_MODULES)], cwd=ROOT,
+                             capture_output=True, text=True, check=True).stdout.split()
+        elapsed = float(out[0])
+        best = elapsed if best is None else min(best, elapsed)
+        if len(out) > 1:
+            loaded.update(out[1].split(','))
+    return best, sorted(loaded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold-import benchmark for leanix.py')
+    parser.add_argument('--budget-ms', type=float, default=float(os.environ.get('LEANIX_IMPORT_BUDGET_MS', 150)))
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    best, loaded = measure(args.runs)
+    print(f'import leanix: {best * 1000:.1f} ms (best of {args.runs}, budget {args.budget_ms:.0f} ms)')
+    failed = False
+    if loaded:
+        print(f'FAIL: heavy modules imported eagerly: {", ".join(loaded)}')
+        failed = True
+    if best * 1000 > args.budget_ms:
+        print('FAIL: cold import over budget')
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+# User-journey batch benchmark: seeded synthetic journeys (a persona x channel grid) rendered three ways -
+# a new pyplot figure per journey (plot_user_journey + savefig + close), one reused JourneyRenderer, and
+# export_journeys() over a process pool - and reports the per-journey cost of each.
+#
+#   python benchmarks/bench_journeys.py --journeys 200 --jobs 4
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import leanix  # noqa: E402
+
+WORDS = "sync batch polling manual legacy delayed Oracle MSMQ retry event SNS Lambda DynamoDB replay".split()
+
+
+def synthetic_journeys(n, seed=42):
+    rng = random.Random(seed)
+    journeys = []
+    for i in range(n):
+        stages = [(f"Stage {s}", rng.randrange(len(leanix.JOURNEY_EMOTIONS)),
+                   ' '.join(rng.choices(WORDS, k=rng.randint(3, 8))) + '.',
+                   ' '.join(rng.choices(WORDS, k=rng.randint(3, 8))) + '.')
+                  for s in range(rng.randint(3, 7))]
+        journeys.append(leanix.Journey(f'persona{i // 4}_channel{i % 4}', stages))
+    return journeys
+
+
+def main():
+    parser = argparse.ArgumentParser(description='User-journey batch rendering benchmark')
+    parser.add_argument('--journeys', type=int, default=50)
+    parser.add_argument('--format', default='png')
+    parser.add_argument('--jobs', type=int, default=None, help='process pool size (default: CPU count)')
+    args = parser.parse_args()
+
+    import matplotlib.pyplot as plt
+
+    journeys = synthetic_journeys(args.journeys)
+    sample = journeys[:max(1, len(journeys) // 10)]  # the naive path is slow; time a tenth of the batch
+
+    start = time.perf_counter()
+    for journey in sample:
+        fig = leanix.plot_user_journey(journey)
+        with leanix._quiet_glyphs():
+            fig.savefig(io.BytesIO(), format=args.format)
+        plt.close(fig)
+    fresh = (time.perf_counter() - start) / len(sample)
+
+    renderer = leanix.JourneyRenderer()
+    start = time.perf_counter()
+    for journey in journeys:
+        renderer.save(journey, io.BytesIO(), args.format)
+    reused = (time.perf_counter() - start) / len(journeys)
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        start = time.perf_counter()
+        results = leanix.export_journeys(journeys, args.format, out_dir, jobs=args.jobs)
+        pooled = (time.perf_counter() - start) / len(journeys)
+        start = time.perf_counter()
+        leanix.save_journeys_pdf(journeys, os.path.join(out_dir, 'journeys.pdf'))
+        pdf = (time.perf_counter() - start) / len(journeys)
+
+    print(f'{len(journeys)} journeys, per journey:')
+    print(f'  new figure each:   {fresh * 1000:7.1f} ms')
+    print(f'  reused renderer:   {reused * 1000:7.1f} ms')
+    print(f'  process pool:      {pooled * 1000:7.1f} ms ({args.jobs or os.cpu_count()} workers)')
+    print(f'  multi-page PDF:    {pdf * 1000:7.1f} ms')
+    failed = [r for r in results if not r.ok]
+    for r in failed:
+        print(f'FAIL: {r.view}.{r.format}: {r.error}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# LeanIX import benchmark: writes a synthetic workspace export (GraphQL JSON and per-type CSV) of N fact
+# sheets to a temp dir, imports both with import_leanix() and reports time, peak Python memory (model
+# included) and the element/relation counts. Fails (exit 1) when the largest JSON import goes over --budget-s.
+#
+#   python benchmarks/bench_leanix_import.py --sizes 5000 50000
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import leanix  # noqa: E402
+
+# Share of each fact sheet type in the workspace
+MIX = [('Application', 0.3), ('Interface', 0.3), ('ITComponent', 0.2), ('BusinessCapability', 0.1),
+       ('DataObject', 0.1)]
+LIFECYCLES = ['active', 'active', 'active', 'phaseOut', 'plan', 'phaseIn', 'endOfLife']
+
+
+def fact_sheets(n, seed=42):
+    rng = random.Random(seed)
+    ids = {type: [f'{type[:3].lower()}-{i:06d}' for i in range(int(n * share))] for type, share in MIX}
+    sheets = []
+    for type, members in ids.items():
+        for i, id in enumerate(members):
+            sheet = {'id': id, 'type': type, 'name': f'{type} {i}', 'lifecycle': {'asString': rng.choice(LIFECYCLES)}}
+            if type == 'Application':
+                sheet['relApplicationToBusinessCapability'] = rng.sample(ids['BusinessCapability'], 2)
+                sheet['relApplicationToITComponent'] = rng.sample(ids['ITComponent'], 3)
+            elif type == 'Interface':
+                sheet['interfaceType'] = rng.choice(['REST', 'PubSub'])
+                sheet['relInterfaceToProviderApplication'] = [rng.choice(ids['Application'])]
+                sheet['relInterfaceToConsumerApplication'] = [rng.choice(ids['Application'])]
+                sheet['relInterfaceToDataObject'] = [rng.choice(ids['DataObject'])]
+            sheets.append(sheet)
+    return sheets
+
+
+def write_json(sheets, path):
+    # GraphQL export shape, relations as {edges: [{node: {factSheet: {id}}}]}
+    def node(sheet):
+        return {k: {'edges': [{'node': {'factSheet': {'id': ref}}} for ref in v]} if k.startswith('rel') else v
+                for k, v in sheet.items()}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'data': {'allFactSheets': {'totalCount': len(sheets),
+                                              'edges': [{'node': node(s)} for s in sheets]}}}, f)
+
+
+def write_csv(sheets, path):
+    fields = sorted({k for s in sheets for k in s})
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fields)
+        writer.writeheader()
+        for s in sheets:
+            writer.writerow({k: ';'.join(v) if isinstance(v, list) else v['asString'] if isinstance(v, dict) else v
+                             for k, v in s.items()})
+
+
+def measure(path):
+    start = time.perf_counter()
+    model = leanix.import_leanix(path)
+    seconds = time.perf_counter() - start
+    # Memory in a second run: tracemalloc would slow the timed one several-fold
+    tracemalloc.start()
+    leanix.import_leanix(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 2 ** 20, model
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LeanIX export import benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5000, 50000])
+    parser.add_argument('--budget-s', type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f'{"sheets":>8} {"format":>6} {"file MB":>8} {"import s":>9} {"peak MB":>8} {"elements":>9} {"relations":>10}')
+    seconds = 0.0
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            sheets = fact_sheets(n)
+            for fmt, write in (('json', write_json), ('csv', write_csv)):
+                path = os.path.join(tmp, f'export-{n}.{fmt}')
+                write(sheets, path)
+                elapsed, peak, model = measure(path)
+                if fmt == 'json':
+                    seconds = elapsed
+                print(f'{n:>8} {fmt:>6} {os.path.getsize(path) / 2 ** 20:>8.1f} {elapsed:>9.2f} {peak:>8.1f} '
+                      f'{len(model.elements):>9} {len(model.relations):>10}')
+    if seconds > args.budget_s:
+        print(f'FAIL: {args.sizes[-1]} fact sheets took {seconds:.2f}s (budget {args.budget_s:.2f}s)')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
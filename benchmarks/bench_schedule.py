@@ -0,0 +1,50 @@
+# Schedule benchmark: critical-path analysis of a synthetic roadmap of N tasks with ~2 dependencies each.
+# Fails (exit 1) when the largest size goes over --budget-s.
+#
+#   python benchmarks/bench_schedule.py --sizes 1000 10000 50000
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import leanix  # noqa: E402
+
+
+def roadmap_model(n, seed=42):
+    rng = random.Random(seed)
+    model = leanix.ArchitectureModel()
+    for i in range(n):
+        model.add(f'T{i}', 'task', f'Task {i}', 'implementation', duration=rng.randint(1, 30))
+    for i in range(1, n):
+        # Dependencies only point forward, so the graph is a DAG
+        for j in {rng.randrange(max(0, i - 50), i) for _ in range(2)}:
+            model.relate(f'T{j}', f'T{i}', 'precedes')
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Roadmap schedule benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--budget-s', type=float, default=1.0)
+    args = parser.parse_args()
+
+    print(f'{"tasks":>8} {"schedule s":>11} {"length":>8} {"critical":>9}')
+    seconds = 0.0
+    for n in args.sizes:
+        model = roadmap_model(n)
+        start = time.perf_counter()
+        plan = leanix.schedule(model)
+        critical = plan.critical_path()
+        seconds = time.perf_counter() - start
+        print(f'{n:>8} {seconds:>11.3f} {plan.length:>8} {len(critical):>9}')
+    if seconds > args.budget_s:
+        print(f'FAIL: {args.sizes[-1]} tasks took {seconds:.2f}s (budget {args.budget_s:.2f}s)')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
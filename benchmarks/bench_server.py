@@ -0,0 +1,105 @@
+# Render server load test: concurrent clients fetching views from a RenderServer, either one started
+# in-process (on the example model, or a model/snapshot file) or an already running one (--url).
+# Each client keeps a connection open and revalidates with If-None-Match when it has seen the view, the
+# way a browser or dashboard would. Reports p50/p99 latency, throughput and status counts, plus the
+# server's render/coalescing counters when it is in-process, and fails (exit 1) on any 5xx.
+#
+#   python benchmarks/bench_server.py --requests 2000 --concurrency 16
+#   python benchmarks/bench_server.py --url http://127.0.0.1:8765 --views app_arch,roadmap
+import argparse
+import http.client
+import os
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import leanix  # noqa: E402
+
+
+def client(url, paths, count, revalidate, seed, out):
+    rng = random.Random(seed)
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=120)
+    etags = {}
+    for _ in range(count):
+        path = rng.choice(paths)
+        headers = {'If-None-Match': etags[path]} if path in etags and rng.random() < revalidate else {}
+        start = time.perf_counter()
+        try:
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+            if response.getheader('ETag'):
+                etags[path] = response.getheader('ETag')
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=120)
+            status = 'error'
+        out.append((time.perf_counter() - start, status))
+    connection.close()
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render server load test')
+    parser.add_argument('--url', help='server to test (default: start one in-process)')
+    parser.add_argument('--model', help='model or snapshot file for the in-process server')
+    parser.add_argument('--views', default=','.join(leanix.VIEWS), help='comma-separated view names')
+    parser.add_argument('--format', default='svg')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--revalidate', type=float, default=0.5,
+                        help='share of repeat requests sent with If-None-Match')
+    parser.add_argument('--jobs', type=int, default=None, help='render workers of the in-process server')
+    args = parser.parse_args()
+
+    server = None
+    if args.url is None:
+        model = leanix.load_model(args.model) if args.model else None
+        server = leanix.RenderServer(model, port=0, jobs=args.jobs).start()
+    url = args.url or server.url
+    paths = [f'/views/{view}.{args.format}' for view in args.views.split(',') if view]
+
+    results, threads = [], []
+    per_client = [args.requests // args.concurrency + (i < args.requests % args.concurrency)
+                  for i in range(args.concurrency)]
+    start = time.perf_counter()
+    for i, count in enumerate(per_client):
+        thread = threading.Thread(target=client, args=(url, paths, count, args.revalidate, i, results))
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = [seconds for seconds, _ in results]
+    statuses = {}
+    for _, status in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    print(f'{len(results)} requests, {args.concurrency} clients, {len(paths)} views as {args.format}')
+    print(f'throughput: {len(results) / elapsed:.1f} req/s')
+    print(f'latency: p50 {percentile(latencies, 50) * 1000:.1f} ms, p99 {percentile(latencies, 99) * 1000:.1f} ms, '
+          f'max {max(latencies, default=0) * 1000:.1f} ms')
+    print('status: ' + ', '.join(f'{status}: {n}' for status, n in sorted(statuses.items(), key=str)))
+    if server is not None:
+        stats = server.stats()
+        print(f'server: {stats["renders"]} renders, {stats["coalesced"]} coalesced, {stats["cached"]} from cache, '
+              f'{stats["not_modified"]} not modified, {stats["rejected"]} rejected')
+        server.close()
+    failed = sum(n for status, n in statuses.items() if status == 'error' or status >= 500)
+    if failed:
+        print(f'FAIL: {failed} failed requests')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
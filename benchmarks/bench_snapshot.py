@@ -0,0 +1,70 @@
+# Snapshot benchmark: the same ~100k-element synthetic landscape saved as JSON (save_model) and as a binary
+# snapshot (save_snapshot). Times opening the snapshot, a full load of each and a snapshot load restricted
+# to the roadmap types (what the roadmap view needs), checks the snapshot round-trips exactly, and fails
+# (exit 1) when the full snapshot load is not faster than JSON.
+#
+#   python benchmarks/bench_snapshot.py --capabilities 5900
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from landscape import synthetic_model
+
+import leanix
+
+
+def best_of(fn, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def dump(model):
+    return ([(e.id, e.type, e.label, e.layer, e.state, e.props) for e in model.elements.values()],
+            [(r.source, r.target, r.type, r.label, r.props) for r in model.relations])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Binary snapshot vs JSON model loading')
+    parser.add_argument('--capabilities', type=int, default=5900, help='landscape size (5900 ~ 100k elements)')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    model = synthetic_model(args.capabilities)
+    with tempfile.TemporaryDirectory() as scratch:
+        json_path, snapshot_path = os.path.join(scratch, 'model.json'), os.path.join(scratch, 'model.lxs')
+        json_save, _ = best_of(lambda: leanix.save_model(model, json_path), 1)
+        snapshot_save, _ = best_of(lambda: leanix.save_snapshot(model, snapshot_path), 1)
+        print(f'{len(model.elements)} elements, {len(model.relations)} relations')
+        print(f'JSON:     {os.path.getsize(json_path) / 2 ** 20:6.1f} MB, saved in {json_save:.2f} s')
+        print(f'snapshot: {os.path.getsize(snapshot_path) / 2 ** 20:6.1f} MB, saved in {snapshot_save:.2f} s')
+
+        json_load, loaded = best_of(lambda: leanix.load_model(json_path), args.repeat)
+        open_s, _ = best_of(lambda: leanix.Snapshot(snapshot_path).close(), args.repeat)
+        verify_s, _ = best_of(lambda: leanix.Snapshot(snapshot_path, verify=True).close(), args.repeat)
+        snapshot_load, restored = best_of(lambda: leanix.load_snapshot(snapshot_path), args.repeat)
+        partial_s, roadmap = best_of(lambda: leanix.load_snapshot(snapshot_path, ('task', 'milestone')), args.repeat)
+        print(f'JSON load:                 {json_load * 1000:8.1f} ms')
+        print(f'snapshot open:             {open_s * 1000:8.1f} ms')
+        print(f'snapshot open + verify:    {verify_s * 1000:8.1f} ms')
+        print(f'snapshot load:             {snapshot_load * 1000:8.1f} ms')
+        print(f'snapshot load, roadmap:    {partial_s * 1000:8.1f} ms ({len(roadmap.elements)} elements)')
+
+    failed = False
+    if dump(restored) != dump(model) or dump(loaded) != dump(model):
+        print('FAIL: loaded model differs from the saved one')
+        failed = True
+    if snapshot_load >= json_load:
+        print('FAIL: snapshot load is not faster than JSON')
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+# Validation benchmark: every view built on a large synthetic landscape with and without the validation
+# stage (VALIDATE_VIEWS), plus validate_model() over all relations. Reports the overhead per view, checks
+# that the clean landscape raises nothing and that a seeded dangling relation is caught, and fails (exit 1)
+# when validation costs more than --budget of a view's build time.
+#
+#   python benchmarks/bench_validate.py --capabilities 500 --budget 1
+import argparse
+import sys
+import time
+
+from landscape import synthetic_model
+
+import leanix
+
+
+def build_time(build, model, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build(model)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='View validation benchmark')
+    parser.add_argument('--capabilities', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--budget', type=float, default=1.0, help='bound on validation time / build time')
+    args = parser.parse_args()
+
+    model = synthetic_model(args.capabilities)
+    print(f'{len(model.elements)} elements, {len(model.relations)} relations')
+    failed = False
+    for view, build in leanix.VIEWS.items():
+        leanix.VALIDATE_VIEWS = False
+        plain = build_time(build, model, args.repeat)
+        leanix.VALIDATE_VIEWS = True
+        checked = build_time(build, model, args.repeat)
+        overhead = max(0.0, checked - plain) / plain
+        print(f'{view:16s} build {plain * 1000:7.1f} ms, validated {checked * 1000:7.1f} ms (+{overhead:.0%})')
+        if overhead > args.budget:
+            print(f'FAIL: {view}: validation over {args.budget:.0%} of the build')
+            failed = True
+
+    start = time.perf_counter()
+    issues = leanix.validate_model(model)
+    print(f'validate_model: {(time.perf_counter() - start) * 1000:.1f} ms, {len(issues)} issues')
+    if issues:
+        print(f'FAIL: clean landscape reported {issues[0].message}')
+        failed = True
+    model.relate('APP0', 'MISSING', 'uses')
+    try:
+        leanix.build_app_arch(model)
+        print('FAIL: dangling relation not caught')
+        failed = True
+    except leanix.ValidationError as exc:
+        print(f'seeded error caught: {exc.issues[0].message}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+# View benchmark suite: every view on seeded synthetic landscapes of several sizes.
+# Times each phase separately - build (Python graph/frame construction), layout (Graphviz -Tjson0),
+# raster (PNG from the fixed layout, or the matplotlib Agg draw) and display (the headless display path) -
+# and records peak Python memory per view (in a separate untimed run) and the peak RSS of the Graphviz children.
+# Runs offline with only the local Graphviz binary; without one the layout/raster phases are skipped.
+#
+#   python benchmarks/bench_views.py --sizes 10 100 500 --save-baseline
+#   python benchmarks/bench_views.py --sizes 10 100 500          # compares against the saved baseline
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+from landscape import synthetic_model, synthetic_roadmap  # noqa: E402
+
+import leanix  # noqa: E402
+
+PHASES = ('build', 'layout', 'raster', 'display')
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_views.json')
+
+
+class Timer:
+    def __init__(self):
+        self.phases = {}
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        yield
+        self.phases[name] = time.perf_counter() - start
+
+
+def bench_graphviz_view(view, model, cache, has_dot, timeout):
+    timer = Timer()
+    with timer.phase('build'):
+        dot = leanix.auto_engine(leanix.VIEWS[view](model))
+    if has_dot:
+        with timer.phase('layout'):
+            layout = leanix.compute_layout(dot, cache, timeout)
+        with timer.phase('raster'):
+            data = leanix.render_dot(leanix.apply_layout(dot, layout), 'png', cache, timeout)
+        with timer.phase('display'):
+            leanix.display_image(data, 'png')
+    return timer.phases, len(dot.node_ids()), sum(1 for _ in dot.edge_pairs())
+
+
+def bench_roadmap_plot(model):
+    import matplotlib.pyplot as plt
+
+    timer = Timer()
+    with timer.phase('build'):
+        df = synthetic_roadmap(model)
+    with timer.phase('raster'):
+        fig = leanix.plot_gantt(df)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png')
+        plt.close(fig)
+    with timer.phase('display'):
+        leanix.display_image(buffer.getvalue(), 'png')
+    return timer.phases, len(df), 0
+
+
+def bench_user_journey(model):
+    # Fixed content, no model input: a constant cost that should not move between runs
+    timer = Timer()
+    with timer.phase('raster'):
+        leanix.show_user_journey()
+    return timer.phases, 0, 0
+
+
+def run(sizes, timeout):
+    has_dot = shutil.which('dot') is not None
+    results = []
+    for size in sizes:
+        model = synthetic_model(size)
+        cache = leanix.RenderCache(directory=None)  # cold for every size
+        jobs = [(view, lambda v=view: bench_graphviz_view(v, model, cache, has_dot, timeout))
+                for view in leanix.VIEWS]
+        jobs += [('roadmap_plot', lambda: bench_roadmap_plot(model)),
+                 ('user_journey', lambda: bench_user_journey(model))]
+        for view, job in jobs:
+            phases, nodes, edges = job()
+            # tracemalloc slows allocation-heavy code several-fold, so memory is measured in a second,
+            # untimed run
+            tracemalloc.start()
+            job()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results.append({'size': size, 'view': view, 'nodes': nodes, 'edges': edges, 'phases': phases,
+                            'peak_python_mb': peak / 2 ** 20})
+    child_rss_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return results, has_dot, child_rss_mb
+
+
+def compare(results, baseline, tolerance, floor):
+    # A phase regresses when it is tolerance slower than the baseline and by more than floor seconds
+    previous = {(r['size'], r['view']): r['phases'] for r in baseline['results']}
+    failures = []
+    for r in results:
+        for phase, seconds in r['phases'].items():
+            before = previous.get((r['size'], r['view']), {}).get(phase)
+            if before is not None and seconds > before * (1 + tolerance) and seconds - before > floor:
+                failures.append(f"{r['view']}@{r['size']} {phase}: {seconds:.3f}s vs {before:.3f}s baseline")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-view, per-phase benchmark on synthetic landscapes')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 500], help='number of capabilities')
+    parser.add_argument('--timeout', type=float, default=None, help='bound on each Graphviz run')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown vs baseline (0.25 = 25%%)')
+    parser.add_argument('--floor', type=float, default=0.01, help='ignore slowdowns under this many seconds')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    # The headless display path writes temp files; keep them out of the real temp dir
+    with tempfile.TemporaryDirectory() as scratch, contextlib.redirect_stdout(io.StringIO()):
+        tempfile.tempdir = scratch
+        try:
+            results, has_dot, child_rss_mb = run(args.sizes, args.timeout)
+        finally:
+            tempfile.tempdir = None
+
+    if not has_dot:
+        print('dot not found on PATH: layout/raster/display skipped for Graphviz views')
+    print(f'{"size":>5} {"view":<16} {"nodes":>6} {"edges":>6} ' + ' '.join(f'{p + " s":>9}' for p in PHASES)
+          + f' {"peak MB":>8}')
+    for r in results:
+        cells = ' '.join(f'{r["phases"][p]:>9.3f}' if p in r['phases'] else f'{"-":>9}' for p in PHASES)
+        print(f'{r["size"]:>5} {r["view"]:<16} {r["nodes"]:>6} {r["edges"]:>6} {cells} {r["peak_python_mb"]:>8.1f}')
+    print(f'peak Graphviz child RSS: {child_rss_mb:.1f} MB')
+
+    report = {'sizes': args.sizes, 'graphviz': has_dot, 'child_rss_mb': child_rss_mb, 'results': results}
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=1)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=1)
+        print(f'baseline saved to {args.baseline}')
+        return 0
+    if not os.path.exists(args.baseline):
+        print('no baseline to compare against; run with --save-baseline first')
+        return 0
+    with open(args.baseline) as f:
+        failures = compare(results, json.load(f), args.tolerance, args.floor)
+    for failure in failures:
+        print(f'FAIL: {failure}')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# Seeded synthetic landscapes for the benchmarks: the same element types and relation types as
+# leanix.example_model(), scaled by the number of capabilities. Fan-out is skewed the way real
+# portfolios are (a few platforms, runtimes and capabilities attract most links).
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import leanix  # noqa: E402
+
+CLOUD_SERVICES = [("AWS_LAMBDA", "AWS Lambda", "Lambda"), ("AWS_APIGW", "API Gateway", "API Gateway"),
+                  ("AWS_SNS", "Amazon SNS", "SNS"), ("AWS_DYNAMODB", "Amazon DynamoDB", "DynamoDB"),
+                  ("AWS_COGNITO", "Amazon Cognito", "Cognito"), ("AWS_CLOUDWATCH", "CloudWatch Logs", "CloudWatch"),
+                  ("AWS_S3", "Amazon S3", "S3")]
+TECH_RELATIONS = [('deployed_on', 'deployed on'), ('uses', 'uses DB'), ('runs_on', 'runs on'),
+                  ('hosted_on', 'hosted on'), ('auth_via', 'auth via'), ('writes_to', 'writes to')]
+
+
+def _skewed(rng, items, k=1):
+    # Zipf-like pick: item i is chosen with weight 1/(i+1)
+    return rng.choices(items, weights=[1 / (i + 1) for i in range(len(items))], k=k)
+
+
+def synthetic_model(capabilities, seed=42):
+    rng = random.Random(seed)
+    n = max(1, capabilities)
+    model = leanix.ArchitectureModel()
+
+    # Business: a value chain step per capability, chained
+    model.add("Customer", 'actor', "Customer", 'business')
+    for i in range(n):
+        model.add(f"VC{i}", 'value_chain_step', f"Value Step {i}", 'business')
+        model.add(f"CAP{i}", 'capability', f"Capability {i}", 'business')
+        model.relate(f"CAP{i}", f"VC{i}", 'realizes', 'realizes')
+        if i:
+            model.relate(f"VC{i - 1}", f"VC{i}", 'triggers', 'triggers')
+
+    # As-is applications, interfaces and data objects: ~2 apps, ~2 interfaces, 1 data object per capability
+    caps = [f"CAP{i}" for i in range(n)]
+    apps = [f"APP{i}" for i in range(2 * n)]
+    for i, app in enumerate(apps):
+        model.add(app, 'application', f"LegacyApp{i}", 'application', 'as-is')
+        for cap in set(_skewed(rng, caps, rng.randint(1, 2))):
+            model.relate(cap, app, 'serves', 'serves')
+    externals = [f"EXT{i}" for i in range(max(1, n // 4))]
+    for i, ext in enumerate(externals):
+        model.add(ext, 'external_system', f"External System {i}", 'application', 'as-is')
+    for i in range(2 * n):
+        iface = f"IF{i}"
+        model.add(iface, 'interface', f"Interface {i}", 'application', 'as-is', kind=rng.choice(["REST", "PubSub"]))
+        source = rng.choice(apps)
+        target = rng.choice(apps + externals)
+        model.relate(source, iface, 'exposes', 'exposes')
+        model.relate(iface, target, 'invokes', 'invokes')
+    for i in range(n):
+        data = f"DATA{i}"
+        model.add(data, 'data_object', f"Data Object {i}", 'application', 'as-is')
+        model.relate(rng.choice(apps), data, 'flow', 'creates')
+        model.relate(data, rng.choice(apps + externals), 'flow', 'read by')
+    model.relate("Customer", apps[0], 'flow', 'places Order')
+
+    # As-is technology: a handful of shared platforms plus per-cluster servers
+    infra = []
+    for i in range(max(4, n // 2)):
+        id = f"INF{i}"
+        model.add(id, 'platform' if i % 3 == 0 else 'infrastructure', f"Infrastructure {i}", 'technology', 'as-is')
+        infra.append(id)
+    runtimes = [f"R{i}" for i in range(max(2, n // 10))]
+    for i, runtime in enumerate(runtimes):
+        model.add(runtime, 'runtime', f"Runtime {i}", 'technology', 'as-is')
+    for app in apps:
+        for type, label in rng.sample(TECH_RELATIONS, 3):
+            target = _skewed(rng, runtimes)[0] if type == 'runs_on' else _skewed(rng, infra)[0]
+            model.relate(app, target, type, label)
+
+    # To-be: a replacement app per as-is app, two functions each, an interface per function pair
+    model.add("RT1", 'runtime', "Python 3.12 Runtime", 'technology', 'to-be')
+    for id, label, icon in CLOUD_SERVICES:
+        model.add(id, 'cloud_service', label, 'technology', 'to-be', icon=icon)
+    services = [id for id, _, _ in CLOUD_SERVICES]
+    for i, old in enumerate(apps):
+        app = f"TOBE_APP{i}"
+        model.add(app, 'application', f"ServiceApp{i}", 'application', 'to-be')
+        model.relate(app, old, 'replaces', 'replaces')
+        for cap in {r.source for r in model.incoming(old, 'serves')}:
+            model.relate(cap, app, 'serves', 'served by')
+        for j in range(2):
+            fn = f"FN{i}_{j}"
+            model.add(fn, 'function', f"Function{i}_{j}", 'application', 'to-be')
+            model.relate(app, fn, 'composes', 'composes')
+        iface = f"TOBE_IF{i}"
+        kind = rng.choice(["REST", "SNS"])
+        model.add(iface, 'interface', f"{kind}: Endpoint {i}", 'application', 'to-be', kind=kind)
+        model.relate(iface, f"FN{i}_0", 'invokes' if kind == "REST" else 'triggers')
+        for service in set(_skewed(rng, services, 3)) | {"RT1"}:
+            model.relate(app, service, 'uses')
+    for new, old in [("AWS_LAMBDA", infra[0]), ("AWS_DYNAMODB", infra[1]), ("AWS_SNS", infra[2]), ("AWS_S3", infra[3])]:
+        model.relate(new, old, 'replaces', 'replaces')
+
+    # Roadmap: a task per capability, dependencies only pointing forward, a milestone every 5 tasks
+    for i in range(n):
+        model.add(f"T{i}", 'task', f"Task {i}", 'implementation', duration=rng.randint(5, 40))
+        for j in {rng.randrange(max(0, i - 10), i) for _ in range(2)} if i else ():
+            model.relate(f"T{j}", f"T{i}", 'precedes')
+    for i in range(0, n, 5):
+        model.add(f"M{i // 5}", 'milestone', f"Milestone {i // 5}", 'implementation')
+        model.relate(f"T{i}", f"M{i // 5}", 'precedes')
+    return model
+
+
+def synthetic_roadmap(model, seed=42):
+    # Gantt rows for every as-is/to-be application pair: Deployed/Phased Out and Development/Parallel Run/Go Live
+    import pandas as pd
+
+    rng = random.Random(seed)
+    base = pd.Timestamp('2025-01-01')
+    rows = []
+    for rel in model.relations_of_type('replaces'):
+        new, old = model.get(rel.source), model.get(rel.target)
+        day = rng.randrange(180)
+        for label, kind, phases in [(old.label, "As-Is", ["Deployed", "Phased Out"]),
+                                    (new.label, "To-Be", ["Development", "Parallel Run", "Go Live"])]:
+            start = day
+            for phase in phases:
+                length = rng.randint(10, 60)
+                rows.append((label, phase, base + pd.Timedelta(days=start), base + pd.Timedelta(days=start + length),
+                             kind))
+                start += length + 1
+    return leanix.roadmap_frame(rows)
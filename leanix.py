@@ -1,9 +1,2138 @@
-from graphviz import Digraph
-from IPython.display import Image, display
+import functools
+import hashlib
+import itertools
+import json
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+import sys
 
-def show_biz_arch(file:bool = False):
+# graphviz, IPython, matplotlib and pandas are imported inside the functions that need them, so a
+# headless export that only touches one Graphviz view does not pay for the plotting/notebook stack.
+
+# --- Instrumentation ---
+# The rendering path reports one event per phase (build, layout, render, display) to every registered
+# sink: a callable taking a dict with ts, view, phase and seconds plus whatever counts the phase knows
+# (nodes, edges, dot_bytes, output_bytes, format, cache). With no sinks registered - the default - each
+# phase costs one truthiness check.
+_sinks = []
+
+
+def add_sink(sink):
+    _sinks.append(sink)
+    return sink
+
+
+def remove_sink(sink):
+    if sink in _sinks:
+        _sinks.remove(sink)
+
+
+def _emit(phase, view, seconds, **counts):
+    event = {'ts': time.time(), 'view': view, 'phase': phase, 'seconds': seconds, **counts}
+    for sink in list(_sinks):
+        sink(event)
+
+
+def _view_of(dot):
+    return getattr(dot, 'view', None) or dot.name
+
+
+class JsonLinesSink:
+    # One JSON object per event, appended to a path or written to an open text file
+    def __init__(self, file):
+        self._file = open(file, 'a', encoding='utf-8') if isinstance(file, (str, os.PathLike)) else file
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        line = json.dumps(event, separators=(',', ':')) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class PrometheusSink:
+    # Per-view/phase latency histograms and size summaries in a prometheus_client registry;
+    # exposition() returns the text format, serve(port) exposes it over HTTP.
+    def __init__(self, registry=None):
+        from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, Summary
+
+        self.registry = CollectorRegistry() if registry is None else registry
+        r = self.registry
+        self.seconds = Histogram('leanix_phase_seconds', 'Time spent per view and phase', ['view', 'phase'],
+                                 registry=r, buckets=(.001, .005, .01, .05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60))
+        self.nodes = Gauge('leanix_view_nodes', 'Nodes in the last build of a view', ['view'], registry=r)
+        self.edges = Gauge('leanix_view_edges', 'Edges in the last build of a view', ['view'], registry=r)
+        self.dot_bytes = Summary('leanix_dot_bytes', 'DOT source size', ['view'], registry=r)
+        self.output_bytes = Summary('leanix_output_bytes', 'Rendered output size', ['view', 'format'], registry=r)
+        self.cache = Counter('leanix_render_cache', 'Render cache lookups', ['view', 'result'], registry=r)
+
+    def __call__(self, event):
+        view = event['view'] or ''
+        self.seconds.labels(view, event['phase']).observe(event['seconds'])
+        if 'nodes' in event:
+            self.nodes.labels(view).set(event['nodes'])
+            self.edges.labels(view).set(event['edges'])
+        if 'dot_bytes' in event:
+            self.dot_bytes.labels(view).observe(event['dot_bytes'])
+        if 'output_bytes' in event:
+            self.output_bytes.labels(view, event.get('format', '')).observe(event['output_bytes'])
+        if 'cache' in event:
+            self.cache.labels(view, event['cache']).inc()
+
+    def exposition(self):
+        from prometheus_client import generate_latest
+
+        return generate_latest(self.registry)
+
+    def serve(self, port=9464, addr='127.0.0.1'):
+        from prometheus_client import start_http_server
+
+        return start_http_server(port, addr, registry=self.registry)
+
+
+def _view_builder(view, model_arg=0):
+    # Tags the graph with its VIEWS name (so render/display events carry it), validates it (see
+    # validate_view) and reports the build phase. model_arg: position of the builder's model argument
+    # (None: the view is not drawn from a model).
+    def wrap(build):
+        @functools.wraps(build)
+        def timed(*args, **kwargs):
+            start = time.perf_counter() if _sinks else 0.0
+            dot = build(*args, **kwargs)
+            dot.view = view
+            if VALIDATE_VIEWS:
+                model = None
+                if model_arg is not None:
+                    # `is None`, not `or`: an empty ArchitectureModel is falsy through __len__
+                    model = kwargs.get('model', args[model_arg] if len(args) > model_arg else None)
+                    model = MODEL if model is None else model
+                issues = validate_view(dot, model)
+                if issues:
+                    raise ValidationError(issues, view)
+            if _sinks:
+                _emit('build', view, time.perf_counter() - start, nodes=len(dot.node_ids()),
+                      edges=sum(1 for _ in dot.edge_pairs()), dot_bytes=len(dot.source))
+            return dot
+        return timed
+    return wrap
+
+# --- Render cache ---
+# Rendered output is keyed by a hash of everything that can change it: the DOT source, the layout
+# engine, the output format and the icon files the source points at. Recent results stay in an
+# in-process LRU; every result is also written to disk so a restarted kernel still gets hits.
+RENDER_CACHE_DIR = os.environ.get('LEANIX_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'leanix'))
+RENDER_CACHE_MEMORY_ITEMS = int(os.environ.get('LEANIX_CACHE_MEMORY_ITEMS', '64'))
+RENDER_CACHE_DISK_BYTES = int(os.environ.get('LEANIX_CACHE_DISK_BYTES', str(256 * 1024 * 1024)))
+
+_IMAGE_ATTR_RE = re.compile(r'\bimage=(?:"((?:[^"\\]|\\.)*)"|([^\s,\]]+))')
+
+
+def _referenced_images(source):
+    return sorted({quoted or bare for quoted, bare in _IMAGE_ATTR_RE.findall(source)})
+
+
+class RenderCache:
+    def __init__(self, directory=RENDER_CACHE_DIR, max_items=RENDER_CACHE_MEMORY_ITEMS,
+                 max_disk_bytes=RENDER_CACHE_DISK_BYTES):
+        self.directory = directory or None  # None (or '') keeps the cache in memory only
+        self.max_items = max_items
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._disk_bytes = None  # scanned lazily on the first write
+        self._lock = threading.Lock()
+
+    def key(self, source, engine='dot', format='png'):
+        digest = hashlib.sha256()
+        for part in (engine, format, source):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        # Icons are referenced by path, so an edited icon must change the key too
+        for path in _referenced_images(source):
+            try:
+                st = os.stat(path)
+                stamp = f'{path}:{st.st_size}:{st.st_mtime_ns}'
+            except OSError:
+                stamp = f'{path}:missing'
+            digest.update(stamp.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return data
+        data = self._read_disk(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, data)
+        return data
+
+    def put(self, key, data):
+        with self._lock:
+            self._remember(key, data)
+        self._write_disk(key, data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'memory_items': len(self._memory),
+                'disk_bytes': self._disk_bytes,
+            }
+
+    def clear(self, disk=False):
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.disk_hits = self.misses = 0
+        if disk and self.directory and os.path.isdir(self.directory):
+            for path, _, _ in self._disk_entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._disk_bytes = 0
+
+    def _remember(self, key, data):
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def _read_disk(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # mtime doubles as last-used time for eviction
+        except OSError:
+            return None
+        return data
+
+    def _write_disk(self, key, data):
+        if not self.directory or self.max_disk_bytes <= 0:
+            return
+        path = self._path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return  # a read-only or full disk only costs us the second tier
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+            else:
+                self._disk_bytes += len(data)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict()
+
+    def _disk_entries(self):
+        # Only the two-character shard directories belong to us; siblings (e.g. the icon store) are left alone
+        try:
+            shards = [name for name in os.listdir(self.directory) if len(name) == 2]
+        except OSError:
+            return
+        for shard in shards:
+            try:
+                files = os.listdir(os.path.join(self.directory, shard))
+            except OSError:
+                continue
+            for name in files:
+                path = os.path.join(self.directory, shard, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield path, st.st_size, st.st_mtime_ns
+
+    def _evict(self):
+        # Drop least recently used files until we are back under 90% of the budget
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_disk_bytes * 0.9
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
+
+
+RENDER_CACHE = RenderCache()
+
+
+class LayoutTimeout(Exception):
+    pass
+
+
+def _run_graphviz(source, engine, format, timeout=None, neato_no_op=None):
+    import subprocess
+
+    args = [engine, f'-T{format}'] + ([f'-n{neato_no_op}'] if neato_no_op else [])
+    try:
+        proc = subprocess.run(args, input=source.encode('utf-8'), capture_output=True,
+                              timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise LayoutTimeout(f'{engine} layout did not finish within {timeout}s') from None
+    if proc.returncode != 0:
+        raise RuntimeError(f'{engine} failed: {proc.stderr.decode("utf-8", "replace").strip()}')
+    return proc.stdout
+
+
+def render_dot(dot, format='png', cache=None, timeout=None, dpi=None):
+    if format == 'svgz':
+        return _gzip(render_dot(dot, 'svg', cache, timeout))
+    if dpi and format in RASTER_FORMATS:
+        dot = _with_dpi(dot, dpi)
+    start = time.perf_counter() if _sinks else 0.0
+    cache = RENDER_CACHE if cache is None else cache
+    key = _render_key(dot, format, cache)
+    data = cache.get(key)
+    hit = data is not None
+    if data is None:
+        # graphviz' pipe() cannot be bounded, so timed renders run the engine directly
+        no_op = getattr(dot, 'neato_no_op', None)
+        data = dot.pipe(format=format) if timeout is None else \
+            _run_graphviz(dot.source, dot.engine, format, timeout, no_op)
+        data = _store_render(cache, key, format, data)
+    if _sinks:
+        _emit_render(dot, format, time.perf_counter() - start, hit, data)
+    return data
+
+
+def _emit_render(dot, format, seconds, hit, data):
+    # json0 output is a layout-only run (see compute_layout); everything else lays out and draws
+    _emit('layout' if format == 'json0' else 'render', _view_of(dot), seconds, format=format,
+          cache='hit' if hit else 'miss', dot_bytes=len(dot.source), output_bytes=len(data))
+
+
+def _render_key(dot, format, cache):
+    no_op = getattr(dot, 'neato_no_op', None)
+    return cache.key(dot.source, f'{dot.engine} -n{no_op}' if no_op else dot.engine, format)
+
+
+def _store_render(cache, key, format, data):
+    if format == 'svg' and b'<image' in data:
+        data = _inline_svg_images(data)
+    cache.put(key, data)
+    return data
+
+
+def render_cache_stats():
+    return RENDER_CACHE.stats()
+
+
+def clear_render_cache(disk=False):
+    RENDER_CACHE.clear(disk=disk)
+
+
+# --- Output mode ---
+# Views are shown as SVG by default: no rasterisation step, and a fraction of a large PNG's size in the
+# notebook. 'svgz' is the same SVG gzipped; raster formats are drawn at OUTPUT_DPI. write_view() streams
+# Graphviz output straight into a file or file-like object instead of holding it in memory.
+OUTPUT_FORMAT = os.environ.get('LEANIX_FORMAT', 'svg')
+OUTPUT_DPI = int(os.environ.get('LEANIX_DPI', '96'))
+RASTER_FORMATS = ('png', 'jpg', 'jpeg', 'gif', 'bmp', 'tif', 'tiff', 'webp')
+STREAM_CHUNK_BYTES = 1 << 16
+
+
+def set_output(format=None, dpi=None):
+    global OUTPUT_FORMAT, OUTPUT_DPI
+    if format:
+        OUTPUT_FORMAT = format
+    if dpi:
+        OUTPUT_DPI = int(dpi)
+
+
+def _gzip_stream():
+    # A gzip member with no name or timestamp, so identical drawings give identical files whether they
+    # were compressed in one piece or streamed
+    return zlib.compressobj(9, zlib.DEFLATED, 31)
+
+
+def _gzip(data):
+    gz = _gzip_stream()
+    return gz.compress(data) + gz.flush()
+
+
+def _with_dpi(dot, dpi):
+    copy = dot.copy()
+    copy.attr(dpi=str(dpi))
+    return copy
+
+
+def write_view(dot, file, format=None, dpi=None, cache=None, timeout=None):
+    # Write dot rendered as format (default OUTPUT_FORMAT) to a path or binary file object. A cached
+    # render is copied out; otherwise the DOT text is streamed into Graphviz and its output streamed on
+    # (through gzip for svgz) without materialising either. Streamed SVG keeps icon references as paths.
+    import shutil
+    import subprocess
+    import tempfile
+
+    format = format or OUTPUT_FORMAT
+    compress, gv_format = format == 'svgz', 'svg' if format == 'svgz' else format
+    if format in RASTER_FORMATS:
+        dot = _with_dpi(dot, dpi or OUTPUT_DPI)
+    cache = RENDER_CACHE if cache is None else cache
+    own = isinstance(file, (str, os.PathLike))
+    target = open(file, 'wb') if own else file
+    start = time.perf_counter() if _sinks else 0.0
+    try:
+        data = cache.get(_render_key(dot, gv_format, cache))
+        if data is not None:
+            target.write(_gzip(data) if compress else data)
+            return
+        no_op = getattr(dot, 'neato_no_op', None)
+        args = [dot.engine, f'-T{gv_format}'] + ([f'-n{no_op}'] if no_op else [])
+        with tempfile.TemporaryFile() as stderr:
+            # stderr goes to a file so a chatty engine cannot block on a full pipe while we stream stdout
+            proc = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=stderr)
+            timed_out = []
+            timer = threading.Timer(timeout, lambda: (timed_out.append(True), proc.kill())) if timeout else None
+            if timer:
+                timer.start()
+            try:
+                # Graphviz reads all input before it writes anything, so feeding stdin first cannot deadlock
+                text = _TextPipe(proc.stdin)
+                try:
+                    dot.write(text)
+                except BrokenPipeError:
+                    pass  # engine died early; its exit status below says why
+                finally:
+                    text.close()
+                if compress:
+                    gz = _gzip_stream()
+                    for chunk in iter(lambda: proc.stdout.read(STREAM_CHUNK_BYTES), b''):
+                        target.write(gz.compress(chunk))
+                    target.write(gz.flush())
+                else:
+                    shutil.copyfileobj(proc.stdout, target, STREAM_CHUNK_BYTES)
+                proc.wait()
+            finally:
+                if timer:
+                    timer.cancel()
+                proc.stdout.close()
+            if timed_out:
+                raise LayoutTimeout(f'{dot.engine} layout did not finish within {timeout}s')
+            if proc.returncode != 0:
+                stderr.seek(0)
+                raise RuntimeError(f'{dot.engine} failed: {stderr.read().decode("utf-8", "replace").strip()}')
+    finally:
+        if own:
+            target.close()
+        if _sinks:
+            _emit('render', _view_of(dot), time.perf_counter() - start, format=format, cache='stream')
+
+
+class _TextPipe:
+    # Minimal text writer over a binary pipe for BulkDigraph.write()
+    def __init__(self, pipe):
+        self._pipe = pipe
+
+    def write(self, text):
+        self._pipe.write(text.encode('utf-8'))
+
+    def close(self):
+        try:
+            self._pipe.close()
+        except BrokenPipeError:
+            pass
+
+
+# --- Display ---
+# Outside a notebook there is nothing to display into, so images are written to a temp file instead
+# of failing on a missing IPython. set_display() swaps in any other callable(data, format).
+_display_hook = None
+
+
+def _in_notebook():
+    # Only look at IPython if the host process already loaded it; importing it here would defeat the point.
+    ipython = sys.modules.get('IPython')
+    return ipython is not None and ipython.get_ipython() is not None
+
+
+def _save_to_temp(data, format):
+    import tempfile
+
+    fd, path = tempfile.mkstemp(prefix='leanix-', suffix=f'.{format}')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    print(f'Rendered {format.upper()} written to {path}')
+    return path
+
+
+def set_display(hook=None):
+    global _display_hook
+    _display_hook = hook
+
+
+def display_image(data, format='png', view=None):
+    if format == 'svgz':  # notebooks and viewers want the plain SVG
+        import gzip
+
+        data, format = gzip.decompress(data), 'svg'
+    if _sinks:
+        start = time.perf_counter()
+        try:
+            return _display_image(data, format)
+        finally:
+            _emit('display', view, time.perf_counter() - start, format=format, output_bytes=len(data))
+    return _display_image(data, format)
+
+
+def _display_image(data, format):
+    if _display_hook is not None:
+        return _display_hook(data, format)
+    if not _in_notebook():
+        return _save_to_temp(data, format)
+    from IPython.display import SVG, Image, display
+
+    display(SVG(data) if format == 'svg' else Image(data))
+
+
+def display_figure(fig):
+    import matplotlib.pyplot as plt
+
+    if _display_hook is None and _in_notebook():
+        plt.show()
+        return
+    import io
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    plt.close(fig)
+    return display_image(buffer.getvalue(), 'png')
+
+
+def _show(dot):
+    display_image(render_dot(dot, OUTPUT_FORMAT, dpi=OUTPUT_DPI), OUTPUT_FORMAT, _view_of(dot))
+
+
+# --- Icon manifest ---
+# The icons/ tree holds ~4,100 AWS PNG/SVG files across four families. Instead of hard-coding deep paths
+# (or walking the tree at render time) we index it once into a compact manifest next to the icons:
+# service name + aliases → (family, category, size, format, path, content hash). The manifest is loaded
+# lazily on the first icon() lookup and rebuilt incrementally when contents.txt or a directory changes.
+ICONS_DIR = os.environ.get('LEANIX_ICONS_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'icons'))
+ICON_MANIFEST_VERSION = 1
+
+IconEntry = namedtuple('IconEntry', 'family category name size variant format path hash file_size mtime_ns')
+
+_ICON_FAMILIES = (('Architecture-Service-Icons', 'service'), ('Resource-Icons', 'resource'),
+                  ('Category-Icons', 'category'), ('Architecture-Group-Icons', 'group'))
+_ICON_FAMILY_RANK = {'service': 0, 'resource': 1, 'category': 2, 'group': 3}
+_ICON_STEM_RE = re.compile(r'^(?:Arch-Category_|Arch_|Res_)?(?P<name>.+?)(?:_(?P<v1>Dark|Light))?_(?P<size>\d+)'
+                           r'(?:_(?P<v2>Dark|Light))?(?:@(?P<scale>\d+)x)?$')
+# Short names people actually type that can't be derived from the file names
+ICON_ALIASES = {
+    'sns': 'Simple-Notification-Service', 'sqs': 'Simple-Queue-Service', 's3': 'Simple-Storage-Service',
+    'ses': 'Simple-Email-Service', 'apigw': 'API-Gateway', 'ddb': 'DynamoDB', 'elb': 'Elastic-Load-Balancing',
+}
+
+
+def _icon_key(name):
+    return re.sub(r'[^a-z0-9]', '', name.lower())
+
+
+def _icon_aliases(name):
+    keys = {_icon_key(name)}
+    for prefix in ('AWS-', 'Amazon-'):
+        if name.startswith(prefix):
+            keys.add(_icon_key(name[len(prefix):]))
+    return keys
+
+
+def _parse_icon_path(relpath):
+    parts = relpath.split('/')
+    stem, _, format = parts[-1].rpartition('.')
+    match = _ICON_STEM_RE.match(stem)
+    family = next((f for prefix, f in _ICON_FAMILIES if parts[0].startswith(prefix)), None)
+    if not match or match.group('scale') or family is None or format not in ('png', 'svg'):
+        return None  # @5x retina copies and anything we don't recognise stay out of the index
+    name = match.group('name')
+    if family == 'service' or family == 'resource':
+        category = parts[1].split('_', 1)[-1]
+    elif family == 'category':
+        category = name
+    else:
+        category = 'Group'
+    return family, category, name, int(match.group('size')), match.group('v1') or match.group('v2'), format
+
+
+class IconIndex:
+    def __init__(self, root=ICONS_DIR, manifest_path=None):
+        self.root = root
+        self.manifest_path = manifest_path or os.path.join(root, '.manifest.json')
+        self._entries = None
+        self._aliases = None
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            with self._lock:
+                if self._entries is None:
+                    self._load()
+        return self._entries
+
+    def lookup(self, name, size=32, format='png', family=None, variant=None):
+        entries = self.entries
+        memo_key = (name, size, format, family, variant)
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+        name = ICON_ALIASES.get(name.lower(), name)
+        candidates = [entries[i] for i in self._aliases.get(_icon_key(name), ())
+                      if entries[i].format == format and entries[i].variant == variant
+                      and (family is None or entries[i].family == family)]
+        best = min(candidates, default=None, key=lambda e: (
+            _ICON_FAMILY_RANK[e.family], abs(e.size - size), e.size < size, len(e.name)))
+        self._memo[memo_key] = best
+        return best
+
+    def path(self, name, size=32, format='png', family=None, variant=None):
+        entry = self.lookup(name, size, format, family, variant)
+        if entry is None:
+            raise KeyError(f'no {format} icon for {name!r}')
+        return os.path.join(self.root, entry.path)
+
+    def refresh(self, force=False):
+        with self._lock:
+            self._load(force=force)
+
+    # --- Manifest I/O ---
+
+    def _tree_stamp(self, dirs):
+        # contents.txt is the published listing; when it changes the whole tree is re-indexed
+        try:
+            st = os.stat(os.path.join(self.root, 'contents.txt'))
+            contents = f'{st.st_size}:{st.st_mtime_ns}'
+        except OSError:
+            contents = None
+        return contents, {rel: self._dir_stamp(rel) for rel in dirs}
+
+    def _dir_stamp(self, rel):
+        try:
+            if rel == '.':
+                # The manifest itself lives in the root, so the root's mtime moves on every save;
+                # compare its listing instead.
+                manifest = os.path.basename(self.manifest_path)
+                return '/'.join(sorted(n for n in os.listdir(self.root) if not n.startswith(manifest)))
+            return os.stat(os.path.join(self.root, rel)).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self, force=False):
+        if not os.path.isdir(self.root):
+            raise FileNotFoundError(f'icons directory {self.root!r} not found (set LEANIX_ICONS_DIR)')
+        manifest = None
+        if not force:
+            try:
+                with open(self.manifest_path, encoding='utf-8') as f:
+                    manifest = json.load(f)
+                if manifest.get('version') != ICON_MANIFEST_VERSION:
+                    manifest = None
+            except (OSError, ValueError):
+                manifest = None
+
+        if manifest is not None:
+            contents, stamps = self._tree_stamp(manifest['dirs'])
+            if contents == manifest['contents'] and stamps == manifest['dirs']:
+                self._index([IconEntry(*row) for row in manifest['entries']])
+                return
+            stale = {rel for rel, mtime in stamps.items() if mtime != manifest['dirs'][rel]}
+            if contents != manifest['contents']:
+                stale = None  # re-scan everything, but keep hashes of files that did not change
+            previous = {row[6]: IconEntry(*row) for row in manifest['entries']}
+        else:
+            stale, previous = None, {}
+        self._index(self._scan(previous, stale))
+        self._save()
+
+    def _scan(self, previous, stale):
+        # Only directories whose mtime moved are listed again; files keep their hash while size/mtime match
+        entries, dirs, by_dir = [], {}, {}
+        for path, entry in previous.items():
+            by_dir.setdefault(path.rpartition('/')[0] or '.', []).append(entry)
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames.sort()
+            rel_dir = os.path.relpath(dirpath, self.root).replace(os.sep, '/')
+            dirs[rel_dir] = self._dir_stamp(rel_dir)
+            if stale is not None and rel_dir not in stale:
+                entries.extend(by_dir.get(rel_dir, ()))
+                continue
+            for filename in sorted(filenames):
+                rel = filename if rel_dir == '.' else f'{rel_dir}/{filename}'
+                parsed = _parse_icon_path(rel)
+                if parsed is None:
+                    continue
+                st = os.stat(os.path.join(dirpath, filename))
+                old = previous.get(rel)
+                if old is not None and (old.file_size, old.mtime_ns) == (st.st_size, st.st_mtime_ns):
+                    digest = old.hash
+                else:
+                    with open(os.path.join(dirpath, filename), 'rb') as f:
+                        digest = hashlib.sha1(f.read()).hexdigest()[:16]
+                entries.append(IconEntry(*parsed, rel, digest, st.st_size, st.st_mtime_ns))
+        self._dirs = dirs
+        return entries
+
+    def _index(self, entries):
+        aliases = {}
+        for i, entry in enumerate(entries):
+            for key in _icon_aliases(entry.name):
+                aliases.setdefault(key, []).append(i)
+        self._entries, self._aliases, self._memo = entries, aliases, {}
+
+    def _save(self):
+        contents, _ = self._tree_stamp(())
+        manifest = {'version': ICON_MANIFEST_VERSION, 'contents': contents, 'dirs': self._dirs,
+                    'entries': [list(e) for e in self._entries]}
+        tmp_path = f'{self.manifest_path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, separators=(',', ':'))
+            os.replace(tmp_path, self.manifest_path)
+        except OSError:
+            pass  # read-only icon tree: we just re-index next session
+
+
+ICON_INDEX = IconIndex()
+
+
+def icon(name, size=32, format='png', family=None, variant=None):
+    return ICON_INDEX.path(name, size, format, family, variant)
+
+
+def _icon_path(ref, size=32):
+    # Model elements name their icon ("DynamoDB"); explicit paths are still honoured as-is
+    return ref if '/' in ref or os.sep in ref else icon(ref, size=size)
+
+
+# --- Icon pipeline ---
+# Graphviz opens and decodes every image file on every layout and then scales it to the node. We
+# rasterise each icon once at exactly the size it is drawn, into a content-addressed store keyed by the
+# source hash and pixel size, so repeated nodes share one small, pre-sized file. For SVG output the
+# images are inlined as data URIs so the SVG is self-contained.
+ICON_STORE_DIR = os.path.join(RENDER_CACHE_DIR, 'icons') if RENDER_CACHE_DIR else None
+ICON_DPI = 72  # Graphviz points per inch, so 1px in the prepared icon is 1pt in the layout
+
+_prepared_icons = {}
+
+
+def prepared_icon(ref, inches=0.8, dpi=ICON_DPI):
+    px = max(1, round(inches * dpi))
+    key = (ref, px, dpi)
+    path = _prepared_icons.get(key)
+    if path is None:
+        path = _prepared_icons[key] = _prepare_icon(ref, px, dpi)
+    return path
+
+
+def _prepare_icon(ref, px, dpi):
+    if '/' in ref or os.sep in ref:
+        source = ref
+        try:
+            with open(source, 'rb') as f:
+                digest = hashlib.sha1(f.read()).hexdigest()[:16]
+        except OSError:
+            return source  # let Graphviz report the missing file
+    else:
+        # Prefer an SVG master when an SVG rasteriser is installed, else the nearest PNG size
+        entry = None
+        if _optional_import('cairosvg') is not None:
+            entry = ICON_INDEX.lookup(ref, size=px, format='svg')
+        entry = entry or ICON_INDEX.lookup(ref, size=px, format='png')
+        if entry is None:
+            raise KeyError(f'no icon for {ref!r}')
+        source, digest = os.path.join(ICON_INDEX.root, entry.path), entry.hash
+
+    store = ICON_STORE_DIR or os.path.join(_temp_dir(), 'leanix-icons')
+    target = os.path.join(store, f'{digest}-{px}.png')
+    if os.path.exists(target):
+        return target
+    image_lib = _optional_import('PIL.Image')
+    if image_lib is None:
+        return source  # Pillow is optional; without it Graphviz scales the original file itself
+    import io
+
+    if source.endswith('.svg'):
+        data = _optional_import('cairosvg').svg2png(url=source, output_width=px, output_height=px)
+        img = image_lib.open(io.BytesIO(data))
+    else:
+        img = image_lib.open(source)
+    with img:
+        from PIL import ImageOps
+
+        sized = ImageOps.contain(img.convert('RGBA'), (px, px), image_lib.LANCZOS)
+        canvas = image_lib.new('RGBA', (px, px), (0, 0, 0, 0))
+        canvas.paste(sized, ((px - sized.width) // 2, (px - sized.height) // 2))
+    os.makedirs(store, exist_ok=True)
+    tmp_path = f'{target}.{os.getpid()}.tmp'
+    canvas.save(tmp_path, 'PNG', dpi=(dpi, dpi), optimize=True)
+    os.replace(tmp_path, target)
+    return target
+
+
+def _optional_import(name):
+    import importlib
+
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def _temp_dir():
+    import tempfile
+
+    return tempfile.gettempdir()
+
+
+_SVG_IMAGE_RE = re.compile(rb'(xlink:href|href)="([^"]+\.(png|svg|jpe?g|gif))"')
+_inlined_images = {}
+
+
+def _inline_svg_images(svg):
+    def data_uri(match):
+        path = match.group(2).decode('utf-8')
+        uri = _inlined_images.get(path)
+        if uri is None:
+            import base64
+
+            try:
+                with open(path, 'rb') as f:
+                    payload = base64.b64encode(f.read()).decode('ascii')
+            except OSError:
+                return match.group(0)
+            mime = {'svg': 'image/svg+xml', 'jpg': 'image/jpeg', 'jpeg': 'image/jpeg'}.get(
+                match.group(3).decode('ascii'), f'image/{match.group(3).decode("ascii")}')
+            uri = _inlined_images[path] = f'data:{mime};base64,{payload}'
+        return match.group(1) + b'="' + uri.encode('ascii') + b'"'
+
+    return _SVG_IMAGE_RE.sub(data_uri, svg)
+
+
+# --- Bulk DOT emitter ---
+# Drop-in for graphviz.Digraph's node/edge/attr/subgraph API that records rows into tables instead of
+# quoting and formatting every statement as it is added. The DOT text is written in one streaming pass
+# at the end, with each distinct string quoted once and each distinct attribute set formatted once, so
+# it stays cheap for views with tens of thousands of nodes. Output is byte-identical to Digraph's.
+class _Memo(dict):
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+
+    def __missing__(self, key):
+        value = self[key] = self.fn(key)
+        return value
+
+
+class BulkDigraph:
+    def __init__(self, name=None, format='png', engine='dot', _root=None):
+        self.name = name
+        self.format = format
+        self.engine = engine
+        self.neato_no_op = None  # 2 = use the pos attributes as given (pinned layout, see apply_layout)
+        self.view = None  # VIEWS name, set by the view builders
+        self._ops = []
+        self._root = _root or self
+        if _root is None:
+            self._style_ids = {}  # sorted attribute items -> style id, shared with subgraphs
+            self._styles = []
+            self._source = None
+
+    # --- Statements ---
+
+    def attr(self, kw=None, **attrs):
+        if kw is not None and kw.lower() not in ('graph', 'node', 'edge'):
+            raise ValueError(f'attr statement must target graph, node, or edge: {kw!r}')
+        if attrs:
+            self._append(('attr', kw, self._style_id(attrs)))
+
+    def node(self, name, label=None, **attrs):
+        style = self._style_id(attrs)
+        last = self._ops[-1] if self._ops else None
+        if last is not None and last[0] == 'nodes' and last[3] == style:
+            last[1].append(name)
+            last[2].append(label)
+            self._root._source = None
+        else:
+            self._append(('nodes', [name], [label], style))
+
+    def edge(self, tail_name, head_name, label=None, **attrs):
+        style = self._style_id(attrs)
+        last = self._ops[-1] if self._ops else None
+        if last is not None and last[0] == 'edges' and last[4] == style:
+            last[1].append(tail_name)
+            last[2].append(head_name)
+            last[3].append(label)
+            self._root._source = None
+        else:
+            self._append(('edges', [tail_name], [head_name], [label], style))
+
+    def nodes(self, names, labels=None, **attrs):
+        # Whole node table in one call: parallel names/labels columns sharing one style
+        names = list(names)
+        labels = [None] * len(names) if labels is None else list(labels)
+        style = self._style_id(attrs)
+        last = self._ops[-1] if self._ops else None
+        if last is not None and last[0] == 'nodes' and last[3] == style:
+            last[1].extend(names)
+            last[2].extend(labels)
+            self._root._source = None
+        else:
+            self._append(('nodes', names, labels, style))
+
+    def edges(self, tail_names, head_names, labels=None, **attrs):
+        tails, heads = list(tail_names), list(head_names)
+        labels = [None] * len(tails) if labels is None else list(labels)
+        style = self._style_id(attrs)
+        last = self._ops[-1] if self._ops else None
+        if last is not None and last[0] == 'edges' and last[4] == style:
+            last[1].extend(tails)
+            last[2].extend(heads)
+            last[3].extend(labels)
+            self._root._source = None
+        else:
+            self._append(('edges', tails, heads, labels, style))
+
+    @contextmanager
+    def subgraph(self, name=None):
+        child = BulkDigraph(name, self.format, self.engine, _root=self._root)
+        yield child
+        self._append(('subgraph', child))
+
+    def _append(self, op):
+        self._ops.append(op)
+        self._root._source = None
+
+    def _style_id(self, attrs):
+        # Look up by the attrs as given first; only new combinations pay for sorting. Digraph sorts
+        # plain-dict kwargs and drops None values, so the canonical key does the same.
+        root = self._root
+        given = tuple(attrs.items())
+        style = root._style_ids.get(given)
+        if style is None:
+            key = tuple(sorted((k, v) for k, v in given if v is not None))
+            style = root._style_ids.get(key)
+            if style is None:
+                style = root._style_ids[key] = len(root._styles)
+                root._styles.append(key)
+            root._style_ids[given] = style
+        return style
+
+    # --- Table access ---
+
+    def node_ids(self):
+        # Every node named by a statement, in first-seen order (cluster references included)
+        seen = {}
+        for op in self._ops:
+            if op[0] == 'nodes':
+                seen.update(dict.fromkeys(op[1]))
+            elif op[0] == 'subgraph':
+                seen.update(dict.fromkeys(op[1].node_ids()))
+        return list(seen)
+
+    def edge_pairs(self):
+        for op in self._ops:
+            if op[0] == 'edges':
+                yield from zip(op[1], op[2])
+            elif op[0] == 'subgraph':
+                yield from op[1].edge_pairs()
+
+    def copy(self):
+        # Independent copy (as graphviz.Digraph.copy()): edits to it leave this graph and its source alone
+        copy = self.filtered()
+        copy.neato_no_op = self.neato_no_op
+        return copy
+
+    def filtered(self, keep=None, name=None, drop_graph_attrs=(), drop_attrs=(), node_attrs=None, edge_attrs=None,
+                 cluster_attrs=None, _into=None):
+        # Copy restricted to nodes where keep(id) is true (and edges between them); empty clusters vanish.
+        # drop_attrs removes attributes from every statement; node_attrs(name), edge_attrs(tail, head) and
+        # cluster_attrs(name) return extra per-statement attributes (used to pin a cached layout).
+        keep = keep or (lambda id: True)
+        out = _into or BulkDigraph(name or self.name, self.format, self.engine)
+        out.view = out.view or self.view
+        styles = self._root._styles
+
+        def attrs_of(style, drop=drop_attrs):
+            return {k: v for k, v in styles[style] if k not in drop}
+
+        for op in self._ops:
+            kind = op[0]
+            if kind == 'attr':
+                graph_level = op[1] in (None, 'graph')
+                attrs = attrs_of(op[2], tuple(drop_attrs) + (tuple(drop_graph_attrs) if graph_level else ()))
+                out.attr(op[1], **attrs)
+            elif kind == 'nodes':
+                attrs = attrs_of(op[3])
+                rows = [(n, l) for n, l in zip(op[1], op[2]) if keep(n)]
+                if node_attrs is not None:
+                    for n, l in rows:
+                        out.node(n, l, **attrs, **node_attrs(n))
+                elif rows:
+                    out.nodes([n for n, _ in rows], [l for _, l in rows], **attrs)
+            elif kind == 'edges':
+                attrs = attrs_of(op[4])
+                rows = [(t, h, l) for t, h, l in zip(op[1], op[2], op[3]) if keep(t) and keep(h)]
+                if edge_attrs is not None:
+                    for t, h, l in rows:
+                        out.edge(t, h, l, **attrs, **edge_attrs(t, h))
+                elif rows:
+                    out.edges([r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows], **attrs)
+            else:
+                child = op[1]
+                if any(keep(n) for n in child.node_ids()):
+                    with out.subgraph(child.name) as sub:
+                        if cluster_attrs is not None:
+                            sub.attr(**cluster_attrs(child.name))
+                        child.filtered(keep, drop_graph_attrs=drop_graph_attrs, drop_attrs=drop_attrs,
+                                       node_attrs=node_attrs, edge_attrs=edge_attrs, cluster_attrs=cluster_attrs,
+                                       _into=sub)
+        return out
+
+    # --- Output ---
+
+    def __iter__(self):
+        quote, quote_edge, styles = self._root._quoters()
+        yield f'digraph {quote(self.name) + " " if self.name else ""}{{\n'
+        yield from self._lines('\t', quote, quote_edge, styles)
+        yield '}\n'
+
+    def _lines(self, indent, quote, quote_edge, styles):
+        for op in self._ops:
+            kind = op[0]
+            if kind == 'nodes':
+                _, names, labels, style = op
+                attrs = styles[style]
+                for name, label in zip(names, labels):
+                    a_list = f'label={quote(label)} {attrs}' if label is not None and attrs else \
+                        f'label={quote(label)}' if label is not None else attrs
+                    yield f'{indent}{quote_edge(name)} [{a_list}]\n' if a_list else f'{indent}{quote_edge(name)}\n'
+            elif kind == 'edges':
+                _, tails, heads, labels, style = op
+                attrs = styles[style]
+                for tail, head, label in zip(tails, heads, labels):
+                    a_list = f'label={quote(label)} {attrs}' if label is not None and attrs else \
+                        f'label={quote(label)}' if label is not None else attrs
+                    edge = f'{indent}{quote_edge(tail)} -> {quote_edge(head)}'
+                    yield f'{edge} [{a_list}]\n' if a_list else f'{edge}\n'
+            elif kind == 'attr':
+                _, kw, style = op
+                yield f'{indent}{kw} [{styles[style]}]\n' if kw else f'{indent}{styles[style]}\n'
+            else:
+                child = op[1]
+                # as graphviz: an anonymous subgraph is a bare { } block
+                yield f'{indent}subgraph {quote(child.name)} {{\n' if child.name else f'{indent}{{\n'
+                yield from child._lines(indent + '\t', quote, quote_edge, styles)
+                yield f'{indent}}}\n'
+
+    @property
+    def source(self):
+        if self._root is not self:
+            return ''.join(self)
+        if self._source is None:
+            self._source = ''.join(self)
+        return self._source
+
+    def _quoters(self):
+        # Fresh memos per emission: every distinct string is quoted once, every style formatted once
+        from graphviz import quoting
+
+        quote = _Memo(quoting.quote).__getitem__
+        return quote, _Memo(quoting.quote_edge).__getitem__, [
+            ' '.join(f'{quote(k)}={quote(v)}' for k, v in items) for items in self._styles]
+
+    def write(self, file, chunk_size=1 << 16):
+        # Stream the DOT text to a file-like object without materialising it
+        buffer, size = [], 0
+        for line in self:
+            buffer.append(line)
+            size += len(line)
+            if size >= chunk_size:
+                file.write(''.join(buffer))
+                buffer, size = [], 0
+        file.write(''.join(buffer))
+
+    def pipe(self, format=None, **kwargs):
+        from graphviz import Source
+
+        if self.neato_no_op:
+            kwargs.setdefault('neato_no_op', self.neato_no_op)
+        return Source(self.source, engine=self.engine).pipe(format=format or self.format, **kwargs)
+
+    def render(self, filename=None, view=False, format=None, **kwargs):
+        from graphviz import Source
+
+        return Source(self.source, filename=filename, engine=self.engine,
+                      format=format or self.format).render(view=view, **kwargs)
+
+
+# --- Architecture model ---
+# One in-memory model holds every element and relationship; the views below are projections of it.
+# Records are __slots__ classes so a landscape of tens of thousands of fact sheets stays compact, and
+# the id/type/layer indexes plus forward/reverse adjacency let a view slice out its elements in
+# O(selected elements) instead of scanning the whole landscape.
+class Element:
+    __slots__ = ('id', 'type', 'label', 'layer', 'state', 'props')
+
+    def __init__(self, id, type, label, layer, state=None, props=None):
+        self.id = id
+        self.type = type
+        self.label = label
+        self.layer = layer
+        self.state = state  # 'as-is', 'to-be' or None when shared by both landscapes
+        self.props = props or {}
+
+    def __repr__(self):
+        return f'<Element {self.id} {self.type} {self.label!r}>'
+
+
+class Relation:
+    __slots__ = ('source', 'target', 'type', 'label', 'props')
+
+    def __init__(self, source, target, type, label=None, props=None):
+        self.source = source
+        self.target = target
+        self.type = type
+        self.label = label
+        self.props = props or {}
+
+    def __repr__(self):
+        return f'<Relation {self.source} -{self.type}-> {self.target}>'
+
+
+class ArchitectureModel:
+    def __init__(self):
+        self.elements = {}
+        self.relations = []
+        self._by_type = {}
+        self._by_layer = {}
+        self._by_relation_type = {}
+        self._out = {}
+        self._in = {}
+        # Dependency tracking: while a view is built under track(), every query records what it read
+        # as tokens like ('element', id), ('type', t) or ('out', id). Edits publish the tokens they
+        # invalidate to subscribers, so a renderer can mark only the affected views dirty.
+        self._reads = None
+        self._listeners = []
+        self._impact = None  # ImpactIndex, see impact_index()
+        self._issues = None  # validate_model() by element id, see _model_issues()
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __contains__(self, id):
+        return id in self.elements
+
+    def __getitem__(self, id):
+        if self._reads is not None:
+            self._reads.add(('element', id))
+        return self.elements[id]
+
+    # --- Edits ---
+
+    def add(self, id, type, label, layer, state=None, **props):
+        if id in self.elements:
+            raise ValueError(f'duplicate element id {id!r}')
+        element = Element(id, type, label, layer, state, props)
+        self.elements[id] = element
+        self._by_type.setdefault(type, []).append(element)
+        self._by_layer.setdefault(layer, []).append(element)
+        if self._listeners:
+            self._notify(_element_tokens(element))
+        return element
+
+    def relate(self, source, target, type, label=None, **props):
+        relation = Relation(source, target, type, label, props)
+        self.relations.append(relation)
+        self._by_relation_type.setdefault(type, []).append(relation)
+        self._out.setdefault(source, []).append(relation)
+        self._in.setdefault(target, []).append(relation)
+        if self._listeners:
+            self._notify(_relation_tokens(relation))
+        return relation
+
+    def update(self, id, label=None, **props):
+        element = self.elements[id]
+        if label is not None:
+            element.label = label
+        element.props.update(props)
+        if self._listeners:
+            self._notify({('element', id)})
+        return element
+
+    def remove(self, id):
+        element = self.elements.pop(id)
+        self._by_type[element.type].remove(element)
+        self._by_layer[element.layer].remove(element)
+        tokens = _element_tokens(element)
+        # Each affected list is filtered once (in place, callers may hold it): O(R + degree), where
+        # removing the incident relations one by one would be O(degree * R)
+        dropped = set(self._out.pop(id, ()))
+        dropped.update(self._in.pop(id, ()))
+        if dropped:
+            self.relations[:] = [r for r in self.relations if r not in dropped]
+            for index, keys in ((self._by_relation_type, {r.type for r in dropped}),
+                                (self._out, {r.source for r in dropped}), (self._in, {r.target for r in dropped})):
+                for key in keys:
+                    if key in index:
+                        index[key][:] = [r for r in index[key] if r not in dropped]
+            for relation in dropped:
+                tokens |= _relation_tokens(relation)
+        if self._listeners:
+            self._notify(tokens)
+        return element
+
+    def unrelate(self, relation):
+        self._drop_relation(relation)
+        if self._listeners:
+            self._notify(_relation_tokens(relation))
+
+    def _load(self, elements, relations):
+        # Bulk fill of a new, unsubscribed model (snapshot loads): the same indexes add() and relate()
+        # keep, without their per-call checks and notifications
+        self.elements = {e.id: e for e in elements}
+        if len(self.elements) != len(elements):
+            raise ValueError('duplicate element ids')
+        by_type, by_layer = self._by_type, self._by_layer
+        for e in elements:
+            by_type.setdefault(e.type, []).append(e)
+            by_layer.setdefault(e.layer, []).append(e)
+        self.relations = relations
+        by_relation_type, out, in_ = self._by_relation_type, self._out, self._in
+        for r in relations:
+            by_relation_type.setdefault(r.type, []).append(r)
+            out.setdefault(r.source, []).append(r)
+            in_.setdefault(r.target, []).append(r)
+
+    def _drop_relation(self, relation):
+        self.relations.remove(relation)
+        self._by_relation_type[relation.type].remove(relation)
+        for index, key in ((self._out, relation.source), (self._in, relation.target)):
+            if relation in index.get(key, ()):
+                index[key].remove(relation)
+
+    # --- Change tracking ---
+
+    @contextmanager
+    def track(self):
+        previous, self._reads = self._reads, set()
+        try:
+            yield self._reads
+        finally:
+            self._reads = previous
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener):
+        self._listeners.remove(listener)
+
+    def _notify(self, tokens):
+        for listener in list(self._listeners):
+            listener(tokens)
+
+    def _read(self, selector, elements):
+        if self._reads is not None:
+            self._reads.add(selector)
+            self._reads.update(('element', e.id) for e in elements)
+        return elements
+
+    # --- Queries ---
+
+    def get(self, id, default=None):
+        if self._reads is not None:
+            self._reads.add(('element', id))
+        return self.elements.get(id, default)
+
+    def of_type(self, type, state=None):
+        elements = self._by_type.get(type, ())
+        return self._read(('type', type), _in_state(elements, state))
+
+    def in_layer(self, layer, state=None):
+        elements = self._by_layer.get(layer, ())
+        return self._read(('layer', layer), _in_state(elements, state))
+
+    def relations_of_type(self, type):
+        if self._reads is not None:
+            self._reads.add(('relation', type))
+        return list(self._by_relation_type.get(type, ()))
+
+    def outgoing(self, id, type=None):
+        if self._reads is not None:
+            self._reads.add(('out', id))
+        relations = self._out.get(id, ())
+        return [r for r in relations if r.type == type] if type else list(relations)
+
+    def incoming(self, id, type=None):
+        if self._reads is not None:
+            self._reads.add(('in', id))
+        relations = self._in.get(id, ())
+        return [r for r in relations if r.type == type] if type else list(relations)
+
+    def relations_among(self, elements, types=None):
+        # Relations with both ends inside the selection, in selection order: cost is the selection's
+        # out-degree, not the size of the model.
+        if self._reads is not None:
+            self._reads.update(('out', e.id) for e in elements)
+        ids = {e.id for e in elements}
+        return [r for e in elements for r in self._out.get(e.id, ())
+                if r.target in ids and (types is None or r.type in types)]
+
+
+def _in_state(elements, state):
+    # Elements without a state (capabilities, fact sheets with no lifecycle) are shared by every state
+    return [e for e in elements if e.state is None or e.state == state] if state else list(elements)
+
+
+def _element_tokens(element):
+    return {('element', element.id), ('type', element.type), ('layer', element.layer)}
+
+
+def _relation_tokens(relation):
+    return {('out', relation.source), ('in', relation.target), ('relation', relation.type)}
+
+
+def changed_tokens(old, new):
+    # What a switch from one model snapshot to the next invalidates, in the same tokens track() records.
+    tokens = set()
+    for id, element in old.elements.items():
+        other = new.elements.get(id)
+        if other is None:
+            tokens |= _element_tokens(element)
+        elif (element.type, element.layer, element.state) != (other.type, other.layer, other.state):
+            tokens |= _element_tokens(element) | _element_tokens(other)
+        elif (element.label, element.props) != (other.label, other.props):
+            tokens.add(('element', id))  # same lists, as after update()
+    for id, element in new.elements.items():
+        if id not in old.elements:
+            tokens |= _element_tokens(element)
+
+    def signature(relation):
+        return relation.source, relation.target, relation.type, relation.label, json.dumps(relation.props, sort_keys=True)
+
+    old_relations = {signature(r): r for r in old.relations}
+    new_relations = {signature(r): r for r in new.relations}
+    for key in old_relations.keys() ^ new_relations.keys():
+        tokens |= _relation_tokens(old_relations.get(key) or new_relations[key])
+    return tokens
+
+
+# Relationship types drawn on the technology views (app/infra → infra/runtime)
+TECHNOLOGY_RELATIONS = ('deployed_on', 'hosted_on', 'runs_on', 'uses', 'auth_via', 'writes_to', 'delivers_to')
+
+
+def _unique(elements):
+    return list({e.id: e for e in elements}.values())
+
+
+def example_model():
+    model = ArchitectureModel()
+
+    # Business layer
+    for id, label in [("VC1", "Customer Order Placement"), ("VC2", "Inventory Check & Reservation"),
+                      ("VC3", "Order Fulfillment"), ("VC4", "Customer Notification")]:
+        model.add(id, 'value_chain_step', label, 'business')
+    for id, label in [("CAP1", "Order Management"), ("CAP2", "Inventory Reservation"),
+                      ("CAP3", "Fulfillment Scheduling"), ("CAP4", "Customer Communication")]:
+        model.add(id, 'capability', label, 'business')
+    model.add("Customer", 'actor', "Customer", 'business')
+    for source, target in [("VC1", "VC2"), ("VC2", "VC3"), ("VC3", "VC4")]:
+        model.relate(source, target, 'triggers', 'triggers')
+    for cap, step in [("CAP1", "VC1"), ("CAP2", "VC2"), ("CAP3", "VC3"), ("CAP4", "VC4")]:
+        model.relate(cap, step, 'realizes', 'realizes')
+
+    # As-is application layer
+    for id, label in [("APP1", "OrderPortalApp"), ("APP2", "InventoryManagerApp"), ("APP3", "UserStoreApp")]:
+        model.add(id, 'application', label, 'application', 'as-is')
+    model.add("EXT1", "external_system", "Notification System", 'application', 'as-is')
+    for id, label, kind in [("IF1", "Order API", "REST"), ("IF2", "User Pref API", "REST"),
+                            ("IF3", "Notification Topic", "PubSub")]:
+        model.add(id, 'interface', label, 'application', 'as-is', kind=kind)
+    for cap, app in [("CAP1", "APP1"), ("CAP2", "APP2"), ("CAP3", "APP2"), ("CAP4", "APP3")]:
+        model.relate(cap, app, 'serves', 'serves')
+    for iface, source, target in [("IF1", "APP1", "APP2"), ("IF2", "APP2", "APP3"), ("IF3", "APP2", "EXT1")]:
+        model.relate(source, iface, 'exposes', 'exposes')
+        model.relate(iface, target, 'invokes', 'invokes')
+
+    # As-is data flow
+    for id, label in [("Order", "Order"), ("InventoryInfo", "Inventory Info"), ("UserPrefs", "User Preferences"),
+                      ("NotifEvent", "Notification Event")]:
+        model.add(id, 'data_object', label, 'application', 'as-is')
+    for source, target, label in [("Customer", "APP1", 'places Order'), ("APP1", "Order", 'creates'),
+                                  ("Order", "APP2", 'for Inventory Check'), ("APP2", "InventoryInfo", 'queries/modifies'),
+                                  ("APP2", "APP3", 'requests preferences'), ("APP3", "UserPrefs", 'provides'),
+                                  ("APP2", "NotifEvent", 'generates'), ("NotifEvent", "EXT1", 'sends')]:
+        model.relate(source, target, 'flow', label)
+
+    # As-is technology layer
+    for id, type, label in [("INF1", 'infrastructure', "WebLogic Server"), ("INF2", 'infrastructure', "VM on vSphere"),
+                            ("INF3", 'platform', "Oracle RDBMS"), ("INF4", 'platform', "MSMQ"),
+                            ("INF5", 'infrastructure', "Active Directory"), ("INF6", 'infrastructure', "File Share"),
+                            ("INF7", 'infrastructure', "Spring Boot Runtime"), ("INF8", 'infrastructure', "Java 8 (JDK)")]:
+        model.add(id, type, label, 'technology', 'as-is')
+    model.add("R1", 'runtime', "Spring MVC", 'technology', 'as-is')
+    model.add("R2", 'runtime', "Spring Boot", 'technology', 'as-is')
+    for source, target, type, label in [
+        ("APP1", "INF1", 'deployed_on', 'deployed on'), ("APP1", "INF3", 'uses', 'uses DB'),
+        ("APP1", "R1", 'runs_on', 'runs on'), ("APP1", "INF8", 'uses', 'uses JDK'), ("APP1", "INF2", 'hosted_on', 'hosted on'),
+        ("APP2", "INF3", 'uses', 'uses DB'), ("APP2", "INF4", 'uses', 'uses MSMQ'), ("APP2", "INF2", 'hosted_on', 'hosted on'),
+        ("APP2", "R2", 'runs_on', 'runs on'), ("APP2", "INF8", 'uses', 'uses JDK'),
+        ("APP3", "INF1", 'deployed_on', 'deployed on'), ("APP3", "INF3", 'uses', 'uses DB'),
+        ("APP3", "R1", 'runs_on', 'runs on'), ("APP3", "INF8", 'uses', 'uses JDK'), ("APP3", "INF2", 'hosted_on', 'hosted on'),
+        ("APP1", "INF5", 'auth_via', 'auth via'), ("APP3", "INF5", 'auth_via', 'auth via'),
+        ("APP2", "INF6", 'writes_to', 'writes to'), ("INF4", "EXT1", 'delivers_to', 'delivers to'),
+    ]:
+        model.relate(source, target, type, label)
+
+    # To-be application layer (AWS SAM + Lambda)
+    for id, label in [("TOBE_APP1", "OrderProcessorApp"), ("TOBE_APP2", "InventoryServiceApp"),
+                      ("TOBE_APP3", "UserProfileApp"), ("TOBE_APP4", "NotificationService")]:
+        model.add(id, 'application', label, 'application', 'to-be')
+    for id, label in [("FN1", "SubmitOrderFn"), ("FN2", "ValidateOrderFn"), ("FN3", "CheckInventoryFn"),
+                      ("FN4", "ReserveStockFn"), ("FN5", "GetUserPrefsFn"), ("FN6", "UpdatePrefsFn"),
+                      ("FN7", "NotifyUserFn")]:
+        model.add(id, 'function', label, 'application', 'to-be')
+    for id, label, kind in [("TOBE_IF1", "REST: Submit Order", "REST"), ("TOBE_IF2", "REST: Check Inventory", "REST"),
+                            ("TOBE_IF3", "REST: Get User Prefs", "REST"), ("TOBE_IF4", "SNS: Order Events", "SNS"),
+                            ("TOBE_IF5", "SNS: Notifications", "SNS")]:
+        model.add(id, 'interface', label, 'application', 'to-be', kind=kind)
+    for cap, app in [("CAP1", "TOBE_APP1"), ("CAP2", "TOBE_APP2"), ("CAP3", "TOBE_APP2"),
+                     ("CAP4", "TOBE_APP3"), ("CAP4", "TOBE_APP4")]:
+        model.relate(cap, app, 'serves', 'served by')
+    for app, fn in [("TOBE_APP1", "FN1"), ("TOBE_APP1", "FN2"), ("TOBE_APP2", "FN3"), ("TOBE_APP2", "FN4"),
+                    ("TOBE_APP3", "FN5"), ("TOBE_APP3", "FN6"), ("TOBE_APP4", "FN7")]:
+        model.relate(app, fn, 'composes', 'composes')
+    for iface, fn, type in [("TOBE_IF1", "FN1", 'invokes'), ("TOBE_IF2", "FN3", 'invokes'),
+                            ("TOBE_IF3", "FN5", 'invokes'), ("TOBE_IF4", "FN2", 'triggers'),
+                            ("TOBE_IF4", "FN4", 'triggers'), ("TOBE_IF5", "FN7", 'triggers')]:
+        model.relate(iface, fn, type, type)
+
+    # To-be technology layer
+    model.add("RT1", 'runtime', "Python 3.12 Runtime", 'technology', 'to-be')
+    for id, label, icon in [
+        ("AWS_LAMBDA", "AWS Lambda", "Lambda"),
+        ("AWS_APIGW", "API Gateway", "API Gateway"),
+        ("AWS_SNS", "Amazon SNS", "SNS"),
+        ("AWS_DYNAMODB", "Amazon DynamoDB", "DynamoDB"),
+        ("AWS_COGNITO", "Amazon Cognito", "Cognito"),
+        ("AWS_CLOUDWATCH", "CloudWatch Logs", "CloudWatch"),
+        ("AWS_S3", "Amazon S3", "S3"),
+    ]:
+        model.add(id, 'cloud_service', label, 'technology', 'to-be', icon=icon)
+    for app, services in [
+        ("TOBE_APP1", ["AWS_LAMBDA", "AWS_APIGW", "AWS_SNS", "AWS_DYNAMODB", "AWS_COGNITO", "AWS_CLOUDWATCH", "RT1"]),
+        ("TOBE_APP2", ["AWS_LAMBDA", "AWS_SNS", "AWS_DYNAMODB", "AWS_CLOUDWATCH", "RT1"]),
+        ("TOBE_APP3", ["AWS_LAMBDA", "AWS_APIGW", "AWS_DYNAMODB", "AWS_COGNITO", "AWS_CLOUDWATCH", "RT1"]),
+        ("TOBE_APP4", ["AWS_LAMBDA", "AWS_SNS", "AWS_CLOUDWATCH", "RT1"]),
+    ]:
+        for service in services:
+            model.relate(app, service, 'uses')
+
+    # To-be replaces as-is
+    for new, old in [("TOBE_APP1", "APP1"), ("TOBE_APP2", "APP2"), ("TOBE_APP3", "APP3"), ("TOBE_APP4", "EXT1"),
+                     ("AWS_LAMBDA", "INF1"), ("AWS_DYNAMODB", "INF3"), ("AWS_SNS", "INF4"), ("AWS_S3", "INF6")]:
+        model.relate(new, old, 'replaces', 'replaces')
+
+    # Implementation roadmap
+    for id, label, days in [("T1", "Requirement Gathering", 10), ("T2", "Design Phase", 15),
+                            ("T3", "Development Phase", 40), ("T4", "Testing Phase", 20),
+                            ("T5", "Deployment Phase", 5), ("T6", "Post-Deployment Review", 5)]:
+        model.add(id, 'task', label, 'implementation', duration=days)
+    for id, label in [("M1", "Phase 1 Complete"), ("M2", "Phase 2 Complete"), ("M3", "Project Complete")]:
+        model.add(id, 'milestone', label, 'implementation')
+    for source, target in [("T1", "T2"), ("T2", "M1"), ("T2", "T3"), ("T3", "M2"), ("T3", "T4"),
+                           ("T4", "M3"), ("T4", "T5"), ("T5", "M3"), ("M1", "T6")]:
+        model.relate(source, target, 'precedes')
+
+    return model
+
+
+def save_model(model, path):
+    data = {
+        'elements': [{'id': e.id, 'type': e.type, 'label': e.label, 'layer': e.layer, 'state': e.state,
+                      'props': e.props} for e in model.elements.values()],
+        'relations': [{'source': r.source, 'target': r.target, 'type': r.type, 'label': r.label,
+                       'props': r.props} for r in model.relations],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1, ensure_ascii=False)
+
+
+def load_model(path):
+    # JSON from save_model(), or a binary snapshot from save_snapshot()
+    with open(path, 'rb') as f:
+        if f.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC:
+            return load_snapshot(path)
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    model = ArchitectureModel()
+    for e in data.get('elements', []):
+        model.add(e['id'], e['type'], e['label'], e['layer'], e.get('state'), **(e.get('props') or {}))
+    for r in data.get('relations', []):
+        model.relate(r['source'], r['target'], r['type'], r.get('label'), **(r.get('props') or {}))
+    return model
+
+
+# --- Validation ---
+# Checks a built view before Graphviz sees it, in one pass over its statements: edges to nodes the view
+# never declares (dot would silently add bare nodes), one id declared with two different labels or a
+# legend id that is also an element id, and duplicate edges. Model relations are checked once per model
+# edit (references to missing elements, duplicate relations, relation types missing from RELATION_LAYERS,
+# relations between layers the type does not allow) and a view reports those touching what it draws.
+# The view builders run it when VALIDATE_VIEWS is on and raise ValidationError, listing every issue,
+# instead of handing broken input to dot.
+VALIDATE_VIEWS = os.environ.get('LEANIX_VALIDATE', '1') != '0'
+VALIDATION_REPORT_LINES = 20
+_FLOW_LAYERS = ('business', 'application')
+RELATION_LAYERS = {
+    # relation type -> allowed (source layer, target layer) pairs; None = both ends in the same layer
+    'realizes': {('business', 'business')},
+    'serves': {('business', 'application'), ('application', 'business')},
+    'exposes': {('application', 'application')},
+    'invokes': {('application', 'application')},
+    'flow': {(a, b) for a in _FLOW_LAYERS for b in _FLOW_LAYERS},
+    'deployed_on': {('application', 'technology')},
+    'hosted_on': {('application', 'technology')},
+    'runs_on': {('application', 'technology')},
+    'uses': {('application', 'technology')},
+    'auth_via': {('application', 'technology')},
+    'writes_to': {('application', 'technology')},
+    'delivers_to': {('technology', 'application')},
+    'triggers': None,
+    'composes': None,
+    'replaces': None,
+    'precedes': None,
+}
+ValidationIssue = namedtuple('ValidationIssue', 'kind ids message')
+
+
+class ValidationError(ValueError):
+    def __init__(self, issues, view=None):
+        self.issues = issues
+        self.view = view
+        lines = [f'{issue.kind}: {issue.message}' for issue in issues[:VALIDATION_REPORT_LINES]]
+        if len(issues) > len(lines):
+            lines.append(f'... and {len(issues) - len(lines)} more')
+        super().__init__(f'{view or "model"}: {len(issues)} validation issue(s)\n  ' + '\n  '.join(lines))
+
+
+def validate_model(model=None):
+    # Relation checks over the whole model; returns the issues (empty when clean)
+    model = MODEL if model is None else model
+    issues = []
+    _relation_issues(model, model.relations, issues)
+    return issues
+
+
+def validate_view(dot, model=None):
+    # Issues of a built view; model=None skips the checks that need the model behind it. Statements are
+    # taken a whole op at a time with set/dict operations; the per-item loops run only on a clash.
+    issues, labels, declared, legend, edges, ends = [], {}, {}, [], set(), set()
+
+    def walk(graph, in_legend):
+        for op in graph._ops:
+            if op[0] == 'nodes':
+                names = op[1]
+                declared.update(dict.fromkeys(names))
+                if in_legend:
+                    legend.extend(names)
+                batch = dict(zip(names, op[2]))
+                if len(batch) == len(names) and labels.keys().isdisjoint(batch):
+                    labels.update(batch)
+                    continue
+                for name, label in zip(names, op[2]):
+                    first = labels.get(name)
+                    if first is None:
+                        labels[name] = label
+                    elif label is not None and label != first:
+                        issues.append(ValidationIssue('id collision', (name,),
+                                                      f'{name} declared as {first!r} and as {label!r}'))
+            elif op[0] == 'edges':
+                ends.update(op[1])
+                ends.update(op[2])
+                keys = list(zip(op[1], op[2], op[3], itertools.repeat(op[4])))
+                batch = set(keys)
+                if len(batch) == len(keys) and edges.isdisjoint(batch):
+                    edges.update(batch)
+                    continue
+                for key in keys:
+                    if key in edges:
+                        tail, head, label = key[:3]
+                        issues.append(ValidationIssue('duplicate edge', (tail, head),
+                                                      f'{tail} -> {head}' + (f' ({label})' if label else '')))
+                    edges.add(key)
+            elif op[0] == 'subgraph':
+                walk(op[1], in_legend or 'legend' in (op[1].name or ''))
+
+    walk(dot, False)
+    missing = ends.difference(declared)
+    if missing:
+        for tail, head, _, _ in edges:
+            for id in (tail, head):
+                if id in missing:
+                    issues.append(ValidationIssue('dangling reference', (tail, head),
+                                                  f'edge {tail} -> {head} references undeclared node {id}'))
+    if model is not None:
+        elements = model.elements
+        for name in legend:
+            if name in elements:
+                issues.append(ValidationIssue('id collision', (name,),
+                                              f'legend node {name} has the id of element {elements[name].label!r}'))
+        by_id = _model_issues(model)
+        if by_id:
+            issues.extend(dict.fromkeys(issue for id in declared for issue in by_id.get(id, ())))
+    return issues
+
+
+def _model_issues(model):
+    # validate_model() by element id, kept until the next edit; the listener drops it and unsubscribes,
+    # so edits between validations cost nothing
+    by_id = model._issues
+    if by_id is None:
+        by_id = model._issues = {}
+        for issue in validate_model(model):
+            for id in dict.fromkeys(issue.ids):
+                by_id.setdefault(id, []).append(issue)
+
+        def drop(tokens):
+            model._issues = None
+            model.unsubscribe(drop)
+        model.subscribe(drop)
+    return by_id
+
+
+def _relation_issues(model, relations, issues):
+    elements, seen = model.elements, set()
+    for r in relations:
+        missing = [id for id in (r.source, r.target) if id not in elements]
+        if missing:
+            issues.append(ValidationIssue('dangling reference', (r.source, r.target),
+                                          f'{r.source} -{r.type}-> {r.target} references missing {", ".join(missing)}'))
+            continue
+        key = (r.source, r.target, r.type, r.label)
+        if key in seen:
+            issues.append(ValidationIssue('duplicate relation', (r.source, r.target),
+                                          f'{r.source} -{r.type}-> {r.target} appears more than once'))
+            continue
+        seen.add(key)
+        if r.type not in RELATION_LAYERS:
+            issues.append(ValidationIssue('unknown relation type', (r.source, r.target),
+                                          f'{r.source} -{r.type}-> {r.target}: {r.type!r} is not in RELATION_LAYERS'))
+            continue
+        allowed, source, target = RELATION_LAYERS[r.type], elements[r.source].layer, elements[r.target].layer
+        if source != target if allowed is None else (source, target) not in allowed:
+            issues.append(ValidationIssue('layer violation', (r.source, r.target),
+                                          f'{r.source} ({source}) -{r.type}-> {r.target} ({target})'))
+
+
+# --- Model snapshots ---
+# A binary alternative to save_model()'s JSON for large landscapes. The file is a header, a section
+# directory and 8-byte aligned sections: a string table (every id, type, label, layer, state and props
+# JSON stored once, NUL-terminated, with an offsets column), one little-endian uint32 column per element
+# and relation field holding string-table indexes, and per-type postings (type -> element rows) so a load
+# restricted to a few types reads only their rows. Snapshot maps the file and reads columns in place;
+# opening checks the header, directory CRC and section bounds, verify=True also checks every section's
+# CRC and every string index.
+SNAPSHOT_MAGIC = b'LXSNAP\r\n'
+SNAPSHOT_VERSION = 1
+_SNAPSHOT_HEADER = struct.Struct('<8sIII')  # magic, version, section count, directory CRC
+_SNAPSHOT_SECTION = struct.Struct('<4sQQI')  # name, offset, length, CRC
+_SNAPSHOT_NONE = 0xFFFFFFFF  # absent label, state or props
+_SNAPSHOT_ELEMENTS = (b'EID ', b'ETYP', b'ELAB', b'ELAY', b'ESTA', b'EPRP')
+_SNAPSHOT_RELATIONS = (b'RSRC', b'RTGT', b'RTYP', b'RLAB', b'RPRP')
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def save_snapshot(model, path):
+    from array import array
+
+    strings, table = [], {}
+
+    def intern(value):
+        index = table.get(value)
+        if index is None:
+            if '\0' in value:
+                raise SnapshotError(f'NUL character in {value!r}')
+            index = table[value] = len(strings)
+            strings.append(value)
+        return index
+
+    def optional(value):
+        return _SNAPSHOT_NONE if value is None else intern(value)
+
+    def props(value):
+        return intern(json.dumps(value, ensure_ascii=False)) if value else _SNAPSHOT_NONE
+
+    elements = list(model.elements.values())
+    columns = {
+        b'EID ': [intern(e.id) for e in elements],
+        b'ETYP': [intern(e.type) for e in elements],
+        b'ELAB': [optional(e.label) for e in elements],
+        b'ELAY': [intern(e.layer) for e in elements],
+        b'ESTA': [optional(e.state) for e in elements],
+        b'EPRP': [props(e.props) for e in elements],
+        b'RSRC': [intern(r.source) for r in model.relations],
+        b'RTGT': [intern(r.target) for r in model.relations],
+        b'RTYP': [intern(r.type) for r in model.relations],
+        b'RLAB': [optional(r.label) for r in model.relations],
+        b'RPRP': [props(r.props) for r in model.relations],
+    }
+    postings = {}
+    for row, type in enumerate(columns[b'ETYP']):
+        postings.setdefault(type, []).append(row)
+    columns[b'TKEY'] = list(postings)
+    columns[b'TOFF'] = list(itertools.accumulate((len(rows) for rows in postings.values()), initial=0))
+    columns[b'TROW'] = [row for rows in postings.values() for row in rows]
+
+    blob = ''.join(value + '\0' for value in strings).encode('utf-8')
+    offsets, position = [0], 0
+    for value in strings:
+        position += len(value.encode('utf-8')) + 1
+        offsets.append(position)
+    if position > _SNAPSHOT_NONE:
+        raise SnapshotError('string table over 4 GiB')
+    sections = [(b'STRO', array('I', offsets)), (b'STRS', blob)]
+    sections += [(name, array('I', values)) for name, values in columns.items()]
+
+    # Directory first (offsets are known from the lengths), then the 8-byte aligned sections
+    offset = _SNAPSHOT_HEADER.size + _SNAPSHOT_SECTION.size * len(sections)
+    directory, payload = [], []
+    for name, data in sections:
+        if isinstance(data, array) and sys.byteorder != 'little':
+            data.byteswap()
+        data = memoryview(data).cast('B')
+        offset += -offset % 8
+        directory.append(_SNAPSHOT_SECTION.pack(name, offset, len(data), zlib.crc32(data)))
+        payload.append((offset, data))
+        offset += len(data)
+    directory = b''.join(directory)
+    tmp = os.fspath(path) + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(sections), zlib.crc32(directory)))
+        f.write(directory)
+        for offset, data in payload:
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(data)
+    os.replace(tmp, path)
+
+
+class Snapshot:
+    def __init__(self, path, verify=False):
+        import mmap
+
+        self.path = path
+        self._columns, self._strings = {}, {}
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        try:
+            self._sections = self._read_directory()
+            if verify:
+                self.verify()
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self._column(b'EID '))
+
+    def close(self):
+        # Column views must be released before the map can close
+        for column in self._columns.values():
+            if isinstance(column, memoryview):
+                column.release()
+        self._columns = {}
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _read_directory(self):
+        data = self._map
+        if data is None or len(data) < _SNAPSHOT_HEADER.size:
+            raise SnapshotError(f'{self.path}: truncated header')
+        magic, version, count, crc = _SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError(f'{self.path}: not a leanix snapshot')
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError(f'{self.path}: snapshot version {version}, expected {SNAPSHOT_VERSION}')
+        end = _SNAPSHOT_HEADER.size + _SNAPSHOT_SECTION.size * count
+        if len(data) < end or zlib.crc32(data[_SNAPSHOT_HEADER.size:end]) != crc:
+            raise SnapshotError(f'{self.path}: corrupt section directory')
+        sections = {}
+        for offset in range(_SNAPSHOT_HEADER.size, end, _SNAPSHOT_SECTION.size):
+            name, start, length, crc = _SNAPSHOT_SECTION.unpack_from(data, offset)
+            if start + length > len(data) or (name != b'STRS' and length % 4):
+                raise SnapshotError(f'{self.path}: section {name!r} out of bounds')
+            sections[name] = (start, length, crc)
+        required = (b'STRO', b'STRS', b'TKEY', b'TOFF', b'TROW') + _SNAPSHOT_ELEMENTS + _SNAPSHOT_RELATIONS
+        missing = [name.decode() for name in required if name not in sections]
+        if missing:
+            raise SnapshotError(f'{self.path}: missing sections {", ".join(missing)}')
+        for names in (_SNAPSHOT_ELEMENTS + (b'TROW',), _SNAPSHOT_RELATIONS):
+            if len({sections[name][1] for name in names}) > 1:
+                raise SnapshotError(f'{self.path}: columns {b", ".join(names).decode()} differ in length')
+        if sections[b'TOFF'][1] != sections[b'TKEY'][1] + 4:
+            raise SnapshotError(f'{self.path}: type index offsets do not match its keys')
+        self._sections = sections
+        offsets = self._column(b'STRO')
+        if not len(offsets) or offsets[-1] != sections[b'STRS'][1]:
+            raise SnapshotError(f'{self.path}: string offsets do not match the string table')
+        return sections
+
+    def verify(self):
+        # Full check: every section's CRC, then every string index and row in range. Reads the whole file.
+        with memoryview(self._map) as data:
+            for name, (start, length, crc) in self._sections.items():
+                if zlib.crc32(data[start:start + length]) != crc:
+                    raise SnapshotError(f'{self.path}: section {name.decode()} fails its checksum')
+        strings = len(self._column(b'STRO')) - 1
+        for name in _SNAPSHOT_ELEMENTS + _SNAPSHOT_RELATIONS + (b'TKEY',):
+            values = [v for v in self._column(name).tolist() if v != _SNAPSHOT_NONE]
+            if values and max(values) >= strings:
+                raise SnapshotError(f'{self.path}: section {name.decode()} points past the string table')
+        rows, offsets = self._column(b'TROW').tolist(), self._column(b'TOFF').tolist()
+        if rows and max(rows) >= len(self) or offsets and offsets[-1] != len(rows) \
+                or any(a > b for a, b in zip(offsets, offsets[1:])):
+            raise SnapshotError(f'{self.path}: type index does not match the element columns')
+
+    def _column(self, name):
+        # uint32 view straight onto the mapped file; pages are read when a value is touched
+        column = self._columns.get(name)
+        if column is None:
+            start, length, _ = self._sections[name]
+            with memoryview(self._map) as data:
+                column = data[start:start + length].cast('I')
+            if sys.byteorder != 'little':
+                from array import array
+
+                column = array('I', column)
+                column.byteswap()
+            self._columns[name] = column
+        return column
+
+    def string(self, index):
+        if index == _SNAPSHOT_NONE:
+            return None
+        value = self._strings.get(index)
+        if value is None:
+            offsets, (start, _, _) = self._column(b'STRO'), self._sections[b'STRS']
+            value = str(self._map[start + offsets[index]:start + offsets[index + 1] - 1], 'utf-8')
+            self._strings[index] = value
+        return value
+
+    def types(self):
+        return [self.string(key) for key in self._column(b'TKEY')]
+
+    def rows(self, types=None):
+        # Element rows, in model order, of every type or of the given ones (from the type postings)
+        if types is None:
+            return range(len(self))
+        types = {types} if isinstance(types, str) else set(types)
+        offsets, rows = self._column(b'TOFF'), self._column(b'TROW')
+        selected = []
+        for i, key in enumerate(self._column(b'TKEY')):
+            if self.string(key) in types:
+                selected.extend(rows[offsets[i]:offsets[i + 1]])
+        return sorted(selected)
+
+    def model(self, types=None):
+        # Materialise an ArchitectureModel with every element, or those of the given types and the
+        # relations among them
+        elements = [self._column(name) for name in _SNAPSHOT_ELEMENTS]
+        relations = [self._column(name).tolist() for name in _SNAPSHOT_RELATIONS]
+        if types is None:
+            # Whole string table in one decode and split; the absent marker maps to an extra None
+            start, length, _ = self._sections[b'STRS']
+            strings = str(self._map[start:start + length - 1], 'utf-8').split('\0') if length else []
+            none = len(strings)
+            strings.append(None)
+            string = strings.__getitem__
+            elements = zip(*([none if v == _SNAPSHOT_NONE else v for v in column.tolist()] for column in elements))
+            relations = zip(*([none if v == _SNAPSHOT_NONE else v for v in column] for column in relations))
+        else:
+            string = self.string
+            elements = [[column[row] for column in elements] for row in self.rows(types)]
+            loaded = {element[0] for element in elements}
+            relations = (r for r in zip(*relations) if r[0] in loaded and r[1] in loaded)
+        props_of = {}  # props JSON decoded once per distinct string
+
+        def props(index):
+            value = props_of.get(index)
+            if value is None:
+                text = string(index)
+                value = props_of[index] = json.loads(text) if text else {}
+            return dict(value)
+
+        model = ArchitectureModel()
+        model._load([Element(string(id), string(type), string(label), string(layer), string(state), props(p))
+                     for id, type, label, layer, state, p in elements],
+                    [Relation(string(source), string(target), string(type), string(label), props(p))
+                     for source, target, type, label, p in relations])
+        return model
+
+
+def load_snapshot(path, types=None, verify=False):
+    with Snapshot(path, verify) as snapshot:
+        return snapshot.model(types)
+
+
+# --- LeanIX import ---
+# Fact sheets from LeanIX exports: the GraphQL/JSON export (data.allFactSheets.edges[].node, or a plain list
+# of fact sheets) and the Excel/CSV exports with one row per fact sheet. Files are read one fact sheet
+# at a time - JSON arrays are decoded item by item from a sliding buffer - and repeated strings (types,
+# layers, states, ids used by relations) are interned. Relation references are kept as compact tuples
+# and resolved against ids, then names, in a single pass once every fact sheet is in.
+LEANIX_TYPES = {
+    # LeanIX fact sheet type -> (element type, layer)
+    'BusinessCapability': ('capability', 'business'),
+    'Process': ('value_chain_step', 'business'),
+    'UserGroup': ('actor', 'business'),
+    'Application': ('application', 'application'),
+    'Interface': ('interface', 'application'),
+    'DataObject': ('data_object', 'application'),
+    'ITComponent': ('infrastructure', 'technology'),
+    'Project': ('task', 'implementation'),
+}
+LEANIX_RELATIONS = {
+    # LeanIX relation field -> (relation type, label, reversed); reversed relations point target -> source
+    'relApplicationToBusinessCapability': ('serves', 'serves', True),
+    'relInterfaceToProviderApplication': ('exposes', 'exposes', True),
+    'relProviderApplicationToInterface': ('exposes', 'exposes', False),
+    'relInterfaceToConsumerApplication': ('invokes', 'invokes', False),
+    'relConsumerApplicationToInterface': ('invokes', 'invokes', True),
+    'relApplicationToITComponent': ('uses', 'uses', False),
+    'relInterfaceToITComponent': ('uses', 'uses', False),
+    'relApplicationToDataObject': ('flow', 'uses', False),
+    'relInterfaceToDataObject': ('flow', 'transfers', False),
+    'relApplicationToUserGroup': ('serves', 'uses', True),
+    'relProcessToBusinessCapability': ('realizes', 'realizes', True),
+    'relToSuccessor': ('replaces', 'replaces', True),
+    'relToChild': ('composes', 'composes', False),
+    'relToRequires': ('precedes', None, True),
+}
+# Lifecycle phases that are still ahead count as to-be; everything else (active, phaseOut, ...) as-is
+LEANIX_TO_BE_PHASES = frozenset(('plan', 'phaseIn'))
+_JSON_ITEMS_RE = re.compile(r'"(?:edges|factSheets|items)"\s*:\s*\[|^\s*\[')
+_JSON_CHUNK = 1 << 20
+
+
+class LeanIXImporter:
+    def __init__(self, model=None):
+        self.model = ArchitectureModel() if model is None else model
+        self.skipped = {}  # unmapped fact sheet types / relation fields -> count
+        self.unresolved = 0  # relation references to fact sheets that were not imported
+        self._pending = []  # (source id, target reference, relation field)
+        self._by_name = {}
+
+    def load(self, path):
+        lower = str(path).lower()
+        if lower.endswith('.json'):
+            rows = _json_fact_sheets(path)
+        elif lower.endswith(('.xlsx', '.xlsm')):
+            rows = _excel_fact_sheets(path)
+        else:
+            rows = _csv_fact_sheets(path)
+        for row in rows:
+            self.add(row)
+        return self
+
+    def add(self, sheet):
+        # One fact sheet as a dict: id, type, name (or displayName), lifecycle, and rel* fields holding
+        # a list of ids/names, a ';'-separated string, or the GraphQL {edges: [{node: {factSheet: ...}}]}
+        intern = sys.intern
+        mapped = LEANIX_TYPES.get(sheet.get('type'))
+        if mapped is None:
+            self._skip(sheet.get('type') or '?')
+            return None
+        id = intern(str(sheet.get('id') or sheet.get('name')))
+        element = self.model.elements.get(id)
+        if element is None:
+            label = sheet.get('displayName') or sheet.get('name') or id
+            props = {}
+            for key, prop in (('category', 'category'), ('interfaceType', 'kind'), ('externalId', 'external_id')):
+                value = sheet.get(key)
+                if value:
+                    props[prop] = intern(value) if isinstance(value, str) else value
+            element = self.model.add(id, mapped[0], label, mapped[1], _leanix_state(sheet.get('lifecycle')), **props)
+            self._by_name.setdefault(sheet.get('name') or label, id)
+        # the same fact sheet in two exports: the first one wins, relations from both are kept (finish()
+        # adds each once)
+        for field, value in sheet.items():
+            if field.startswith('rel') and value:
+                for ref in _leanix_refs(value):
+                    self._pending.append((id, ref, field))
+        return element
+
+    def finish(self):
+        # Single pass over the collected references: by id first, then by name. Exports list most
+        # relations from both ends (relInterfaceToProviderApplication / relProviderApplicationToInterface),
+        # so each (source, target, type) is added once.
+        elements, by_name, intern, seen = self.model.elements, self._by_name, sys.intern, set()
+        for source, ref, field in self._pending:
+            relation = LEANIX_RELATIONS.get(field.split(':', 1)[0])
+            if relation is None:
+                self._skip(field)
+                continue
+            target = ref if ref in elements else by_name.get(ref)
+            if target is None:
+                self.unresolved += 1
+                continue
+            type, label, reverse = relation
+            a, b = (target, source) if reverse else (source, target)
+            if (a, b, type) not in seen:
+                seen.add((a, b, type))
+                self.model.relate(intern(a), intern(b), type, label)
+        self._pending = []
+        return self.model
+
+    def _skip(self, key):
+        self.skipped[key] = self.skipped.get(key, 0) + 1
+
+
+def import_leanix(*paths, model=None):
+    importer = LeanIXImporter(model)
+    for path in paths:
+        importer.load(path)
+    return importer.finish()
+
+
+def _leanix_state(lifecycle):
+    if isinstance(lifecycle, dict):
+        lifecycle = lifecycle.get('asString') or lifecycle.get('phase')
+    if not lifecycle:
+        return None
+    return 'to-be' if lifecycle in LEANIX_TO_BE_PHASES else 'as-is'
+
+
+def _leanix_refs(value):
+    if isinstance(value, str):
+        return [ref.strip() for ref in value.split(';') if ref.strip()]
+    if isinstance(value, dict):
+        value = value.get('edges', ())
+    refs = []
+    for item in value:
+        if isinstance(item, dict):
+            node = item.get('node', item)
+            sheet = node.get('factSheet', node) if isinstance(node, dict) else node
+            item = sheet.get('id') or sheet.get('name') if isinstance(sheet, dict) else sheet
+        if item:
+            refs.append(str(item))
+    return refs
+
+
+def _json_fact_sheets(path):
+    # Decode the fact sheet array one element at a time, keeping only the undecoded tail in memory
+    decoder = json.JSONDecoder()
+    with open(path, encoding='utf-8') as f:
+        buffer = f.read(_JSON_CHUNK)
+        match = _JSON_ITEMS_RE.search(buffer)
+        while match is None:
+            more = f.read(_JSON_CHUNK)
+            if not more:
+                return
+            buffer = buffer[-64:] + more  # keep enough tail for a key split across reads
+            match = _JSON_ITEMS_RE.search(buffer)
+        pos, eof = match.end(), False
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == ']':
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                if eof:
+                    raise
+                more = f.read(_JSON_CHUNK)
+                eof = not more
+                buffer, pos = buffer[pos:] + more, 0
+                continue
+            yield item.get('node', item) if isinstance(item, dict) and len(item) == 1 else item
+            pos = end
+            if pos > _JSON_CHUNK:
+                buffer, pos = buffer[pos:], 0
+
+
+def _csv_fact_sheets(path):
+    import csv
+
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            yield {k: v for k, v in row.items() if k and v}
+
+
+def _excel_fact_sheets(path):
+    openpyxl = _optional_import('openpyxl')
+    if openpyxl is None:
+        raise ImportError('reading Excel exports needs openpyxl (or export the sheets as CSV)')
+    book = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in book.worksheets:
+            rows = sheet.iter_rows(values_only=True)
+            header = [str(h) if h is not None else None for h in next(rows, ())]
+            for values in rows:
+                yield {k: v for k, v in zip(header, values) if k and v not in (None, '')}
+    finally:
+        book.close()
+
+
+MODEL = example_model()
+
+
+@_view_builder('biz_arch')
+def build_biz_arch(model=None):
+    model = MODEL if model is None else model
     # Create a Digraph object
-    dot = Digraph('BusinessLayer', format='png')
+    dot = BulkDigraph('BusinessLayer', format='png')
     dot.attr(rankdir='LR', fontsize='12', labeljust='left')
     # Define styles
     ARCHIMATE_BUSINESS_CAPABILITY = {'shape': 'rectangle', 'style': 'rounded,filled', 'fillcolor': '#fdf6e3',
@@ -13,722 +2142,2283 @@ def show_biz_arch(file:bool = False):
     # Top-level header
     dot.attr(label='<<B>Value Chain Overview</B>>', labelloc='t', fontsize='14')
     # Value Chain steps
-    value_chain = [
-        ("VC1", "Customer Order Placement"),
-        ("VC2", "Inventory Check & Reservation"),
-        ("VC3", "Order Fulfillment"),
-        ("VC4", "Customer Notification"),
-    ]
+    value_chain = model.of_type('value_chain_step')
     # Business Capabilities
-    capabilities = [
-        ("CAP1", "Order Management"),
-        ("CAP2", "Inventory Reservation"),
-        ("CAP3", "Fulfillment Scheduling"),
-        ("CAP4", "Customer Communication"),
-    ]
+    capabilities = model.of_type('capability')
     # Add value chain steps
-    for node_id, label in value_chain:
-        dot.node(node_id, label, **ARCHIMATE_VALUE_CHAIN_STEP)
+    dot.nodes([e.id for e in value_chain], [e.label for e in value_chain], **ARCHIMATE_VALUE_CHAIN_STEP)
     # Add business capabilities
-    for node_id, label in capabilities:
-        dot.node(node_id, label, **ARCHIMATE_BUSINESS_CAPABILITY)
-    # Connect steps in the value chain (linear sequence)
-    for i in range(len(value_chain) - 1):
-        dot.edge(value_chain[i][0], value_chain[i + 1][0], style='dashed', label='triggers')
-    # Connect capabilities to respective value chain steps
-    dot.edge("CAP1", "VC1", label='realizes')
-    dot.edge("CAP2", "VC2", label='realizes')
-    dot.edge("CAP3", "VC3", label='realizes')
-    dot.edge("CAP4", "VC4", label='realizes')
+    dot.nodes([e.id for e in capabilities], [e.label for e in capabilities], **ARCHIMATE_BUSINESS_CAPABILITY)
+    # Steps trigger each other (dashed), capabilities realize steps
+    for rel in model.relations_among(value_chain + capabilities, ('triggers', 'realizes')):
+        if rel.type == 'triggers':
+            dot.edge(rel.source, rel.target, style='dashed', label=rel.label)
+        else:
+            dot.edge(rel.source, rel.target, label=rel.label)
     # Add Legend (invisible cluster to keep it clean)
     with dot.subgraph(name='cluster_legend') as legend:
         legend.attr(label='Legend', fontsize='11', style='dashed', color='gray70')
-        legend.node('L1', 'Business Capability', **ARCHIMATE_BUSINESS_CAPABILITY)
-        legend.node('L2', 'Value Chain Step', **ARCHIMATE_VALUE_CHAIN_STEP)
-        legend.edge('L1', 'L2', style='invis')  # Prevents overlap, forces layout
+        legend.node('L1', 'Business Capability', **ARCHIMATE_BUSINESS_CAPABILITY)
+        legend.node('L2', 'Value Chain Step', **ARCHIMATE_VALUE_CHAIN_STEP)
+        legend.edge('L1', 'L2', style='invis')  # Prevents overlap, forces layout
+
+    return dot
+
+def show_biz_arch(file:bool = False):
+    dot = build_biz_arch()
+    # Render and view the diagram
+    if file:
+        write_view(dot, f'business_layer_with_legend.{OUTPUT_FORMAT}')
+    else:
+        _show(dot)
+
+@_view_builder('app_arch')
+def build_app_arch(model=None):
+    model = MODEL if model is None else model
+    dot = BulkDigraph('ApplicationLayerWithInterfaces', format='png')
+    dot.attr(rankdir='TB', fontsize='12')
+
+    # Styles
+    CAPABILITY_STYLE = {'shape': 'rectangle', 'style': 'rounded,filled', 'fillcolor': '#fdf6e3', 'fontsize': '10'}
+    APP_STYLE = {'shape': 'component', 'style': 'filled', 'fillcolor': '#e1f5fe', 'fontsize': '10'}
+    REST_IFACE_STYLE = {'shape': 'box', 'style': 'filled', 'fillcolor': '#c8e6c9', 'fontsize': '9'}
+    PUBSUB_IFACE_STYLE = {'shape': 'ellipse', 'style': 'filled,dashed', 'fillcolor': '#f8bbd0', 'fontsize': '9'}
+    EXT_SYSTEM_STYLE = {'shape': 'cylinder', 'style': 'filled', 'fillcolor': '#f3e5f5', 'fontsize': '10'}
+
+    # Header
+    dot.attr(label='<<B>Application Layer with Explicit Interfaces</B>>', labelloc='t', fontsize='14')
+
+    # Capabilities
+    capabilities = model.of_type('capability')
+    dot.nodes([e.id for e in capabilities], [e.label for e in capabilities], **CAPABILITY_STYLE)
+
+    # Applications
+    apps = model.of_type('application', 'as-is')
+    dot.nodes([e.id for e in apps], [e.label for e in apps], **APP_STYLE)
+
+    # External systems
+    externals = model.of_type('external_system', 'as-is')
+    dot.nodes([e.id for e in externals], [e.label for e in externals], **EXT_SYSTEM_STYLE)
+
+    # Application Interfaces (explicit nodes)
+    interfaces = model.of_type('interface', 'as-is')
+    for e in interfaces:
+        kind = e.props.get('kind', 'REST')
+        style = REST_IFACE_STYLE if kind == "REST" else PUBSUB_IFACE_STYLE
+        dot.node(e.id, f"<<i>{kind}</i>>\n{e.label}", **style)
+
+    # Capability → Application, App → Interface → Target App/System
+    for rel in model.relations_among(capabilities + apps + externals + interfaces, ('serves', 'exposes', 'invokes')):
+        if rel.type == 'serves':
+            dot.edge(rel.source, rel.target, label=rel.label)
+        elif rel.type == 'exposes':
+            dot.edge(rel.source, rel.target, label=rel.label, style='solid', color='gray30')
+        else:
+            # Synchronous (REST) calls are solid, asynchronous (pub/sub) deliveries dashed
+            sync = model[rel.source].props.get('kind', 'REST') == "REST"
+            dot.edge(rel.source, rel.target, label=rel.label, style='solid' if sync else 'dashed', color='gray30')
+
+    # Legend
+    with dot.subgraph(name='cluster_legend') as legend:
+        legend.attr(label='Legend', fontsize='11', style='dashed', color='gray70')
+        legend.node('L1', 'Business Capability', **CAPABILITY_STYLE)
+        legend.node('L2', 'Application', **APP_STYLE)
+        legend.node('L3', 'REST Interface', **REST_IFACE_STYLE)
+        legend.node('L4', 'Pub/Sub Interface', **PUBSUB_IFACE_STYLE)
+        legend.node('L5', 'External System', **EXT_SYSTEM_STYLE)
+        legend.edge('L1', 'L2', style='invis')
+        legend.edge('L2', 'L3', style='invis')
+        legend.edge('L3', 'L4', style='invis')
+        legend.edge('L4', 'L5', style='invis')
+
+    return dot
+
+def show_app_arch():
+    _show(build_app_arch())
+
+@_view_builder('technology_arch')
+def build_technology_arch(model=None):
+    model = MODEL if model is None else model
+    dot = BulkDigraph('TechnologyLayer', format='png')
+    dot.attr(rankdir='TB', fontsize='12')
+    dot.attr(label='<<B>Technology Layer (As-Is)</B>>', labelloc='t', fontsize='14')
+
+    # Styles
+    APP_STYLE = {'shape': 'component', 'style': 'filled', 'fillcolor': '#e1f5fe', 'fontsize': '10'}
+    INFRA_STYLE = {'shape': 'box3d', 'style': 'filled', 'fillcolor': '#fff3e0', 'fontsize': '10'}
+    TECH_STYLE = {'shape': 'cylinder', 'style': 'filled', 'fillcolor': '#f3e5f5', 'fontsize': '10'}
+    RUNTIME_STYLE = {'shape': 'note', 'style': 'filled', 'fillcolor': '#ede7f6', 'fontsize': '9'}
+    EXT_STYLE = {'shape': 'cylinder', 'style': 'filled,dashed', 'fillcolor': '#f8bbd0'}
+
+    # Applications (same IDs to align with earlier layers)
+    apps = model.of_type('application', 'as-is')
+    externals = model.of_type('external_system', 'as-is')
+    dot.nodes([e.id for e in apps], [e.label for e in apps], **APP_STYLE)
+    dot.nodes([e.id for e in externals], [e.label for e in externals], **EXT_STYLE)
+
+    # Infra components: databases and message buses are platform components, the rest plain infra
+    infra = [e for e in model.in_layer('technology', 'as-is') if e.type in ('infrastructure', 'platform')]
+    for e in infra:
+        dot.node(e.id, e.label, **(TECH_STYLE if e.type == 'platform' else INFRA_STYLE))
+
+    # Add runtimes
+    runtimes = model.of_type('runtime', 'as-is')
+    dot.nodes([e.id for e in runtimes], [e.label for e in runtimes], **RUNTIME_STYLE)
+
+    # Relationships: Apps deployed on, using tech
+    for rel in model.relations_among(apps + externals + infra + runtimes, TECHNOLOGY_RELATIONS):
+        dot.edge(rel.source, rel.target, label=rel.label)
+
+    # Legend
+    with dot.subgraph(name='cluster_legend') as legend:
+        legend.attr(label='Legend', fontsize='11', style='dashed', color='gray70')
+        legend.node('L1', 'Application', **APP_STYLE)
+        legend.node('L2', 'Infra Component', **INFRA_STYLE)
+        legend.node('L3', 'Platform/DB/Message Bus', **TECH_STYLE)
+        legend.node('L4', 'Runtime / Framework', **RUNTIME_STYLE)
+        legend.edge('L1', 'L2', style='invis')
+        legend.edge('L2', 'L3', style='invis')
+        legend.edge('L3', 'L4', style='invis')
+
+    return dot
+
+def show_technology_arch():
+    _show(build_technology_arch())
+
+@_view_builder('data_flow')
+def build_data_flow(model=None):
+    model = MODEL if model is None else model
+    dot = BulkDigraph('DataFlowDiagram', format='png')
+    dot.attr(rankdir='LR', fontsize='12')
+    dot.attr(label='<<B>Data Flow Diagram (As-Is)</B>>', labelloc='t', fontsize='14')
+
+    # Styles
+    SYSTEM_STYLE = {'shape': 'box', 'style': 'rounded,filled', 'fillcolor': '#e3f2fd', 'fontsize': '10'}
+    ACTOR_STYLE = {'shape': 'oval', 'style': 'filled', 'fillcolor': '#fff3e0', 'fontsize': '10'}
+    EXT_STYLE = {'shape': 'box', 'style': 'rounded,filled,dashed', 'fillcolor': '#f3e5f5', 'fontsize': '10'}
+    DATA_STYLE = {'shape': 'note', 'style': 'filled', 'fillcolor': '#f1f8e9', 'fontsize': '9'}
+
+    # Nodes
+    selected = []
+    for type, style in [('actor', ACTOR_STYLE), ('application', SYSTEM_STYLE), ('external_system', EXT_STYLE),
+                        ('data_object', DATA_STYLE)]:  # Data objects (optional but great for clarity)
+        for e in model.of_type(type):
+            if e.state in (None, 'as-is'):
+                dot.node(e.id, e.label, **style)
+                selected.append(e)
+
+    # Flows
+    for rel in model.relations_among(selected, ('flow',)):
+        dot.edge(rel.source, rel.target, label=rel.label)
+
+    # Legend (simple)
+    with dot.subgraph(name='cluster_legend') as legend:
+        legend.attr(label='Legend', fontsize='11', style='dashed', color='gray70')
+        legend.node('L1', 'Actor', **ACTOR_STYLE)
+        legend.node('L2', 'System', **SYSTEM_STYLE)
+        legend.node('L3', 'External System', **EXT_STYLE)
+        legend.node('L4', 'Data Entity', **DATA_STYLE)
+        legend.edge('L1', 'L2', style='invis')
+        legend.edge('L2', 'L3', style='invis')
+        legend.edge('L3', 'L4', style='invis')
+
+    return dot
+
+def show_data_flow():
+    _show(build_data_flow())
+
+
+# --- User journeys ---
+# A journey is a list of stages, each with an emotion (index into JOURNEY_EMOTIONS), the as-is friction
+# and the to-be resolution. JourneyRenderer draws journeys on one reused figure and Agg canvas: axes,
+# grid, emotion labels and margins are set up once, and each journey only moves the line and re-texts a
+# pool of emoji and annotation artists. export_journeys() fans many journeys out to files over a process
+# pool (one renderer per worker); save_journeys_pdf() writes them as pages of one PDF.
+JOURNEY_EMOTIONS = ["😠 Angry", "😐 Neutral", "😊 Happy", "😀 Delighted"]
+JOURNEY_EMOJI = ["😠", "😐", "😊", "😀"]
+JOURNEY_FIGSIZE = (12, 6)
+JOURNEY_COLUMNS = ('persona', 'channel', 'stage', 'emotion', 'friction', 'resolution')
+JOURNEY_DATA = [
+    ("Place Order", 1, "Slow inventory check via sync REST calls to Spring service.",
+     "Parallel Lambda invocation checks stock instantly."),
+    ("Track Fulfillment", 0, "Fulfillment backend uses polling + manual batch updates.",
+     "SNS triggers real-time fulfillment updates."),
+    ("Receive Notification", 0, "Notifications via MSMQ often delayed or fail silently.",
+     "SNS with retry guarantees multi-channel delivery."),
+    ("Update Preferences", 1, "Preferences stored in Oracle; UI sluggish and unresponsive.",
+     "Low-latency APIs read/write user data in DynamoDB."),
+    ("Reorder Experience", 3, "No reordering logic or history tracking in legacy system.",
+     "SNS event log supports reordering via event replay."),
+]
+
+
+class Journey:
+    __slots__ = ('name', 'title', 'stages')
+
+    def __init__(self, name, stages, title=None):
+        self.name = name
+        self.title = title or "User Journey View – Justifying the Migration to AWS"
+        self.stages = [(stage, int(emotion), friction, resolution) for stage, emotion, friction, resolution in stages]
+
+    def __repr__(self):
+        return f'<Journey {self.name} {len(self.stages)} stages>'
+
+
+def load_journeys(path):
+    # One CSV row per stage with JOURNEY_COLUMNS; a journey per (persona, channel) in file order
+    import csv
+
+    journeys = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            key = (row['persona'], row['channel'])
+            if key not in journeys:
+                journeys[key] = []
+            journeys[key].append((row['stage'], row['emotion'], row['friction'], row['resolution']))
+    return [Journey(re.sub(r'\W+', '_', f'{persona}_{channel}').strip('_'), stages,
+                    f'User Journey – {persona} ({channel})')
+            for (persona, channel), stages in journeys.items()]
+
+
+class JourneyRenderer:
+    def __init__(self, fig=None, figsize=JOURNEY_FIGSIZE):
+        if fig is None:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+
+            fig = Figure(figsize=figsize)
+            FigureCanvasAgg(fig)
+        self.fig = fig
+        self.ax = ax = fig.subplots()
+        self.line, = ax.plot([], [], marker='o', linestyle='-', color='steelblue', linewidth=2)
+        ax.set_yticks(range(len(JOURNEY_EMOTIONS)))
+        ax.set_yticklabels(JOURNEY_EMOTIONS)
+        ax.set_ylim(-1.2, len(JOURNEY_EMOTIONS) - 0.4)
+        ax.set_xlabel("User Activity")
+        ax.set_ylabel("User Emotion")
+        ax.grid(True, axis='y', linestyle='--', alpha=0.5)
+        self.markers, self.notes = [], []
+        self._laid_out = False
+
+    def draw(self, journey):
+        ax, n = self.ax, len(journey.stages)
+        self.line.set_data(range(n), [emotion for _, emotion, _, _ in journey.stages])
+        ax.set_xticks(range(n))
+        ax.set_xticklabels([stage for stage, _, _, _ in journey.stages])
+        ax.set_xlim(-0.5, n - 0.5)
+        ax.set_title(journey.title)
+        while len(self.markers) < n:
+            self.markers.append(ax.text(0, 0, '', fontsize=16, ha='center'))
+            self.notes.append(ax.annotate('', xy=(0, 0), xytext=(0, 0), textcoords='data',
+                                          arrowprops=dict(arrowstyle="->", color='gray'),
+                                          fontsize=8, ha='center', wrap=True))
+        for i, (marker, note) in enumerate(zip(self.markers, self.notes)):
+            marker.set_visible(i < n)
+            note.set_visible(i < n)
+            if i < n:
+                _, emotion, friction, resolution = journey.stages[i]
+                marker.set_position((i, emotion + 0.1))
+                marker.set_text(JOURNEY_EMOJI[emotion])
+                note.xy = (i, emotion)
+                note.set_position((i, emotion - 0.8))
+                note.set_text(f"Friction: {friction}\nTo-Be: {resolution}")
+        if not self._laid_out:
+            # Margins fit the first journey and are kept: re-running the layout engine per journey
+            # would cost more than the draw itself
+            with _quiet_glyphs():
+                self.fig.tight_layout()
+            self.fig.set_layout_engine('none')  # tight_layout leaves one behind that re-draws on every save
+            self._laid_out = True
+        return self.fig
+
+    def save(self, journey, file, format=None, dpi=None):
+        self.draw(journey)
+        with _quiet_glyphs():
+            self.fig.savefig(file, format=format, dpi=dpi or 'figure')
+
+
+@contextmanager
+def _quiet_glyphs():
+    # The default fonts lack the emoji glyphs; matplotlib warns on every draw that misses one
+    import warnings
+
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning, module="matplotlib")
+        yield
+
+
+def plot_user_journey(journey=None):
+    import matplotlib.pyplot as plt
+
+    renderer = JourneyRenderer(plt.figure(figsize=JOURNEY_FIGSIZE))
+    return renderer.draw(journey or Journey('user_journey', JOURNEY_DATA))
+
+
+def show_user_journey(journey=None):
+    display_figure(plot_user_journey(journey))
+
+
+def save_journeys_pdf(journeys, path, dpi=None):
+    # One page per journey, all drawn on the same figure
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    renderer = JourneyRenderer()
+    with PdfPages(path) as pdf, _quiet_glyphs():
+        for journey in journeys:
+            renderer.draw(journey)
+            pdf.savefig(renderer.fig, dpi=dpi or 'figure')
+    return path
+
+
+def export_journeys(journeys, formats=None, out_dir='.', jobs=None, dpi=None):
+    # Save every journey to out_dir/<name>.<format>. Journeys are split into chunks over a process
+    # pool; each worker builds its renderer once and reuses it for every journey it gets.
+    from concurrent.futures import ProcessPoolExecutor
+
+    journeys = list(journeys)
+    formats = [OUTPUT_FORMAT] if formats is None else [formats] if isinstance(formats, str) else list(formats)
+    os.makedirs(out_dir, exist_ok=True)
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(journeys)))
+    if workers == 1:
+        _init_journey_worker()
+        return _export_journey_chunk(journeys, formats, out_dir, dpi)
+    size = -(-len(journeys) // (workers * 4))  # a few chunks per worker to even out the load
+    chunks = [journeys[i:i + size] for i in range(0, len(journeys), size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_journey_worker) as pool:
+        job = functools.partial(_export_journey_chunk, formats=formats, out_dir=out_dir, dpi=dpi)
+        return [result for results in pool.map(job, chunks) for result in results]
+
+
+_journey_renderer = None  # per process, see export_journeys()
+
+
+def _init_journey_worker():
+    global _journey_renderer
+    if _journey_renderer is None:
+        _journey_renderer = JourneyRenderer()
+
+
+def _export_journey_chunk(journeys, formats, out_dir, dpi):
+    results = []
+    for journey in journeys:
+        for fmt in formats:
+            result = RenderResult(journey.name, fmt, path=_output_path(out_dir, journey.name, fmt))
+            start = time.perf_counter()
+            try:
+                _journey_renderer.save(journey, result.path, fmt, dpi)
+            except Exception as exc:
+                result.error = exc
+            result.render_seconds = time.perf_counter() - start
+            results.append(result)
+    return results
+
+
+@_view_builder('tobe_app_arch')
+def build_tobe_app_arch(model=None):
+    model = MODEL if model is None else model
+    dot = BulkDigraph('ToBeApplicationView', format='png')
+    dot.attr(rankdir='TB', fontsize='12', size='8.27,11.69!', ratio='fill')  # A4 Portrait
+    dot.attr(label='<<B>To-Be Application View (AWS SAM + Lambda)</B>>', labelloc='t', fontsize='14')
+
+    # --- Styles ---
+    CAP_STYLE = {'shape': 'rectangle', 'style': 'rounded,filled', 'fillcolor': '#fdf6e3', 'fontsize': '10'}
+    APP_STYLE = {'shape': 'component', 'style': 'filled', 'fillcolor': '#e1f5fe', 'fontsize': '10'}
+    LAMBDA_STYLE = {'shape': 'box', 'style': 'filled', 'fillcolor': '#dcedc8', 'fontsize': '9'}
+    REST_IFACE_STYLE = {'shape': 'note', 'style': 'filled', 'fillcolor': '#c8e6c9', 'fontsize': '9'}
+    SNS_IFACE_STYLE = {'shape': 'ellipse', 'style': 'filled,dashed', 'fillcolor': '#f8bbd0', 'fontsize': '9'}
+
+    # --- Business Capabilities ---
+    capabilities = model.of_type('capability')
+    dot.nodes([e.id for e in capabilities], [e.label for e in capabilities], **CAP_STYLE)
+
+    # --- Applications (SAM apps) ---
+    sam_apps = model.of_type('application', 'to-be')
+    dot.nodes([e.id for e in sam_apps], [e.label for e in sam_apps], **APP_STYLE)
+
+    # --- Lambda Functions ---
+    lambdas = model.of_type('function', 'to-be')
+    dot.nodes([e.id for e in lambdas], [e.label for e in lambdas], **LAMBDA_STYLE)
+
+    # --- Interfaces ---
+    interfaces = model.of_type('interface', 'to-be')
+    for e in interfaces:
+        dot.node(e.id, e.label, **(REST_IFACE_STYLE if e.props.get('kind') == "REST" else SNS_IFACE_STYLE))
+
+    # --- Capability → App, App → Functions, Interface → Functions ---
+    for rel in model.relations_among(capabilities + sam_apps + lambdas + interfaces,
+                                     ('serves', 'composes', 'invokes', 'triggers')):
+        dot.edge(rel.source, rel.target, label=rel.label)
+
+    # --- Legend ---
+    with dot.subgraph(name='cluster_legend') as legend:
+        legend.attr(label='Legend', fontsize='11', style='dashed', color='gray70')
+        legend.node('L_APP', 'Application (SAM)', **APP_STYLE)
+        legend.node('L_LAM', 'Lambda Function', **LAMBDA_STYLE)
+        legend.node('L_REST', 'REST Interface', **REST_IFACE_STYLE)
+        legend.node('L_SNS', 'SNS Topic', **SNS_IFACE_STYLE)
+        legend.node('L_CAP', 'Business Capability', **CAP_STYLE)
+        legend.edge('L_CAP', 'L_APP', style='invis')
+        legend.edge('L_APP', 'L_LAM', style='invis')
+        legend.edge('L_LAM', 'L_REST', style='invis')
+        legend.edge('L_REST', 'L_SNS', style='invis')
+
+    return dot
+
+def show_tobe_app_arch():
+    _show(build_tobe_app_arch())
+
+@_view_builder('tobe_tech_arch')
+def build_tobe_tech_arch(model=None):
+    model = MODEL if model is None else model
+    dot = BulkDigraph('ToBeTechnologyLayerIcons', format='png')
+    dot.attr(rankdir='TB', fontsize='12', size='8.27,11.69!', ratio='fill')
+    dot.attr(label='<<B>To-Be Technology Layer (AWS Cloud – Icon View)</B>>', labelloc='t', fontsize='14')
+
+    # --- Style Constants ---
+    APP_STYLE = {'shape': 'component', 'style': 'filled', 'fillcolor': '#e1f5fe', 'fontsize': '10'}
+    RUNTIME_STYLE = {'shape': 'note', 'style': 'filled', 'fillcolor': '#ede7f6', 'fontsize': '9'}
+
+    # --- Applications ---
+    apps = model.of_type('application', 'to-be')
+    dot.nodes([e.id for e in apps], [e.label for e in apps], **APP_STYLE)
+
+    # --- Runtimes ---
+    runtimes = model.of_type('runtime', 'to-be')
+    dot.nodes([e.id for e in runtimes], [e.label for e in runtimes], **RUNTIME_STYLE)
+
+    # --- AWS Icon Nodes (image + label): only the services the apps actually use ---
+    aws_services = [e for e in model.of_type('cloud_service', 'to-be') if model.incoming(e.id, 'uses')]
+    for e in aws_services:
+        dot.node(e.id, label='', image=prepared_icon(e.props['icon'], inches=0.8), shape='none', labelloc='b',
+                 xlabel=e.label)
+
+    # --- App ↔ AWS Tech edges ---
+    for rel in model.relations_among(apps + runtimes + aws_services, ('uses',)):
+        dot.edge(rel.source, rel.target)
+
+    # --- Optional: AWS Cloud boundary grouping ---
+    with dot.subgraph(name='cluster_aws_cloud') as aws:
+        aws.attr(label='AWS Cloud', style='dashed', color='gray70')
+        for e in aws_services:
+            aws.node(e.id)
+
+    # --- Legend (only if needed) ---
+    # dot.node("L1", "App", **APP_STYLE)
+    # dot.node("L2", "Runtime", **RUNTIME_STYLE)
+
+    return dot
+
+def show_tobe_tech_arch():
+    _show(build_tobe_tech_arch())
+
+@_view_builder('sidebyside_view')
+def build_sidebyside_view(model=None, changes=False):
+    # changes=True also shows what the to-be landscape adds (green) and retires without a replacement
+    # (red, dashed), from diff_states()
+    model = MODEL if model is None else model
+    dot = BulkDigraph('ComparisonView', format='png')
+    dot.attr(rankdir='LR', fontsize='11', size='8.27,11.69!', ratio='compress')
+    dot.attr(label="As-Is -> To-Be Application & Technology Comparison View", labelloc='t', fontsize='14')
+
+    # --- Styles ---
+    STYLES = {
+        ('application', 'as-is'): {'shape': 'component', 'style': 'filled', 'fillcolor': '#ffe0b2', 'fontsize': '10'},
+        ('application', 'to-be'): {'shape': 'component', 'style': 'filled', 'fillcolor': '#c8e6c9', 'fontsize': '10'},
+        ('technology', 'as-is'): {'shape': 'box3d', 'style': 'filled', 'fillcolor': '#ffe0e0', 'fontsize': '10'},
+        ('technology', 'to-be'): {'shape': 'cylinder', 'style': 'filled', 'fillcolor': '#dcedc8', 'fontsize': '10'},
+    }
+
+    ADDED_STYLE = {'color': '#2e7d32', 'penwidth': '2'}
+    RETIRED_STYLE = {'color': '#c62828', 'style': 'filled,dashed'}
+
+    # --- Everything that takes part in a TO-BE replaces AS-IS mapping, apps before tech ---
+    diff = diff_states(model)
+    asis = _unique(diff.old[old] for old, _ in diff.replaced)
+    tobe = _unique(diff.new[new] for _, new in diff.replaced)
+    retired = added = []
+    if changes:
+        mapped = {e.id for e in asis + tobe}
+        retired = [e for e in diff.removed if e.layer in ('application', 'technology') and e.id not in mapped]
+        added = [e for e in diff.added if e.layer in ('application', 'technology') and e.id not in mapped]
+    for layer in ('application', 'technology'):
+        for e in asis + tobe:
+            if e.layer == layer:
+                dot.node(e.id, e.label, **STYLES[layer, e.state])
+        for e, style in [(e, RETIRED_STYLE) for e in retired] + [(e, ADDED_STYLE) for e in added]:
+            if e.layer == layer:
+                dot.node(e.id, e.label, **{**STYLES[layer, e.state], **style})
+
+    # --- Mappings (TO-BE replaces AS-IS) ---
+    for old, new in diff.replaced:
+        dot.edge(new, old, label='replaces')
+
+    # --- Optional: Grouping by clusters ---
+    with dot.subgraph(name='cluster_asis') as c1:
+        c1.attr(label='As-Is Layer', style='dashed', color='gray70')
+        for e in asis + retired:
+            c1.node(e.id)
+
+    with dot.subgraph(name='cluster_tobe') as c2:
+        c2.attr(label='To-Be Layer', style='dashed', color='gray70')
+        for e in tobe + added:
+            c2.node(e.id)
+
+    return dot
+
+def show_sidebyside_view(changes=False):
+    _show(build_sidebyside_view(changes=changes))
+
+@_view_builder('roadmap')
+def build_roadmap(model=None, critical_path=True):
+    model = MODEL if model is None else model
+    dot = BulkDigraph('Roadmap', format='png')
+    dot.attr(rankdir='LR', fontsize='12', size='8.27,11.69!', ratio='compress')
+    dot.attr(label='<<B>Roadmap</B>>', labelloc='t', fontsize='14')
+
+    # Styles
+    TASK_STYLE = {'shape': 'box', 'style': 'filled', 'fillcolor': '#e1f5fe', 'fontsize': '10'}
+    MILESTONE_STYLE = {'shape': 'diamond', 'style': 'filled', 'fillcolor': '#ffe0b2', 'fontsize': '10'}
+    CRITICAL_STYLE = {'color': '#c62828', 'penwidth': '2'}
+
+    # Tasks
+    tasks = model.of_type('task')
+    dot.nodes([e.id for e in tasks], [e.label for e in tasks], **TASK_STYLE)
+
+    # Milestones
+    milestones = model.of_type('milestone')
+    dot.nodes([e.id for e in milestones], [e.label for e in milestones], **MILESTONE_STYLE)
+
+    # Task Dependencies, critical path in red
+    critical = schedule(model).critical_edges() if critical_path else ()
+    for rel in model.relations_among(tasks + milestones, ('precedes',)):
+        if (rel.source, rel.target) in critical:
+            dot.edge(rel.source, rel.target, **CRITICAL_STYLE)
+        else:
+            dot.edge(rel.source, rel.target)
+
+    return dot
+
+def show_roadmap():
+    # Render to roadmap_diagram.<OUTPUT_FORMAT>
+    write_view(build_roadmap(), f'roadmap_diagram.{OUTPUT_FORMAT}')
+
+# Extended roadmap: applications + technologies (Component, Phase, Start, End, Type)
+ROADMAP_DATA = [
+    # Applications
+    ("OrderPortalApp", "Deployed", "2025-05-01", "2025-05-31", "As-Is"),
+    ("OrderPortalApp", "Phased Out", "2025-06-01", "2025-06-15", "As-Is"),
+    ("OrderProcessorApp", "Development", "2025-05-01", "2025-05-31", "To-Be"),
+    ("OrderProcessorApp", "Parallel Run", "2025-06-01", "2025-06-30", "To-Be"),
+    ("OrderProcessorApp", "Go Live", "2025-07-01", "2025-10-01", "To-Be"),
+
+    ("InventoryManagerApp", "Deployed", "2025-05-01", "2025-05-31", "As-Is"),
+    ("InventoryManagerApp", "Phased Out", "2025-06-01", "2025-06-15", "As-Is"),
+    ("InventoryServiceApp", "Development", "2025-05-01", "2025-05-31", "To-Be"),
+    ("InventoryServiceApp", "Parallel Run", "2025-06-01", "2025-06-30", "To-Be"),
+    ("InventoryServiceApp", "Go Live", "2025-07-01", "2025-10-01", "To-Be"),
+
+    ("UserStoreApp", "Deployed", "2025-05-01", "2025-05-31", "As-Is"),
+    ("UserStoreApp", "Phased Out", "2025-06-01", "2025-06-15", "As-Is"),
+    ("UserProfileApp", "Development", "2025-05-01", "2025-05-31", "To-Be"),
+    ("UserProfileApp", "Parallel Run", "2025-06-01", "2025-06-30", "To-Be"),
+    ("UserProfileApp", "Go Live", "2025-07-01", "2025-10-01", "To-Be"),
+
+    ("Notification System", "Deployed", "2025-05-01", "2025-05-31", "As-Is"),
+    ("Notification System", "Phased Out", "2025-06-01", "2025-06-15", "As-Is"),
+    ("NotificationService", "Development", "2025-05-01", "2025-05-31", "To-Be"),
+    ("NotificationService", "Parallel Run", "2025-06-01", "2025-06-30", "To-Be"),
+    ("NotificationService", "Go Live", "2025-07-01", "2025-10-01", "To-Be"),
+
+    # Technologies
+    ("WebLogic", "Active", "2025-05-01", "2025-06-15", "As-Is"),
+    ("AWS Lambda", "Rollout", "2025-05-15", "2025-07-15", "To-Be"),
+
+    ("Oracle RDBMS", "Active", "2025-05-01", "2025-06-15", "As-Is"),
+    ("DynamoDB", "Rollout", "2025-05-15", "2025-07-15", "To-Be"),
+
+    ("MSMQ", "Active", "2025-05-01", "2025-06-15", "As-Is"),
+    ("SNS", "Rollout", "2025-05-15", "2025-07-15", "To-Be"),
+
+    ("File Share", "Active", "2025-05-01", "2025-06-15", "As-Is"),
+    ("Amazon S3", "Rollout", "2025-05-15", "2025-07-15", "To-Be"),
+]
+
+ROADMAP_COLORS = {
+    "As-Is": "#FFAB91",  # soft red
+    "To-Be": "#A5D6A7"  # soft green
+}
+GANTT_MAX_LABELS = 150  # phase labels drawn at most; the longest bars win
+GANTT_MAX_TICKS = 60  # component tick labels drawn at most
+
+
+ROADMAP_COLUMNS = ["Component", "Phase", "Start", "End", "Type"]
+ROADMAP_CHUNK_ROWS = 100_000
+_roadmap_frames = {}  # abspath -> (mtime_ns, size, frame)
+
+
+def roadmap_frame(rows=None):
+    import pandas as pd
+
+    return _typed_roadmap(pd.DataFrame(ROADMAP_DATA if rows is None else rows, columns=ROADMAP_COLUMNS))
+
+
+def _typed_roadmap(df, first_row=0):
+    # Categorical labels, datetime64 dates, and Start <= End checked on the way in
+    df = df[ROADMAP_COLUMNS]
+    df = df.assign(**{c: df[c].astype("category") for c in ("Component", "Phase", "Type")},
+                   **{c: _roadmap_dates(df[c]) for c in ("Start", "End")})
+    bad = (df["Start"].isna() | df["End"].isna() | (df["End"] < df["Start"])).to_numpy()
+    if bad.any():
+        rows = [first_row + int(i) for i in bad.nonzero()[0][:5]]
+        raise ValueError(f'roadmap rows {rows} have a missing date or End before Start')
+    return df.reset_index(drop=True) if first_row == 0 else df
+
+
+def _roadmap_dates(column):
+    import pandas as pd
+
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column.astype("datetime64[ns]")
+    try:  # exports are ISO dates; the fixed format is several times faster than inference
+        return pd.to_datetime(column, format="%Y-%m-%d").astype("datetime64[ns]")
+    except (ValueError, TypeError):
+        return pd.to_datetime(column, errors="coerce").astype("datetime64[ns]")
+
+
+def load_roadmap(path, chunk_rows=ROADMAP_CHUNK_ROWS):
+    # Roadmap rows from a .csv or .parquet file, read in chunks and typed per chunk. Parsed frames are
+    # kept per file and reused until its mtime or size changes.
+    import pandas as pd
+    from pandas.api.types import union_categoricals
+
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    cached = _roadmap_frames.get(path)
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+
+    chunks, offset = [], 0
+    for chunk in _roadmap_chunks(path, chunk_rows):
+        chunks.append(_typed_roadmap(chunk, first_row=offset))
+        offset += len(chunk)
+    if not chunks:
+        df = roadmap_frame([])
+    else:
+        # Chunks carry their own categories; union them instead of letting concat fall back to objects
+        columns = {c: union_categoricals([ch[c] for ch in chunks]) if c in ("Component", "Phase", "Type")
+                   else pd.concat([ch[c] for ch in chunks], ignore_index=True) for c in ROADMAP_COLUMNS}
+        df = pd.DataFrame(columns)
+    _roadmap_frames[path] = (st.st_mtime_ns, st.st_size, df)
+    return df
+
+
+def _roadmap_chunks(path, chunk_rows):
+    import pandas as pd
+
+    if path.lower().endswith(('.parquet', '.pq')):
+        pq = _optional_import('pyarrow.parquet')
+        if pq is None:
+            raise ImportError('reading Parquet roadmaps needs pyarrow')
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=ROADMAP_COLUMNS):
+            yield batch.to_pandas()
+    else:
+        dtype = {c: "category" for c in ("Component", "Phase", "Type")}
+        yield from pd.read_csv(path, usecols=ROADMAP_COLUMNS, dtype=dtype, chunksize=chunk_rows)
+
+
+def plot_gantt(df, ax=None, window=None, colors=None, title=None, max_labels=GANTT_MAX_LABELS,
+               max_ticks=GANTT_MAX_TICKS):
+    # Bars are batched into one compound path per Type, so the artist count stays flat however many rows.
+    # window=(start, end) keeps only the phases overlapping it and clips them to it.
+    import matplotlib.dates as mdates
+    import matplotlib.pyplot as plt
+    import numpy as np
+    import pandas as pd
+    from matplotlib.collections import PathCollection
+    from matplotlib.patches import Patch
+    from matplotlib.path import Path
+
+    colors = colors or ROADMAP_COLORS
+    start, end = df["Start"].to_numpy("datetime64[ns]"), df["End"].to_numpy("datetime64[ns]")
+    if window is not None:
+        lo, hi = (np.datetime64(pd.Timestamp(w), "ns") for w in window)
+        keep = (end >= lo) & (start <= hi)
+        df, start, end = df[keep], np.maximum(start[keep], lo), np.minimum(end[keep], hi)
+
+    # Row per component in sorted order (as groupby would), bars 0.8 high like barh
+    rows, components = pd.factorize(df["Component"], sort=True)
+    x0, x1 = mdates.date2num(start), mdates.date2num(end)
+    y0, y1 = rows - 0.4, rows + 0.4
+    verts = np.stack([np.column_stack(c) for c in ((x0, y0), (x0, y1), (x1, y1), (x1, y0))], axis=1)
+    types = df["Type"].astype(str).to_numpy()
+
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(14, 10))
+    fig = ax.figure
+    # One compound path per Type: a single draw call no matter how many bars share a colour
+    for kind in np.unique(types):
+        path = Path.make_compound_path_from_polys(verts[types == kind])
+        ax.add_collection(PathCollection([path], facecolors=colors.get(kind, "#CFD8DC"), edgecolors="black",
+                                         linewidths=0.5), autolim=False)
+
+    # Label by density: when rows are packed tighter than the font, bucket them into font-high slots and
+    # label only the longest bar of each slot; never more than max_labels
+    labelled = np.arange(len(rows))
+    height_pt = ax.get_position().height * fig.get_figheight() * 72
+    per_slot = max(1, -(-len(components) * 10 // max(1, int(height_pt))))
+    if per_slot > 1:
+        slot = rows // per_slot
+        order = np.lexsort((x0 - x1, slot))
+        labelled = order[np.r_[True, slot[order][1:] != slot[order][:-1]]]
+    if len(labelled) > max_labels:
+        labelled = labelled[np.argpartition((x0 - x1)[labelled], max_labels)[:max_labels]]
+    phases = df["Phase"].astype(str).to_numpy()
+    for i in labelled:
+        ax.text(x0[i] + 1, rows[i], phases[i], va='center', ha='left', fontsize=8, clip_on=True)
+
+    # Customize axes
+    step = max(1, -(-len(components) // max_ticks))
+    ticks = np.arange(0, len(components), step)
+    ax.set_yticks(ticks)
+    ax.set_yticklabels(components[ticks])
+    ax.set_ylim(len(components) - 0.5, -0.5)
+    if len(x0):
+        ax.set_xlim(x0.min() - 1, x1.max() + 1)
+    ax.xaxis_date()
+    ax.set_xlabel("Timeline")
+    ax.set_title(title or "Full Transition Roadmap (Applications + Technologies)")
+    ax.grid(True, axis='x', linestyle='--', alpha=0.7)
+
+    # Legend
+    legend_handles = [Patch(color=color, label=label) for label, color in colors.items()]
+    ax.legend(handles=legend_handles, loc='upper right')
+
+    fig.tight_layout()
+    return fig
+
+
+def show_roadmap_plot(df=None, window=None):
+    # df: a roadmap frame, a .csv/.parquet path for load_roadmap(), or None for the built-in ROADMAP_DATA
+    if df is None:
+        df = roadmap_frame()
+    elif isinstance(df, (str, os.PathLike)):
+        df = load_roadmap(df)
+    display_figure(plot_gantt(df, window=window))
+
+
+# --- Roadmap schedule ---
+# Critical-path method over the 'precedes' DAG of tasks and milestones, O(V+E): one Kahn pass for the
+# topological order and earliest starts, one reverse pass for latest starts. Durations come from the
+# element's `duration` prop (days; tasks default to 1, milestones to 0).
+SCHEDULE_TYPES = ('task', 'milestone')
+SCHEDULE_RELATION = 'precedes'
+
+
+class ScheduleCycleError(ValueError):
+    def __init__(self, cycle):
+        super().__init__(f'roadmap dependencies form a cycle: {" -> ".join(cycle)}')
+        self.cycle = cycle
+
+
+class Schedule:
+    __slots__ = ('order', 'duration', 'earliest_start', 'latest_start', 'successors', 'length')
+
+    def __init__(self, order, duration, earliest_start, latest_start, successors):
+        self.order = order  # ids in topological order
+        self.duration = duration
+        self.earliest_start = earliest_start
+        self.latest_start = latest_start
+        self.successors = successors
+        self.length = max((earliest_start[id] + duration[id] for id in order), default=0)
+
+    def earliest_finish(self, id):
+        return self.earliest_start[id] + self.duration[id]
+
+    def latest_finish(self, id):
+        return self.latest_start[id] + self.duration[id]
+
+    def slack(self, id):
+        return self.latest_start[id] - self.earliest_start[id]
+
+    def is_critical(self, id):
+        return self.slack(id) == 0
+
+    def critical_edges(self):
+        return {(a, b) for a in self.order if self.is_critical(a) for b in self.successors[a]
+                if self.is_critical(b) and self.earliest_finish(a) == self.earliest_start[b]}
+
+    def critical_path(self):
+        # One longest chain: from a critical start, keep stepping to a critical successor that starts on finish
+        path = [next((id for id in self.order if self.is_critical(id) and self.earliest_start[id] == 0), None)]
+        if path[0] is None:
+            return []
+        while True:
+            id = path[-1]
+            step = next((b for b in self.successors[id] if self.is_critical(b)
+                         and self.earliest_start[b] == self.earliest_finish(id)), None)
+            if step is None:
+                return path
+            path.append(step)
+
+    def __repr__(self):
+        return f'<Schedule {len(self.order)} items, {self.length} days>'
+
+
+def schedule(model=None, types=SCHEDULE_TYPES, relation=SCHEDULE_RELATION):
+    model = MODEL if model is None else model
+    duration = {}
+    for type in types:
+        for e in model.of_type(type):
+            duration[e.id] = e.props.get('duration', 0 if type == 'milestone' else 1)
+    successors = {id: [] for id in duration}
+    indegree = dict.fromkeys(duration, 0)
+    for rel in model.relations_of_type(relation):
+        if rel.source in duration and rel.target in duration:
+            successors[rel.source].append(rel.target)
+            indegree[rel.target] += 1
+
+    # Forward pass (Kahn): earliest start = latest earliest-finish of the predecessors
+    earliest = dict.fromkeys(duration, 0)
+    order = [id for id, n in indegree.items() if n == 0]
+    for id in order:  # order grows while we walk it
+        finish = earliest[id] + duration[id]
+        for b in successors[id]:
+            if finish > earliest[b]:
+                earliest[b] = finish
+            indegree[b] -= 1
+            if indegree[b] == 0:
+                order.append(b)
+    if len(order) < len(duration):
+        raise ScheduleCycleError(_find_cycle(successors, indegree))
+
+    # Backward pass: latest start = earliest latest-start of the successors minus own duration
+    end = max((earliest[id] + duration[id] for id in order), default=0)
+    latest = {}
+    for id in reversed(order):
+        finish = min((latest[b] for b in successors[id]), default=end)
+        latest[id] = finish - duration[id]
+    return Schedule(order, duration, earliest, latest, successors)
+
+
+def _find_cycle(successors, indegree):
+    # Every node Kahn left behind still has a left-behind predecessor, so walking predecessors from any
+    # of them must revisit a node; the walk from that node back to itself is a cycle.
+    remaining = {id for id, n in indegree.items() if n > 0}
+    predecessor = {}
+    for a in remaining:
+        for b in successors[a]:
+            if b in remaining:
+                predecessor.setdefault(b, a)
+    seen, id = {}, next(iter(remaining))
+    while id not in seen:
+        seen[id] = len(seen)
+        id = predecessor[id]
+    walk = sorted(seen, key=seen.get)[seen[id]:]
+    return list(reversed(walk)) + [walk[-1]]
+
+
+# --- Impact analysis ---
+# "What breaks if INF3 goes down?" is reverse reachability over dependency edges. IMPACT_RELATIONS says
+# which relation types are dependencies and which way they point: 1 = the source depends on the target
+# (capability serves-> app, app uses-> DB), -1 = the target depends on the source (realizes, triggers,
+# flow). The dependency graph is condensed into strongly connected components; the impact set of a
+# component is a bitset over elements (a Python int), computed on first use from its dependents' sets and
+# memoised, so a repeated query is an OR of a few ints plus O(answer) to list the ids. Model edits are
+# applied incrementally: only the memoised sets downstream of a changed edge are dropped, and the SCCs
+# are rebuilt only when an edit can merge or split one.
+IMPACT_RELATIONS = {
+    'serves': 1, 'exposes': 1, 'invokes': 1, 'composes': 1, 'uses': 1,
+    'deployed_on': 1, 'hosted_on': 1, 'runs_on': 1, 'auth_via': 1, 'writes_to': 1,
+    'realizes': -1, 'triggers': -1, 'flow': -1, 'delivers_to': -1,
+}
+
+
+class ImpactIndex:
+    def __init__(self, model=None, relations=None):
+        self.model = MODEL if model is None else model
+        self.relations = IMPACT_RELATIONS if relations is None else relations
+        self._touched = set()
+        self._stale = True
+        self.model.subscribe(self._on_change)
+
+    def close(self):
+        self.model.unsubscribe(self._on_change)
 
-    # Render and view the diagram
-    if file:
-        dot.render('business_layer_with_legend', view=True)
-    else:
-        png_bytes = dot.pipe(format='png')
-        display(Image(png_bytes))
+    def _on_change(self, tokens):
+        for kind, value in tokens:
+            if kind in ('out', 'in', 'element'):
+                self._touched.add(value)
 
-def show_app_arch():
-    from graphviz import Digraph
+    # --- Queries ---
 
-    dot = Digraph('ApplicationLayerWithInterfaces', format='png')
-    dot.attr(rankdir='TB', fontsize='12')
+    def impacted(self, *ids, types=None, include_self=False):
+        # Ids of every element that directly or transitively depends on one of ids, in model order
+        mask = self._impact_mask(ids, types, include_self)
+        return self._ids_of(mask)
 
-    # Styles
-    CAPABILITY_STYLE = {'shape': 'rectangle', 'style': 'rounded,filled', 'fillcolor': '#fdf6e3', 'fontsize': '10'}
-    APP_STYLE = {'shape': 'component', 'style': 'filled', 'fillcolor': '#e1f5fe', 'fontsize': '10'}
-    REST_IFACE_STYLE = {'shape': 'box', 'style': 'filled', 'fillcolor': '#c8e6c9', 'fontsize': '9'}
-    PUBSUB_IFACE_STYLE = {'shape': 'ellipse', 'style': 'filled,dashed', 'fillcolor': '#f8bbd0', 'fontsize': '9'}
-    EXT_SYSTEM_STYLE = {'shape': 'cylinder', 'style': 'filled', 'fillcolor': '#f3e5f5', 'fontsize': '10'}
+    def count(self, *ids, types=None, include_self=False):
+        return self._impact_mask(ids, types, include_self).bit_count()
 
-    # Header
-    dot.attr(label='<<B>Application Layer with Explicit Interfaces</B>>', labelloc='t', fontsize='14')
+    def depends_on(self, id, other):
+        # True when id (transitively) depends on other, i.e. other going down impacts id
+        self._sync()
+        return bool(self._impact(self._comp[self._index[other]]) >> self._index[id] & 1)
 
-    # Capabilities
-    capabilities = [
-        ("CAP1", "Order Management"),
-        ("CAP2", "Inventory Reservation"),
-        ("CAP3", "Fulfillment Scheduling"),
-        ("CAP4", "Customer Communication"),
-    ]
-    for node_id, label in capabilities:
-        dot.node(node_id, label, **CAPABILITY_STYLE)
+    def _impact_mask(self, ids, types, include_self):
+        self._sync()
+        mask = own = 0
+        for id in ids:
+            node = self._index[id]
+            mask |= self._impact(self._comp[node])
+            own |= 1 << node
+        if not include_self:
+            mask &= ~own
+        if types is not None:
+            types = [types] if isinstance(types, str) else types
+            mask &= functools.reduce(int.__or__, (self._type_mask(t) for t in types), 0)
+        return mask
 
-    # Applications
-    apps = [
-        ("APP1", "OrderPortalApp"),
-        ("APP2", "InventoryManagerApp"),
-        ("APP3", "UserStoreApp"),
-    ]
-    for node_id, label in apps:
-        dot.node(node_id, label, **APP_STYLE)
+    def _ids_of(self, mask):
+        ids = self._ids
+        return [ids[i] for i in _set_bits(mask)]
 
-    # External system
-    dot.node("EXT1", "Notification System", **EXT_SYSTEM_STYLE)
+    def _type_mask(self, type):
+        mask = self._type_masks.get(type)
+        if mask is None:
+            mask = 0
+            for e in self.model.of_type(type):
+                mask |= 1 << self._index[e.id]
+            self._type_masks[type] = mask
+        return mask
 
-    # Application Interfaces (explicit nodes)
-    interfaces = [
-        ("IF1", "Order API", "REST", "APP1", "APP2"),
-        ("IF2", "User Pref API", "REST", "APP2", "APP3"),
-        ("IF3", "Notification Topic", "PubSub", "APP2", "EXT1"),
-    ]
-
-    for iface_id, label, iface_type, _, _ in interfaces:
-        style = REST_IFACE_STYLE if iface_type == "REST" else PUBSUB_IFACE_STYLE
-        dot.node(iface_id, f"<<i>{iface_type}</i>>\n{label}", **style)
-
-    # Capability → Application
-    dot.edge("CAP1", "APP1", label='serves')
-    dot.edge("CAP2", "APP2", label='serves')
-    dot.edge("CAP3", "APP2", label='serves')
-    dot.edge("CAP4", "APP3", label='serves')
-
-    # App → Interface → Target App/System
-    for iface_id, _, _, source_app, target in interfaces:
-        dot.edge(source_app, iface_id, label='exposes', style='solid', color='gray30')
-        dot.edge(iface_id, target, label='invokes',
-                 style='solid' if "IF1" in iface_id or "IF2" in iface_id else 'dashed', color='gray30')
+    def _impact(self, comp):
+        # Impact set of a component: its members plus the impact sets of the components depending on
+        # it. Iterative post-order over dependents, memoising every set computed on the way.
+        memo = self._memo
+        if comp in memo:
+            return memo[comp]
+        parents, bits = self._parents, self._bits
+        stack = [comp]
+        while stack:
+            c = stack[-1]
+            todo = [p for p in parents[c] if p not in memo]
+            if todo:
+                stack.extend(todo)
+                continue
+            stack.pop()
+            if c not in memo:
+                mask = bits[c]
+                for p in parents[c]:
+                    mask |= memo[p]
+                memo[c] = mask
+        return memo[comp]
 
-    # Legend
-    with dot.subgraph(name='cluster_legend') as legend:
-        legend.attr(label='Legend', fontsize='11', style='dashed', color='gray70')
-        legend.node('L1', 'Business Capability', **CAPABILITY_STYLE)
-        legend.node('L2', 'Application', **APP_STYLE)
-        legend.node('L3', 'REST Interface', **REST_IFACE_STYLE)
-        legend.node('L4', 'Pub/Sub Interface', **PUBSUB_IFACE_STYLE)
-        legend.node('L5', 'External System', **EXT_SYSTEM_STYLE)
-        legend.edge('L1', 'L2', style='invis')
-        legend.edge('L2', 'L3', style='invis')
-        legend.edge('L3', 'L4', style='invis')
-        legend.edge('L4', 'L5', style='invis')
+    # --- Building and incremental maintenance ---
 
-    # Render
-    png_bytes = dot.pipe(format='png')
-    display(Image(png_bytes))
+    def _dependencies(self, id):
+        # Elements id depends on, from its outgoing forward and incoming reversed relations
+        model, relations, deps = self.model, self.relations, set()
+        for r in model._out.get(id, ()):
+            if relations.get(r.type) == 1 and r.target in model.elements:
+                deps.add(r.target)
+        for r in model._in.get(id, ()):
+            if relations.get(r.type) == -1 and r.source in model.elements:
+                deps.add(r.source)
+        return deps
 
-def show_technology_arch():
-    from graphviz import Digraph
+    def _rebuild(self):
+        self._ids = list(self.model.elements)
+        self._index = {id: i for i, id in enumerate(self._ids)}
+        index, relations = self._index, self.relations
+        self._deps = deps = [set() for _ in self._ids]
+        for r in self.model.relations:
+            direction = relations.get(r.type)
+            if direction and r.source in index and r.target in index:
+                a, b = (r.source, r.target) if direction == 1 else (r.target, r.source)
+                deps[index[a]].add(index[b])
+        comp, members = _strongly_connected(deps)
+        self._comp = comp
+        self._bits = [sum(1 << n for n in m) for m in members]
+        self._parents = [{} for _ in members]  # comp -> {dependent comp: edge count}
+        self._children = [{} for _ in members]
+        for a, targets in enumerate(deps):
+            for b in targets:
+                self._link(comp[a], comp[b], 1)
+        self._memo = {}
+        self._type_masks = {}
+        self._touched.clear()
+        self._stale = False
 
-    dot = Digraph('TechnologyLayer', format='png')
-    dot.attr(rankdir='TB', fontsize='12')
-    dot.attr(label='<<B>Technology Layer (As-Is)</B>>', labelloc='t', fontsize='14')
+    def _link(self, ca, cb, delta):
+        # a depends on b: ca is a parent (dependent) of cb; multi-edges between components are counted
+        if ca == cb:
+            return
+        for index, key, other in ((self._parents, cb, ca), (self._children, ca, cb)):
+            count = index[key].get(other, 0) + delta
+            if count:
+                index[key][other] = count
+            else:
+                del index[key][other]
 
-    # Styles
-    APP_STYLE = {'shape': 'component', 'style': 'filled', 'fillcolor': '#e1f5fe', 'fontsize': '10'}
-    INFRA_STYLE = {'shape': 'box3d', 'style': 'filled', 'fillcolor': '#fff3e0', 'fontsize': '10'}
-    TECH_STYLE = {'shape': 'cylinder', 'style': 'filled', 'fillcolor': '#f3e5f5', 'fontsize': '10'}
-    RUNTIME_STYLE = {'shape': 'note', 'style': 'filled', 'fillcolor': '#ede7f6', 'fontsize': '9'}
+    def _sync(self):
+        if self._stale:
+            return self._rebuild()
+        if not self._touched:
+            return
+        touched, self._touched = self._touched, set()
+        model, index = self.model, self._index
+        added, removed = [], []
+        for id in touched:
+            if id not in model.elements:
+                if id in index:
+                    return self._rebuild()  # removed element: indexes shift
+                continue
+            if id not in index:
+                self._add_node(id)
+            node = index[id]
+            deps = {index[d] if d in index else self._add_node(d) for d in self._dependencies(id)}
+            old = self._deps[node]
+            added += [(node, b) for b in deps - old]
+            removed += [(node, b) for b in old - deps]
+            self._deps[node] = deps
+        comp = self._comp
+        for a, b in removed:
+            if comp[a] == comp[b]:
+                return self._rebuild()  # may split the component
+            self._link(comp[a], comp[b], -1)
+            self._invalidate(comp[b])
+        for a, b in added:
+            if comp[a] != comp[b] and self._impact(comp[a]) >> b & 1:
+                return self._rebuild()  # b already depends on a: the new edge closes a cycle
+            self._link(comp[a], comp[b], 1)
+            self._invalidate(comp[b])
 
-    # Applications (same IDs to align with earlier layers)
-    dot.node('APP1', 'OrderPortalApp', **APP_STYLE)
-    dot.node('APP2', 'InventoryManagerApp', **APP_STYLE)
-    dot.node('APP3', 'UserStoreApp', **APP_STYLE)
-    dot.node('EXT1', 'Notification System', shape='cylinder', style='filled,dashed', fillcolor='#f8bbd0')
-
-    # Infra components
-    infra = [
-        ("INF1", "WebLogic Server"),
-        ("INF2", "VM on vSphere"),
-        ("INF3", "Oracle RDBMS"),
-        ("INF4", "MSMQ"),
-        ("INF5", "Active Directory"),
-        ("INF6", "File Share"),
-        ("INF7", "Spring Boot Runtime"),
-        ("INF8", "Java 8 (JDK)"),
-    ]
-
-    for id, label in infra:
-        style = TECH_STYLE if "RDBMS" in label or "MSMQ" in label else INFRA_STYLE
-        dot.node(id, label, **style)
+    def _add_node(self, id):
+        node = len(self._ids)
+        self._ids.append(id)
+        self._index[id] = node
+        self._deps.append(set())
+        self._comp.append(len(self._bits))
+        self._bits.append(1 << node)
+        self._parents.append({})
+        self._children.append({})
+        self._type_masks = {}
+        return node
 
-    # Add runtimes
-    dot.node("R1", "Spring MVC", **RUNTIME_STYLE)
-    dot.node("R2", "Spring Boot", **RUNTIME_STYLE)
+    def _invalidate(self, comp):
+        # Drop memoised sets of comp and of everything it depends on. A component without a memo has no
+        # memoised dependencies either (computing one memoises all of its dependents), so stop there.
+        stack = [comp]
+        while stack:
+            c = stack.pop()
+            if self._memo.pop(c, None) is not None:
+                stack.extend(self._children[c])
 
-    # Relationships: Apps deployed on, using tech
-    dot.edge("APP1", "INF1", label='deployed on')
-    dot.edge("APP1", "INF3", label='uses DB')
-    dot.edge("APP1", "R1", label='runs on')
-    dot.edge("APP1", "INF8", label='uses JDK')
-    dot.edge("APP1", "INF2", label='hosted on')
-
-    dot.edge("APP2", "INF3", label='uses DB')
-    dot.edge("APP2", "INF4", label='uses MSMQ')
-    dot.edge("APP2", "INF2", label='hosted on')
-    dot.edge("APP2", "R2", label='runs on')
-    dot.edge("APP2", "INF8", label='uses JDK')
-
-    dot.edge("APP3", "INF1", label='deployed on')
-    dot.edge("APP3", "INF3", label='uses DB')
-    dot.edge("APP3", "R1", label='runs on')
-    dot.edge("APP3", "INF8", label='uses JDK')
-    dot.edge("APP3", "INF2", label='hosted on')
-
-    dot.edge("APP1", "INF5", label='auth via')
-    dot.edge("APP3", "INF5", label='auth via')
-
-    dot.edge("APP2", "INF6", label='writes to')
-    dot.edge("INF4", "EXT1", label='delivers to')
 
-    # Legend
-    with dot.subgraph(name='cluster_legend') as legend:
-        legend.attr(label='Legend', fontsize='11', style='dashed', color='gray70')
-        legend.node('L1', 'Application', **APP_STYLE)
-        legend.node('L2', 'Infra Component', **INFRA_STYLE)
-        legend.node('L3', 'Platform/DB/Message Bus', **TECH_STYLE)
-        legend.node('L4', 'Runtime / Framework', **RUNTIME_STYLE)
-        legend.edge('L1', 'L2', style='invis')
-        legend.edge('L2', 'L3', style='invis')
-        legend.edge('L3', 'L4', style='invis')
+def _set_bits(mask):
+    # Set bits of an int, lowest first: scanning its binary string runs at C speed
+    bits = bin(mask)[:1:-1]
+    i = bits.find('1')
+    while i >= 0:
+        yield i
+        i = bits.find('1', i + 1)
 
-    # Render
-    from IPython.display import Image, display
-    png_bytes = dot.pipe(format='png')
-    display(Image(png_bytes))
 
-def show_data_flow():
-    from graphviz import Digraph
+def _strongly_connected(graph):
+    # Iterative Tarjan over adjacency sets indexed 0..n-1; returns (component of each node, members)
+    n = len(graph)
+    index, low, comp = [-1] * n, [0] * n, [-1] * n
+    on_stack, stack, members, counter = [False] * n, [], [], 0
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        work = [(root, iter(graph[root]))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if index[child] == -1:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack[child] = True
+                    work.append((child, iter(graph[child])))
+                    break
+                if on_stack[child] and index[child] < low[node]:
+                    low[node] = index[child]
+            else:
+                work.pop()
+                if work and low[node] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[node]
+                if low[node] == index[node]:
+                    group = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        comp[member] = len(members)
+                        group.append(member)
+                        if member == node:
+                            break
+                    members.append(group)
+    return comp, members
 
-    dot = Digraph('DataFlowDiagram', format='png')
-    dot.attr(rankdir='LR', fontsize='12')
-    dot.attr(label='<<B>Data Flow Diagram (As-Is)</B>>', labelloc='t', fontsize='14')
 
-    # Styles
-    SYSTEM_STYLE = {'shape': 'box', 'style': 'rounded,filled', 'fillcolor': '#e3f2fd', 'fontsize': '10'}
-    ACTOR_STYLE = {'shape': 'oval', 'style': 'filled', 'fillcolor': '#fff3e0', 'fontsize': '10'}
-    EXT_STYLE = {'shape': 'box', 'style': 'rounded,filled,dashed', 'fillcolor': '#f3e5f5', 'fontsize': '10'}
-    DATA_STYLE = {'shape': 'note', 'style': 'filled', 'fillcolor': '#f1f8e9', 'fontsize': '9'}
+def impact_index(model=None):
+    # The model's shared ImpactIndex, created on first use and kept current through model edits
+    model = MODEL if model is None else model
+    if model._impact is None:
+        model._impact = ImpactIndex(model)
+    return model._impact
 
-    # Nodes
-    dot.node('Customer', 'Customer', **ACTOR_STYLE)
-    dot.node('OrderPortalApp', 'OrderPortalApp', **SYSTEM_STYLE)
-    dot.node('InventoryManagerApp', 'InventoryManagerApp', **SYSTEM_STYLE)
-    dot.node('UserStoreApp', 'UserStoreApp', **SYSTEM_STYLE)
-    dot.node('NotificationSystem', 'Notification System', **EXT_STYLE)
-
-    # Data objects (optional but great for clarity)
-    dot.node('Order', 'Order', **DATA_STYLE)
-    dot.node('InventoryInfo', 'Inventory Info', **DATA_STYLE)
-    dot.node('UserPrefs', 'User Preferences', **DATA_STYLE)
-    dot.node('NotifEvent', 'Notification Event', **DATA_STYLE)
 
-    # Flows
-    dot.edge('Customer', 'OrderPortalApp', label='places Order')
-    dot.edge('OrderPortalApp', 'Order', label='creates')
-    dot.edge('Order', 'InventoryManagerApp', label='for Inventory Check')
+def impacted(*ids, model=None, types=None):
+    return impact_index(model).impacted(*ids, types=types)
 
-    dot.edge('InventoryManagerApp', 'InventoryInfo', label='queries/modifies')
-    dot.edge('InventoryManagerApp', 'UserStoreApp', label='requests preferences')
-    dot.edge('UserStoreApp', 'UserPrefs', label='provides')
-    dot.edge('InventoryManagerApp', 'NotifEvent', label='generates')
-    dot.edge('NotifEvent', 'NotificationSystem', label='sends')
 
-    # Optional: direct arrows if you want simpler flow (w/o data nodes)
-    # dot.edge('OrderPortalApp', 'InventoryManagerApp', label='Order data')
-    # dot.edge('InventoryManagerApp', 'UserStoreApp', label='User ID')
-    # dot.edge('InventoryManagerApp', 'NotificationSystem', label='Notify User')
+@_view_builder('impact', model_arg=1)
+def build_impact_view(ids, model=None, types=None):
+    # The failed elements and everything that depends on them, by layer, failed ones in red
+    model = MODEL if model is None else model
+    ids = [ids] if isinstance(ids, str) else list(ids)
+    dot = BulkDigraph('ImpactView', format='png')
+    dot.attr(rankdir='BT', fontsize='12')
+    dot.attr(label=f'<<B>Impact of {", ".join(model[id].label for id in ids)}</B>>', labelloc='t', fontsize='14')
 
-    # Legend (simple)
-    with dot.subgraph(name='cluster_legend') as legend:
-        legend.attr(label='Legend', fontsize='11', style='dashed', color='gray70')
-        legend.node('L1', 'Actor', **ACTOR_STYLE)
-        legend.node('L2', 'System', **SYSTEM_STYLE)
-        legend.node('L3', 'External System', **EXT_STYLE)
-        legend.node('L4', 'Data Entity', **DATA_STYLE)
-        legend.edge('L1', 'L2', style='invis')
-        legend.edge('L2', 'L3', style='invis')
-        legend.edge('L3', 'L4', style='invis')
+    # Styles
+    FAILED_STYLE = {'shape': 'box', 'style': 'filled,bold', 'fillcolor': '#ef9a9a', 'color': '#c62828',
+                    'fontsize': '10'}
+    IMPACTED_STYLE = {'shape': 'box', 'style': 'rounded,filled', 'fillcolor': '#ffe0b2', 'fontsize': '10'}
 
-    # Render
-    from IPython.display import Image, display
-    png_bytes = dot.pipe(format='png')
-    display(Image(png_bytes))
+    affected = [model[id] for id in impact_index(model).impacted(*ids, types=types)]
+    failed = [model[id] for id in ids]
+    for layer in ('business', 'application', 'technology'):
+        members = [e for e in failed + affected if e.layer == layer]
+        if not members:
+            continue
+        with dot.subgraph(name=f'cluster_{layer}') as c:
+            c.attr(label=layer.title(), style='dashed', color='gray70')
+            for e in members:
+                c.node(e.id, e.label, **(FAILED_STYLE if e.id in ids else IMPACTED_STYLE))
+    rest = [e for e in failed + affected if e.layer not in ('business', 'application', 'technology')]
+    for e in rest:
+        dot.node(e.id, e.label, **(FAILED_STYLE if e.id in ids else IMPACTED_STYLE))
 
+    # Dependency relations among them
+    for rel in model.relations_among(failed + affected, tuple(IMPACT_RELATIONS)):
+        dot.edge(rel.source, rel.target, label=rel.label, color='gray40', fontsize='8')
+    return dot
 
-import matplotlib.pyplot as plt
 
+def show_impact(*ids, model=None, types=None):
+    _show(build_impact_view(ids, model, types))
 
-def show_user_journey():
-    # Define stages and emotion values (0 = angry, 1 = neutral, 2 = happy, 3 = delighted)
-    stages = ["Place Order", "Track Fulfillment", "Receive Notification", "Update Preferences", "Reorder Experience"]
-    emotions = [1, 0, 0, 1, 3]  # Numerical scale
-    emojis = ["😐", "😠", "😠", "😐", "😀"]
-    import warnings
-    warnings.filterwarnings("ignore", category=UserWarning, module="matplotlib")
-
-    # Friction points (As-Is limitations)
-    friction = [
-        "Slow inventory check via sync REST calls to Spring service.",
-        "Fulfillment backend uses polling + manual batch updates.",
-        "Notifications via MSMQ often delayed or fail silently.",
-        "Preferences stored in Oracle; UI sluggish and unresponsive.",
-        "No reordering logic or history tracking in legacy system."
-    ]
-
-    # To-Be resolutions (Lambda-based)
-    resolutions = [
-        "Parallel Lambda invocation checks stock instantly.",
-        "SNS triggers real-time fulfillment updates.",
-        "SNS with retry guarantees multi-channel delivery.",
-        "Low-latency APIs read/write user data in DynamoDB.",
-        "SNS event log supports reordering via event replay."
-    ]
-
-    # Plot setup
-    fig, ax = plt.subplots(figsize=(12, 6))
-    ax.plot(stages, emotions, marker='o', linestyle='-', color='steelblue', linewidth=2)
-
-    # Add emoji markers and annotations
-    for i, stage in enumerate(stages):
-        ax.text(i, emotions[i] + 0.1, emojis[i], fontsize=16, ha='center')
-        ax.annotate(f"Friction: {friction[i]}\nTo-Be: {resolutions[i]}",
-                    xy=(i, emotions[i]), xytext=(i, emotions[i] - 0.8),
-                    textcoords='data',
-                    arrowprops=dict(arrowstyle="->", color='gray'),
-                    fontsize=8, ha='center', wrap=True)
-
-    # Y-axis labels
-    ax.set_yticks([0, 1, 2, 3])
-    ax.set_yticklabels(["😠 Angry", "😐 Neutral", "😊 Happy", "😀 Delighted"])
-    ax.set_title("User Journey View – Justifying the Migration to AWS")
-    ax.set_xlabel("User Activity")
-    ax.set_ylabel("User Emotion")
-    ax.grid(True, axis='y', linestyle='--', alpha=0.5)
-    plt.tight_layout()
-    plt.show()
 
+# --- Model diff ---
+# Compares two landscapes: two model snapshots (diff_models) or the as-is and to-be states of one model
+# (diff_states). Elements are matched by id, then unmatched pairs are matched through declared `replaces`
+# relations (to-be replaces as-is). Each element and relation is reduced to a hashed signature once, so
+# the diff is one pass over both sides: O(V+E), no pairwise comparison.
+class ModelDiff:
+    __slots__ = ('old', 'new', 'old_relations', 'new_relations', 'matched', 'replaced', 'added', 'removed',
+                 'changed', 'rewired', 'added_relations', 'removed_relations', 'changed_relations')
 
-def show_tobe_app_arch():
-    dot = Digraph('ToBeApplicationView', format='png')
-    dot.attr(rankdir='TB', fontsize='12', size='8.27,11.69!', ratio='fill')  # A4 Portrait
-    dot.attr(label='<<B>To-Be Application View (AWS SAM + Lambda)</B>>', labelloc='t', fontsize='14')
+    def __init__(self, old, new, old_relations, new_relations):
+        self.old = old  # id -> Element, both sides
+        self.new = new
+        self.old_relations = old_relations
+        self.new_relations = new_relations
+        self.matched = {}  # old id -> new id
+        self.replaced = []  # (old id, new id) for every declared replacement present on both sides
+        self.added = []
+        self.removed = []
+        self.changed = []  # (old element, new element) whose type, label, layer, state or props differ
+        self.rewired = []  # new ids of matched elements whose relations differ
+        self.added_relations = []
+        self.removed_relations = []
+        self.changed_relations = []  # (old relation, new relation): same ends and type, other label/props
 
-    # --- Styles ---
-    CAP_STYLE = {'shape': 'rectangle', 'style': 'rounded,filled', 'fillcolor': '#fdf6e3', 'fontsize': '10'}
-    APP_STYLE = {'shape': 'component', 'style': 'filled', 'fillcolor': '#e1f5fe', 'fontsize': '10'}
-    LAMBDA_STYLE = {'shape': 'box', 'style': 'filled', 'fillcolor': '#dcedc8', 'fontsize': '9'}
-    REST_IFACE_STYLE = {'shape': 'note', 'style': 'filled', 'fillcolor': '#c8e6c9', 'fontsize': '9'}
-    SNS_IFACE_STYLE = {'shape': 'ellipse', 'style': 'filled,dashed', 'fillcolor': '#f8bbd0', 'fontsize': '9'}
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed or self.rewired)
 
-    # --- Business Capabilities ---
-    capabilities = [
-        ("CAP1", "Order Management"),
-        ("CAP2", "Inventory Reservation"),
-        ("CAP3", "Fulfillment Scheduling"),
-        ("CAP4", "Customer Communication"),
-    ]
+    def __repr__(self):
+        return '<ModelDiff ' + ' '.join(f'{k}={v}' for k, v in self.summary().items()) + '>'
 
-    for node_id, label in capabilities:
-        dot.node(node_id, label, **CAP_STYLE)
+    def summary(self):
+        return {'added': len(self.added), 'removed': len(self.removed), 'changed': len(self.changed),
+                'rewired': len(self.rewired), 'added_relations': len(self.added_relations),
+                'removed_relations': len(self.removed_relations), 'changed_relations': len(self.changed_relations)}
 
-    # --- Applications (SAM apps) ---
-    sam_apps = [
-        ("APP1", "OrderProcessorApp"),
-        ("APP2", "InventoryServiceApp"),
-        ("APP3", "UserProfileApp"),
-        ("APP4", "NotificationService"),
-    ]
 
-    for node_id, label in sam_apps:
-        dot.node(node_id, label, **APP_STYLE)
+def diff_models(old, new):
+    # Snapshot diff: replacements come from the `replaces` relations of either snapshot
+    replaces = [(r.target, r.source) for m in (old, new) for r in m.relations_of_type('replaces')]
+    return _diff(old.elements, old.relations, new.elements, new.relations, replaces, with_state=True)
 
-    # --- Lambda Functions ---
-    lambdas = [
-        ("L1", "SubmitOrderFn"),
-        ("L2", "ValidateOrderFn"),
-        ("L3", "CheckInventoryFn"),
-        ("L4", "ReserveStockFn"),
-        ("L5", "GetUserPrefsFn"),
-        ("L6", "UpdatePrefsFn"),
-        ("L7", "NotifyUserFn"),
-    ]
-
-    for node_id, label in lambdas:
-        dot.node(node_id, label, **LAMBDA_STYLE)
 
-    # --- Interfaces ---
-    interfaces = [
-        ("IF1", "REST: Submit Order", REST_IFACE_STYLE),
-        ("IF2", "REST: Check Inventory", REST_IFACE_STYLE),
-        ("IF3", "REST: Get User Prefs", REST_IFACE_STYLE),
-        ("IF4", "SNS: Order Events", SNS_IFACE_STYLE),
-        ("IF5", "SNS: Notifications", SNS_IFACE_STYLE),
-    ]
-
-    for iface_id, label, style in interfaces:
-        dot.node(iface_id, label, **style)
-
-    # --- Capability to App connections ---
-    dot.edge("CAP1", "APP1", label='served by')
-    dot.edge("CAP2", "APP2", label='served by')
-    dot.edge("CAP3", "APP2", label='served by')
-    dot.edge("CAP4", "APP3", label='served by')
-    dot.edge("CAP4", "APP4", label='served by')
-
-    # --- App to Functions ---
-    dot.edge("APP1", "L1", label='composes')
-    dot.edge("APP1", "L2", label='composes')
-    dot.edge("APP2", "L3", label='composes')
-    dot.edge("APP2", "L4", label='composes')
-    dot.edge("APP3", "L5", label='composes')
-    dot.edge("APP3", "L6", label='composes')
-    dot.edge("APP4", "L7", label='composes')
-
-    # --- Function to Interfaces ---
-    dot.edge("IF1", "L1", label='invokes')  # REST → SubmitOrder
-    dot.edge("IF2", "L3", label='invokes')  # REST → CheckInventory
-    dot.edge("IF3", "L5", label='invokes')  # REST → GetUserPrefs
-    dot.edge("IF4", "L2", label='triggers')  # SNS → ValidateOrder
-    dot.edge("IF4", "L4", label='triggers')  # SNS → ReserveStock
-    dot.edge("IF5", "L7", label='triggers')  # SNS → NotifyUser
+def diff_states(model=None, old='as-is', new='to-be'):
+    # The old landscape is every element in state old or shared (state None), likewise for new, each
+    # with the relations among its elements. State is what separates the two sides, so it is not
+    # compared. Reads go through the model's queries, so views built on it are tracked like any other.
+    model = MODEL if model is None else model
+    sides = ({}, {})
+    for layer in list(model._by_layer):
+        for e in model.in_layer(layer):
+            for side, state in zip(sides, (old, new)):
+                if e.state is None or e.state == state:
+                    side[e.id] = e
+    relations = [r for type in list(model._by_relation_type) for r in model.relations_of_type(type)]
+    old_relations, new_relations = ([r for r in relations if r.source in side and r.target in side] for side in sides)
+    replaces = [(r.target, r.source) for r in model.relations_of_type('replaces')]
+    return _diff(sides[0], old_relations, sides[1], new_relations, replaces, with_state=False)
 
-    # --- Legend ---
-    with dot.subgraph(name='cluster_legend') as legend:
-        legend.attr(label='Legend', fontsize='11', style='dashed', color='gray70')
-        legend.node('L_APP', 'Application (SAM)', **APP_STYLE)
-        legend.node('L_LAM', 'Lambda Function', **LAMBDA_STYLE)
-        legend.node('L_REST', 'REST Interface', **REST_IFACE_STYLE)
-        legend.node('L_SNS', 'SNS Topic', **SNS_IFACE_STYLE)
-        legend.node('L_CAP', 'Business Capability', **CAP_STYLE)
-        legend.edge('L_CAP', 'L_APP', style='invis')
-        legend.edge('L_APP', 'L_LAM', style='invis')
-        legend.edge('L_LAM', 'L_REST', style='invis')
-        legend.edge('L_REST', 'L_SNS', style='invis')
 
-    # Render
-    from IPython.display import Image, display
-    png_bytes = dot.pipe(format='png')
-    display(Image(png_bytes))
+def _props_key(props):
+    return json.dumps(props, sort_keys=True, default=str) if props else ''
 
-def show_tobe_tech_arch():
-    from graphviz import Digraph
 
-    dot = Digraph('ToBeTechnologyLayerIcons', format='png')
-    dot.attr(rankdir='TB', fontsize='12', size='8.27,11.69!', ratio='fill')
-    dot.attr(label='<<B>To-Be Technology Layer (AWS Cloud – Icon View)</B>>', labelloc='t', fontsize='14')
+def _diff(old, old_relations, new, new_relations, replaces, with_state):
+    diff = ModelDiff(old, new, old_relations, new_relations)
 
-    # --- Style Constants ---
-    APP_STYLE = {'shape': 'component', 'style': 'filled', 'fillcolor': '#e1f5fe', 'fontsize': '10'}
-    RUNTIME_STYLE = {'shape': 'note', 'style': 'filled', 'fillcolor': '#ede7f6', 'fontsize': '9'}
+    # Match by id, then by declared replacement among the still unmatched
+    matched = diff.matched
+    for id in old:
+        if id in new:
+            matched[id] = id
+    taken = set(matched.values())
+    for old_id, new_id in replaces:
+        if old_id in old and new_id in new:
+            diff.replaced.append((old_id, new_id))
+            if old_id not in matched and new_id not in taken:
+                matched[old_id] = new_id
+                taken.add(new_id)
+    diff.removed = [e for id, e in old.items() if id not in matched]
+    diff.added = [e for id, e in new.items() if id not in taken]
 
-    # --- Applications ---
-    apps = [
-        ("APP1", "OrderProcessorApp"),
-        ("APP2", "InventoryServiceApp"),
-        ("APP3", "UserProfileApp"),
-        ("APP4", "NotificationService"),
-    ]
+    def signature(e):
+        return hash((e.type, e.label, e.layer, e.state if with_state else None, _props_key(e.props)))
 
-    for id, label in apps:
-        dot.node(id, label, **APP_STYLE)
+    for old_id, new_id in matched.items():
+        a, b = old[old_id], new[new_id]
+        if a is not b and signature(a) != signature(b):
+            diff.changed.append((a, b))
 
-    # --- Runtimes ---
-    dot.node("RT1", "Python 3.12 Runtime", **RUNTIME_STYLE)
-
-    # --- AWS Icon Nodes (image + label) ---
-    aws_services = {
-        "T1": (
-        "AWS Lambda", "icons/Architecture-Service-Icons_02072025/Arch_Compute/32/Arch_AWS-Lambda_32.png"),
-        "T2": ("API Gateway",
-               "icons/Architecture-Service-Icons_02072025/Arch_Networking-Content-Delivery/32/Arch_Amazon-API-Gateway_32.png"),
-        "T3": ("Amazon SNS",
-               "icons/Architecture-Service-Icons_02072025/Arch_App-Integration/32/Arch_Amazon-Simple-Notification-Service_32.png"),
-        "T4": (
-        "Amazon DynamoDB", "icons/Architecture-Service-Icons_02072025/Arch_Database/32/Arch_Amazon-DynamoDB_32.png"),
-        "T5": ("Amazon Cognito",
-               "icons/Architecture-Service-Icons_02072025/Arch_Security-Identity-Compliance/32/Arch_Amazon-Cognito_32.png"),
-        "T6": ("CloudWatch Logs",
-               "icons/Architecture-Service-Icons_02072025/Arch_Management-Governance/32/Arch_Amazon-CloudWatch_32.png"),
+    # Relations keyed by (source, target, type) in the new side's ids; old ids map through the match,
+    # which is one-to-one, so keys of unmatched old ends cannot collide with new ids
+    def keyed(relations, mapping):
+        index = {}
+        for r in relations:
+            key = (mapping(r.source), mapping(r.target), r.type)
+            index.setdefault(key, []).append(r)
+        return index
+
+    before = keyed(old_relations, lambda id: matched.get(id, id))
+    after = keyed(new_relations, lambda id: id)
+    touched = set()
+    for key, rels in before.items():
+        others = after.get(key)
+        if others is None:
+            diff.removed_relations.extend(rels)
+            touched.update(key[:2])
+            continue
+        # Parallel relations of one key are paired in order; any surplus counts as added or removed
+        for a, b in zip(rels, others):
+            if a.label != b.label or _props_key(a.props) != _props_key(b.props):
+                diff.changed_relations.append((a, b))
+        diff.removed_relations.extend(rels[len(others):])
+        diff.added_relations.extend(others[len(rels):])
+        if len(rels) != len(others):
+            touched.update(key[:2])
+    for key, rels in after.items():
+        if key not in before:
+            diff.added_relations.extend(rels)
+            touched.update(key[:2])
+    status = {b.id for _, b in diff.changed}
+    diff.rewired = [new_id for new_id in matched.values() if new_id in touched and new_id not in status]
+    return diff
+
+
+@_view_builder('diff', model_arg=None)
+def build_diff_view(diff=None, collapse=True, title=None):
+    # The delta only: added (green), removed (red, dashed), changed (orange) and rewired (yellow)
+    # elements with the relations that changed between them. Unchanged elements appear as grey context
+    # where a changed relation touches them; collapse=False draws the whole new landscape around it.
+    diff = diff_states() if diff is None else diff
+    dot = BulkDigraph('DiffView', format='png')
+    dot.attr(rankdir='LR', fontsize='11')
+    dot.attr(label=title or 'Landscape Changes', labelloc='t', fontsize='14')
+
+    # Styles
+    STYLES = {
+        'added': {'shape': 'box', 'style': 'rounded,filled', 'fillcolor': '#c8e6c9', 'fontsize': '10'},
+        'removed': {'shape': 'box', 'style': 'rounded,filled,dashed', 'fillcolor': '#ffcdd2', 'fontsize': '10'},
+        'changed': {'shape': 'box', 'style': 'rounded,filled', 'fillcolor': '#ffe0b2', 'fontsize': '10'},
+        'rewired': {'shape': 'box', 'style': 'rounded,filled', 'fillcolor': '#fff9c4', 'fontsize': '10'},
+        'unchanged': {'shape': 'box', 'style': 'rounded,filled', 'fillcolor': '#f5f5f5', 'color': 'gray60',
+                      'fontcolor': 'gray40', 'fontsize': '9'},
+    }
+    EDGE_STYLES = {
+        'added': {'color': '#2e7d32', 'fontcolor': '#2e7d32', 'fontsize': '8'},
+        'removed': {'color': '#c62828', 'fontcolor': '#c62828', 'style': 'dashed', 'fontsize': '8'},
+        'changed': {'color': '#ef6c00', 'fontcolor': '#ef6c00', 'fontsize': '8'},
+        'unchanged': {'color': 'gray70', 'fontcolor': 'gray50', 'fontsize': '8'},
     }
+    SUMMARY_STYLE = {'shape': 'plaintext', 'fontcolor': 'gray50', 'fontsize': '9'}
 
-    for id, (label, icon_path) in aws_services.items():
-        dot.node(id, label='', image=icon_path, shape='none', labelloc='b', width='0.8', height='0.8', xlabel=label)
+    # Nodes by status; removed elements keep their old id, everything else uses the new one
+    nodes = {}  # id -> (element, label, status)
+    for e in diff.removed:
+        nodes[e.id] = (e, e.label, 'removed')
+    for e in diff.added:
+        nodes[e.id] = (e, e.label, 'added')
+    for a, b in diff.changed:
+        nodes[b.id] = (b, f'{a.label} → {b.label}' if a.label != b.label else b.label, 'changed')
+    for id in diff.rewired:
+        nodes[id] = (diff.new[id], diff.new[id].label, 'rewired')
 
-    # --- App ↔ AWS Tech edges ---
-    dot.edge("APP1", "T1")  # Lambda
-    dot.edge("APP1", "T2")  # API Gateway
-    dot.edge("APP1", "T3")  # SNS
-    dot.edge("APP1", "T4")  # Dynamo
-    dot.edge("APP1", "T5")  # Cognito
-    dot.edge("APP1", "T6")  # CloudWatch
-    dot.edge("APP1", "RT1")
-
-    dot.edge("APP2", "T1")
-    dot.edge("APP2", "T3")
-    dot.edge("APP2", "T4")
-    dot.edge("APP2", "T6")
-    dot.edge("APP2", "RT1")
-
-    dot.edge("APP3", "T1")
-    dot.edge("APP3", "T2")
-    dot.edge("APP3", "T4")
-    dot.edge("APP3", "T5")
-    dot.edge("APP3", "T6")
-    dot.edge("APP3", "RT1")
-
-    dot.edge("APP4", "T1")
-    dot.edge("APP4", "T3")
-    dot.edge("APP4", "T6")
-    dot.edge("APP4", "RT1")
+    def new_id(old_id):
+        return diff.matched.get(old_id, old_id)
 
-    # --- Optional: AWS Cloud boundary grouping ---
-    with dot.subgraph(name='cluster_aws_cloud') as aws:
-        aws.attr(label='AWS Cloud', style='dashed', color='gray70')
-        for aws_id in aws_services:
-            aws.node(aws_id)
+    edges = [(new_id(r.source), new_id(r.target), r.label, 'removed') for r in diff.removed_relations]
+    edges += [(r.source, r.target, r.label, 'added') for r in diff.added_relations]
+    edges += [(b.source, b.target, f'{a.label} → {b.label}' if a.label != b.label else b.label, 'changed')
+              for a, b in diff.changed_relations]
+    if not collapse:
+        drawn = set(diff.added_relations).union(b for _, b in diff.changed_relations)
+        edges += [(r.source, r.target, r.label, 'unchanged') for r in diff.new_relations if r not in drawn]
+        for id, e in diff.new.items():
+            if id not in nodes:
+                nodes[id] = (e, e.label, 'unchanged')
+    for source, target, _, _ in edges:
+        for id in (source, target):
+            if id not in nodes:
+                nodes[id] = (diff.new[id], diff.new[id].label, 'unchanged')
 
-    # --- Legend (only if needed) ---
-    # dot.node("L1", "App", **APP_STYLE)
-    # dot.node("L2", "Runtime", **RUNTIME_STYLE)
+    # One cluster per layer; collapsed unchanged elements are counted in it
+    shown = {}
+    for id, (e, _, _) in nodes.items():
+        shown.setdefault(e.layer, []).append(id)
+    hidden = {}
+    if collapse:
+        for id, e in diff.new.items():
+            if id not in nodes:
+                hidden[e.layer] = hidden.get(e.layer, 0) + 1
+    layers = dict.fromkeys(e.layer for side in (diff.new, diff.old) for e in side.values())
+    for layer in [layer for layer in layers if layer in shown or layer in hidden]:
+        with dot.subgraph(name=f'cluster_{layer}') as c:
+            c.attr(label=str(layer).title(), style='dashed', color='gray70')
+            for id in shown.get(layer, ()):
+                _, label, status = nodes[id]
+                c.node(id, label, **STYLES[status])
+            if hidden.get(layer):
+                c.node(f'unchanged_{layer}', f'{hidden[layer]} unchanged', **SUMMARY_STYLE)
 
-    # --- Render ---
-    from IPython.display import Image, display
-    png_bytes = dot.pipe(format='png')
-    display(Image(png_bytes))
+    for source, target, label, status in edges:
+        dot.edge(source, target, label=label, **EDGE_STYLES[status])
+    return dot
 
-def show_sidebyside_view():
-    from graphviz import Digraph
 
-    dot = Digraph('ComparisonView', format='png')
-    dot.attr(rankdir='LR', fontsize='11', size='8.27,11.69!', ratio='compress')
-    dot.attr(label="As-Is -> To-Be Application & Technology Comparison View", labelloc='t', fontsize='14')
+def show_diff(old=None, new=None, collapse=True):
+    # show_diff() compares as-is with to-be; show_diff(old_model, new_model) compares two snapshots
+    diff = diff_states() if old is None else diff_models(old, new)
+    _show(build_diff_view(diff, collapse))
 
 
+# --- Batch rendering ---
+# Graphviz views by name; render_all() and the exporters below iterate this in order.
+VIEWS = {
+    'biz_arch': build_biz_arch,
+    'app_arch': build_app_arch,
+    'data_flow': build_data_flow,
+    'technology_arch': build_technology_arch,
+    'tobe_app_arch': build_tobe_app_arch,
+    'tobe_tech_arch': build_tobe_tech_arch,
+    'sidebyside_view': build_sidebyside_view,
+    'roadmap': build_roadmap,
+}
 
-    # --- Styles ---
-    APP_ASIS_STYLE = {'shape': 'component', 'style': 'filled', 'fillcolor': '#ffe0b2', 'fontsize': '10'}
-    APP_TOBE_STYLE = {'shape': 'component', 'style': 'filled', 'fillcolor': '#c8e6c9', 'fontsize': '10'}
-    TECH_ASIS_STYLE = {'shape': 'box3d', 'style': 'filled', 'fillcolor': '#ffe0e0', 'fontsize': '10'}
-    TECH_TOBE_STYLE = {'shape': 'cylinder', 'style': 'filled', 'fillcolor': '#dcedc8', 'fontsize': '10'}
-
-    # --- As-Is Applications ---
-    asis_apps = [
-        ("A1", "OrderPortalApp"),
-        ("A2", "InventoryManagerApp"),
-        ("A3", "UserStoreApp"),
-        ("A4", "Notification System"),
-    ]
-    for id, label in asis_apps:
-        dot.node("ASIS_" + id, label, **APP_ASIS_STYLE)
-
-    # --- To-Be Applications ---
-    tobe_apps = [
-        ("A1", "OrderProcessorApp"),
-        ("A2", "InventoryServiceApp"),
-        ("A3", "UserProfileApp"),
-        ("A4", "NotificationService"),
-    ]
-    for id, label in tobe_apps:
-        dot.node("TOBE_" + id, label, **APP_TOBE_STYLE)
-
-    # --- As-Is Tech ---
-    asis_tech = [
-        ("T1", "WebLogic"),
-        ("T2", "Oracle RDBMS"),
-        ("T3", "MSMQ"),
-        ("T4", "File Share"),
-    ]
-    for id, label in asis_tech:
-        dot.node("ASIS_" + id, label, **TECH_ASIS_STYLE)
-
-    # --- To-Be Tech ---
-    tobe_tech = [
-        ("T1", "AWS Lambda"),
-        ("T2", "DynamoDB"),
-        ("T3", "SNS"),
-        ("T4", "Amazon S3"),
-    ]
-    for id, label in tobe_tech:
-        dot.node("TOBE_" + id, label, **TECH_TOBE_STYLE)
-
-    # --- Application Mappings (TO-BE replaces AS-IS) ---
-    dot.edge("TOBE_A1", "ASIS_A1", label="replaces")
-    dot.edge("TOBE_A2", "ASIS_A2", label="replaces")
-    dot.edge("TOBE_A3", "ASIS_A3", label="replaces")
-    dot.edge("TOBE_A4", "ASIS_A4", label="replaces")
-
-    dot.edge("TOBE_T1", "ASIS_T1", label="replaces")
-    dot.edge("TOBE_T2", "ASIS_T2", label="replaces")
-    dot.edge("TOBE_T3", "ASIS_T3", label="replaces")
-    dot.edge("TOBE_T4", "ASIS_T4", label="replaces")
+# matplotlib figures, exported next to the Graphviz views by the command line (see export_figures)
+FIGURES = {
+    'roadmap_plot': lambda: plot_gantt(roadmap_frame()),
+    'user_journey': plot_user_journey,
+}
+OUTPUT_MANIFEST = '.leanix-outputs.json'  # output file -> hash of what produced it, for skip_unchanged
 
-    # --- Optional: Grouping by clusters ---
-    with dot.subgraph(name='cluster_asis') as c1:
-        c1.attr(label='As-Is Layer', style='dashed', color='gray70')
-        for id, _ in asis_apps + asis_tech:
-            c1.node("ASIS_" + id)
 
-    with dot.subgraph(name='cluster_tobe') as c2:
-        c2.attr(label='To-Be Layer', style='dashed', color='gray70')
-        for id, _ in tobe_apps + tobe_tech:
-            c2.node("TOBE_" + id)
+class RenderResult:
+    __slots__ = ('view', 'format', 'data', 'error', 'build_seconds', 'render_seconds', 'path', 'skipped')
 
-    # --- Render ---
-    from IPython.display import Image, display
-    png_bytes = dot.pipe(format='png')
-    display(Image(png_bytes))
+    def __init__(self, view, format, data=None, error=None, build_seconds=0.0, render_seconds=0.0, path=None):
+        self.view = view
+        self.format = format
+        self.data = data
+        self.error = error
+        self.build_seconds = build_seconds
+        self.render_seconds = render_seconds
+        self.path = path
+        self.skipped = False  # output already up to date (skip_unchanged)
 
-def show_roadmap():
-    from graphviz import Digraph
+    @property
+    def ok(self):
+        return self.error is None
 
-    dot = Digraph('Roadmap', format='png')
-    dot.attr(rankdir='LR', fontsize='12', size='8.27,11.69!', ratio='compress')
-    dot.attr(label='<<B>Roadmap</B>>', labelloc='t', fontsize='14')
+    @property
+    def seconds(self):
+        return self.build_seconds + self.render_seconds
 
-    # Styles
-    TASK_STYLE = {'shape': 'box', 'style': 'filled', 'fillcolor': '#e1f5fe', 'fontsize': '10'}
-    MILESTONE_STYLE = {'shape': 'diamond', 'style': 'filled', 'fillcolor': '#ffe0b2', 'fontsize': '10'}
+    def __repr__(self):
+        status = ('skipped' if self.skipped else 'ok') if self.ok else f'error={self.error!r}'
+        return f'<RenderResult {self.view}.{self.format} {status} {self.seconds:.3f}s>'
 
-    # Tasks
-    tasks = [
-        ("T1", "Requirement Gathering"),
-        ("T2", "Design Phase"),
-        ("T3", "Development Phase"),
-        ("T4", "Testing Phase"),
-        ("T5", "Deployment Phase"),
-        ("T6", "Post-Deployment Review"),
-    ]
-
-    for id, label in tasks:
-        dot.node(id, label, **TASK_STYLE)
 
-    # Milestones
-    milestones = [
-        ("M1", "Phase 1 Complete"),
-        ("M2", "Phase 2 Complete"),
-        ("M3", "Project Complete"),
-    ]
-
-    for id, label in milestones:
-        dot.node(id, label, **MILESTONE_STYLE)
-
-    # Task Dependencies
-    dot.edge("T1", "T2")
-    dot.edge("T2", "M1")
-    dot.edge("T2", "T3")
-    dot.edge("T3", "M2")
-    dot.edge("T3", "T4")
-    dot.edge("T4", "M3")
-    dot.edge("T4", "T5")
-    dot.edge("T5", "M3")
-    dot.edge("M1", "T6")
-
-    # Render
-    dot.render('roadmap_diagram', view=True)
-
-def show_roadmap_plot():
+def _render_job(dot, result, out_dir, timeout=None, reuse_layout=False, dpi=None):
+    start = time.perf_counter()
+    render = render_with_layout if reuse_layout else render_dot
+    try:
+        try:
+            result.data = render(dot, format=result.format, timeout=timeout, dpi=dpi)
+        except LayoutTimeout:
+            if dot.engine == SCALABLE_ENGINE:
+                raise
+            # dot could not lay it out in time; a force-directed engine always finishes much faster. The
+            # graph is shared with the view's other format jobs, so the engine is switched on a copy.
+            dot = use_scalable_engine(dot.copy())
+            result.data = render(dot, format=result.format, timeout=timeout, dpi=dpi)
+        if out_dir:
+            result.path = _output_path(out_dir, result.view, result.format)
+            with open(result.path, 'wb') as f:
+                f.write(result.data)
+    except Exception as exc:  # keep going, the error is reported on the result
+        result.error = exc
+    result.render_seconds = time.perf_counter() - start
+    return dot  # the graph actually rendered
+
+
+def render_all(views=None, formats=None, jobs=None, out_dir=None, model=None, partition=False,
+               max_nodes=None, timeout=None, reuse_layout=None, dpi=None, skip_unchanged=False):
+    # partition=True splits views above max_nodes into an overview plus per-domain subviews
+    # (named 'view/domain'); timeout bounds each Graphviz run, see render_partitioned().
+    # reuse_layout (default: when exporting several formats) lays each view out once, see compute_layout().
+    # skip_unchanged leaves files in out_dir alone when their source hash matches OUTPUT_MANIFEST.
+    from concurrent.futures import ThreadPoolExecutor
+
+    views = list(VIEWS) if views is None else [views] if isinstance(views, str) else list(views)
+    formats = [OUTPUT_FORMAT] if formats is None else [formats] if isinstance(formats, str) else list(formats)
+    if reuse_layout is None:
+        reuse_layout = len(formats) > 1
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    # Build every DOT source up front (cheap, pure Python), then fan the dot subprocesses out.
+    results, pending, keys = [], [], {}
+    manifest = _read_output_manifest(out_dir) if skip_unchanged and out_dir else None
+    for view in views:
+        start = time.perf_counter()
+        try:
+            dot, error = VIEWS[view](model), None
+        except Exception as exc:
+            dot, error = None, exc
+        parts = [(view, dot)]
+        if dot is not None and partition:
+            try:
+                parts = partition_view(dot, model, max_nodes, name=view)
+            except Exception as exc:
+                parts, error = [(view, None)], exc
+        elif dot is not None:
+            auto_engine(dot, max_nodes)
+        build_seconds = time.perf_counter() - start
+        for name, part in parts:
+            for fmt in formats:
+                result = RenderResult(name, fmt, error=error, build_seconds=build_seconds)
+                results.append(result)
+                if part is None:
+                    continue
+                if manifest is not None:
+                    path, key = _output_path(out_dir, name, fmt), _output_key(part, fmt, dpi)
+                    stored = manifest.get(os.path.basename(path))
+                    # a view that timed out last time was written by the SCALABLE_ENGINE fallback
+                    if os.path.exists(path) and stored is not None and (stored == key or (
+                            timeout and part.engine != SCALABLE_ENGINE
+                            and stored == _output_key(use_scalable_engine(part.copy()), fmt, dpi))):
+                        result.path, result.skipped = path, True
+                        continue
+                    keys[id(result)] = key
+                pending.append((part, result))
+
+    # Each job spends its time waiting on a Graphviz subprocess, so a thread per job gives
+    # process-level parallelism without pickling the graphs.
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(pending) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_render_job, dot, result, out_dir, timeout, reuse_layout, dpi)
+                   for dot, result in pending]
+        for (dot, result), future in zip(pending, futures):
+            rendered = future.result()
+            if rendered is not dot and id(result) in keys:  # fell back to SCALABLE_ENGINE
+                keys[id(result)] = _output_key(rendered, result.format, dpi)
+    if manifest is not None:
+        _write_output_manifest(out_dir, manifest, {os.path.basename(r.path): keys[id(r)]
+                                                   for _, r in pending if r.ok})
+    return results
+
+
+def _output_path(out_dir, view, format):
+    return os.path.join(out_dir, f'{view.replace("/", "--")}.{format}')
+
+
+def _output_key(dot, format, dpi=None):
+    # Same inputs as the render cache key (source, engine, format, referenced icon files) plus the DPI
+    return RENDER_CACHE.key(dot.source, dot.engine, f'{format}@{dpi}' if dpi and format in RASTER_FORMATS else format)
+
+
+def _read_output_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, OUTPUT_MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_output_manifest(out_dir, manifest, updates):
+    manifest.update(updates)
+    path = os.path.join(out_dir, OUTPUT_MANIFEST)
+    tmp = os.fspath(path) + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def export_figures(names=None, formats=None, out_dir='.', dpi=None, skip_unchanged=False):
+    # Save FIGURES to out_dir/<name>.<format>. They are drawn from code and built-in data, so the
+    # up-to-date check hashes this module's source.
     import matplotlib.pyplot as plt
-    from matplotlib.patches import Patch
-    import pandas as pd
 
-    # Extended roadmap: applications + technologies
-    data = [
-        # Applications
-        ("OrderPortalApp", "Deployed", "2025-05-01", "2025-05-31", "As-Is"),
-        ("OrderPortalApp", "Phased Out", "2025-06-01", "2025-06-15", "As-Is"),
-        ("OrderProcessorApp", "Development", "2025-05-01", "2025-05-31", "To-Be"),
-        ("OrderProcessorApp", "Parallel Run", "2025-06-01", "2025-06-30", "To-Be"),
-        ("OrderProcessorApp", "Go Live", "2025-07-01", "2025-10-01", "To-Be"),
-
-        ("InventoryManagerApp", "Deployed", "2025-05-01", "2025-05-31", "As-Is"),
-        ("InventoryManagerApp", "Phased Out", "2025-06-01", "2025-06-15", "As-Is"),
-        ("InventoryServiceApp", "Development", "2025-05-01", "2025-05-31", "To-Be"),
-        ("InventoryServiceApp", "Parallel Run", "2025-06-01", "2025-06-30", "To-Be"),
-        ("InventoryServiceApp", "Go Live", "2025-07-01", "2025-10-01", "To-Be"),
-
-        ("UserStoreApp", "Deployed", "2025-05-01", "2025-05-31", "As-Is"),
-        ("UserStoreApp", "Phased Out", "2025-06-01", "2025-06-15", "As-Is"),
-        ("UserProfileApp", "Development", "2025-05-01", "2025-05-31", "To-Be"),
-        ("UserProfileApp", "Parallel Run", "2025-06-01", "2025-06-30", "To-Be"),
-        ("UserProfileApp", "Go Live", "2025-07-01", "2025-10-01", "To-Be"),
-
-        ("Notification System", "Deployed", "2025-05-01", "2025-05-31", "As-Is"),
-        ("Notification System", "Phased Out", "2025-06-01", "2025-06-15", "As-Is"),
-        ("NotificationService", "Development", "2025-05-01", "2025-05-31", "To-Be"),
-        ("NotificationService", "Parallel Run", "2025-06-01", "2025-06-30", "To-Be"),
-        ("NotificationService", "Go Live", "2025-07-01", "2025-10-01", "To-Be"),
-
-        # Technologies
-        ("WebLogic", "Active", "2025-05-01", "2025-06-15", "As-Is"),
-        ("AWS Lambda", "Rollout", "2025-05-15", "2025-07-15", "To-Be"),
-
-        ("Oracle RDBMS", "Active", "2025-05-01", "2025-06-15", "As-Is"),
-        ("DynamoDB", "Rollout", "2025-05-15", "2025-07-15", "To-Be"),
-
-        ("MSMQ", "Active", "2025-05-01", "2025-06-15", "As-Is"),
-        ("SNS", "Rollout", "2025-05-15", "2025-07-15", "To-Be"),
-
-        ("File Share", "Active", "2025-05-01", "2025-06-15", "As-Is"),
-        ("Amazon S3", "Rollout", "2025-05-15", "2025-07-15", "To-Be"),
-    ]
-
-    # Create dataframe
-    df = pd.DataFrame(data, columns=["Component", "Phase", "Start", "End", "Type"])
-    df["Start"] = pd.to_datetime(df["Start"])
-    df["End"] = pd.to_datetime(df["End"])
-    df["Duration"] = (df["End"] - df["Start"]).dt.days
-
-    # Setup the plot
-    fig, ax = plt.subplots(figsize=(14, 10))
-
-    colors = {
-        "As-Is": "#FFAB91",  # soft red
-        "To-Be": "#A5D6A7"  # soft green
-    }
+    names = list(FIGURES) if names is None else [names] if isinstance(names, str) else list(names)
+    formats = [OUTPUT_FORMAT] if formats is None else [formats] if isinstance(formats, str) else list(formats)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = _read_output_manifest(out_dir) if skip_unchanged else None
+    with open(__file__, 'rb') as f:
+        code = hashlib.sha256(f.read()).hexdigest()
+    results, updates = [], {}
+    for name in names:
+        todo = []
+        for fmt in formats:
+            result = RenderResult(name, fmt, path=_output_path(out_dir, name, fmt))
+            results.append(result)
+            key = hashlib.sha256(f'{code}\0{name}\0{fmt}\0{dpi}'.encode()).hexdigest()
+            if manifest is not None and manifest.get(os.path.basename(result.path)) == key \
+                    and os.path.exists(result.path):
+                result.skipped = True
+            else:
+                todo.append((result, key))
+        if not todo:
+            continue
+        start = time.perf_counter()
+        try:
+            fig = FIGURES[name]()
+        except Exception as exc:
+            for result, _ in todo:
+                result.error = exc
+            continue
+        build_seconds = time.perf_counter() - start
+        for result, key in todo:
+            result.build_seconds = build_seconds
+            start = time.perf_counter()
+            try:
+                fig.savefig(result.path, format=result.format, dpi=dpi or 'figure')
+                updates[os.path.basename(result.path)] = key
+            except Exception as exc:
+                result.error = exc
+            result.render_seconds = time.perf_counter() - start
+        plt.close(fig)
+    if manifest is not None:
+        _write_output_manifest(out_dir, manifest, updates)
+    return results
 
-    yticks = []
-    ylabels = []
 
-    # Draw bars
-    for i, (comp, group) in enumerate(df.groupby("Component")):
-        for _, row in group.iterrows():
-            ax.barh(i, row["Duration"], left=row["Start"], color=colors[row["Type"]], edgecolor='black')
-            ax.text(row["Start"] + pd.Timedelta(days=1), i, row["Phase"], va='center', ha='left', fontsize=8)
-        yticks.append(i)
-        ylabels.append(comp)
+# --- Async rendering ---
+# Same pipeline as render_dot, but the Graphviz run is an asyncio subprocess, so a notebook kernel or a
+# service keeps serving its event loop while dot works. ASYNC_RENDER_JOBS caps concurrent layouts per
+# loop; a timeout or a cancelled task kills the subprocess instead of leaving it running.
+ASYNC_RENDER_JOBS = int(os.environ.get('LEANIX_ASYNC_JOBS', str(os.cpu_count() or 1)))
+_async_limits = {}  # event loop -> semaphore
 
-    # Customize axes
-    ax.set_yticks(yticks)
-    ax.set_yticklabels(ylabels)
-    ax.invert_yaxis()
-    ax.set_xlabel("Timeline")
-    ax.set_title("Full Transition Roadmap (Applications + Technologies)")
-    ax.grid(True, axis='x', linestyle='--', alpha=0.7)
 
-    # Legend
-    legend_handles = [Patch(color=color, label=label) for label, color in colors.items()]
-    ax.legend(handles=legend_handles, loc='upper right')
+def _async_limit():
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    limit = _async_limits.get(loop)
+    if limit is None:
+        for old in [l for l in _async_limits if l.is_closed()]:
+            del _async_limits[old]
+        limit = _async_limits[loop] = asyncio.Semaphore(ASYNC_RENDER_JOBS)
+    return limit
+
+
+async def _run_graphviz_async(source, engine, format, timeout=None, neato_no_op=None):
+    import asyncio
+    import subprocess
+
+    args = [f'-T{format}'] + ([f'-n{neato_no_op}'] if neato_no_op else [])
+    proc = await asyncio.create_subprocess_exec(engine, *args, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                                stderr=subprocess.PIPE)
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(source.encode('utf-8')), timeout)
+    except asyncio.TimeoutError:
+        raise LayoutTimeout(f'{engine} layout did not finish within {timeout}s') from None
+    finally:
+        if proc.returncode is None:  # timed out or cancelled
+            proc.kill()
+            await proc.wait()
+    if proc.returncode != 0:
+        raise RuntimeError(f'{engine} failed: {stderr.decode("utf-8", "replace").strip()}')
+    return stdout
+
+
+async def render_dot_async(dot, format='png', cache=None, timeout=None, dpi=None):
+    if format == 'svgz':
+        return _gzip(await render_dot_async(dot, 'svg', cache, timeout))
+    if dpi and format in RASTER_FORMATS:
+        dot = _with_dpi(dot, dpi)
+    start = time.perf_counter() if _sinks else 0.0
+    cache = RENDER_CACHE if cache is None else cache
+    key = _render_key(dot, format, cache)
+    data = cache.get(key)
+    hit = data is not None
+    if data is None:
+        async with _async_limit():
+            data = await _run_graphviz_async(dot.source, dot.engine, format, timeout,
+                                             getattr(dot, 'neato_no_op', None))
+        data = _store_render(cache, key, format, data)
+    if _sinks:
+        _emit_render(dot, format, time.perf_counter() - start, hit, data)
+    return data
+
+
+async def render_view_async(view, format=None, model=None, timeout=None, display=False):
+    # Bytes of one VIEWS entry (default OUTPUT_FORMAT); display=True also shows them (notebook or temp
+    # file) once ready.
+    format = format or OUTPUT_FORMAT
+    data = await render_dot_async(auto_engine(VIEWS[view](model)), format, timeout=timeout)
+    if display:
+        display_image(data, format, view)
+    return data
+
+
+async def show_view_async(view, format=None, model=None, timeout=None):
+    return await render_view_async(view, format, model, timeout, display=True)
+
+
+async def render_all_async(views=None, formats=None, model=None, timeout=None):
+    # {(view, format): bytes or the exception}, all views laid out concurrently within ASYNC_RENDER_JOBS
+    import asyncio
+
+    views = list(VIEWS) if views is None else [views] if isinstance(views, str) else list(views)
+    formats = [OUTPUT_FORMAT] if formats is None else [formats] if isinstance(formats, str) else list(formats)
+    jobs = [(view, fmt) for view in views for fmt in formats]
+    results = await asyncio.gather(*(render_view_async(view, fmt, model, timeout) for view, fmt in jobs),
+                                   return_exceptions=True)
+    return dict(zip(jobs, results))
+
+
+# --- Large landscapes ---
+# dot's layout is superlinear and the A4 size forcing makes big graphs unreadable. Above LARGE_VIEW_NODES
+# a view is either handed to a scalable force-directed engine (auto_engine) or split into one subview
+# per capability domain plus an overview graph linking the domains (partition_view). Each Graphviz run
+# can be bounded with a timeout; a dot run that overruns is retried once with the scalable engine.
+LARGE_VIEW_NODES = int(os.environ.get('LEANIX_LARGE_VIEW_NODES', '300'))
+SCALABLE_ENGINE = os.environ.get('LEANIX_SCALABLE_ENGINE', 'sfdp')
+SUBVIEW_TIMEOUT = 60
+_PAGE_ATTRS = ('size', 'ratio')
+
+
+def use_scalable_engine(dot):
+    dot.engine = SCALABLE_ENGINE
+    dot.attr(overlap='prism', outputorder='edgesfirst')
+    return dot
+
+
+def auto_engine(dot, max_nodes=None):
+    if len(dot.node_ids()) > (max_nodes or LARGE_VIEW_NODES):
+        use_scalable_engine(dot)
+    return dot
+
+
+def capability_domains(model, ids):
+    # Multi-source BFS along outgoing relations from every capability: each element joins the domain
+    # of the nearest capability. Elements no capability reaches are grouped by element type.
+    ids = set(ids)
+    domain = {}
+    frontier = []
+    for cap in model.of_type('capability'):
+        domain[cap.id] = cap.label
+        frontier.append(cap.id)
+    while frontier:
+        next_frontier = []
+        for id in frontier:
+            for rel in model.outgoing(id):
+                if rel.target not in domain and rel.type != 'replaces':
+                    domain[rel.target] = domain[id]
+                    next_frontier.append(rel.target)
+        frontier = next_frontier
+    result = {}
+    for id in ids:
+        element = model.get(id)
+        if element is not None:
+            result[id] = domain.get(id) or f'Other {element.type.replace("_", " ")}'
+    return result
+
+
+def partition_view(dot, model=None, max_nodes=None, name=None):
+    # Returns [(name, graph)]: the whole view when it is small enough, else an overview followed by
+    # one subview per domain (domains larger than max_nodes are cut into numbered parts).
+    model = MODEL if model is None else model
+    max_nodes = max_nodes or LARGE_VIEW_NODES
+    name = name or dot.name
+    ids = dot.node_ids()
+    if len(ids) <= max_nodes:
+        return [(name, dot)]
+    assignment = capability_domains(model, ids)  # ids outside the model (legends) go to every subview
+    members = {}
+    for id in ids:
+        if id in assignment:
+            members.setdefault(assignment[id], []).append(id)
+    groups = {}
+    for domain, domain_ids in members.items():
+        if len(domain_ids) <= max_nodes:
+            groups[domain] = domain_ids
+        else:
+            for part, start in enumerate(range(0, len(domain_ids), max_nodes), 1):
+                groups[f'{domain} ({part})'] = domain_ids[start:start + max_nodes]
+    group_of = {id: group for group, group_ids in groups.items() for id in group_ids}
+
+    subviews = []
+    for group, group_ids in groups.items():
+        keep_ids = set(group_ids)
+        sub = dot.filtered(lambda id: id in keep_ids or id not in group_of, name=f'{dot.name}: {group}',
+                           drop_graph_attrs=_PAGE_ATTRS)
+        sub.attr(label=f'{dot.name}: {group}')
+        subviews.append((f'{name}/{_slug(group)}', sub))
+
+    overview = BulkDigraph(f'{dot.name}Overview', dot.format)
+    overview.attr(rankdir='LR', fontsize='12')
+    overview.attr(label=f'<<B>{dot.name}: overview of {len(groups)} subviews</B>>', labelloc='t', fontsize='14')
+    overview.nodes([_slug(g) for g in groups], [f'{g}\n{len(i)} elements' for g, i in groups.items()],
+                   shape='folder', style='filled', fillcolor='#e3f2fd', fontsize='10')
+    links = {}
+    for tail, head in dot.edge_pairs():
+        a, b = group_of.get(tail), group_of.get(head)
+        if a is not None and b is not None and a != b:
+            links[a, b] = links.get((a, b), 0) + 1
+    overview.edges([_slug(a) for a, _ in links], [_slug(b) for _, b in links],
+                   [f'{n} links' for n in links.values()], color='gray40')
+    return [(f'{name}/overview', overview)] + subviews
+
+
+def _slug(text):
+    return re.sub(r'[^A-Za-z0-9]+', '_', text).strip('_') or 'part'
+
+
+def render_partitioned(view, model=None, format='png', max_nodes=None, timeout=SUBVIEW_TIMEOUT, jobs=None,
+                       out_dir=None):
+    return render_all([view], [format], jobs=jobs, out_dir=out_dir, model=model, partition=True,
+                      max_nodes=max_nodes, timeout=timeout)
+
+
+# --- Layout reuse ---
+# Layout is the expensive part of a render; drawing is cheap. compute_layout() runs the engine once with
+# -Tjson0 on the view stripped of style-only attributes, so the cached positions are keyed by topology and
+# survive colour changes. apply_layout() pins those positions onto the styled graph and hands it to
+# `neato -n2`, which only draws. Theme iteration and PNG/SVG/PDF export then skip the layout step.
+LAYOUT_STYLE_ATTRS = frozenset((
+    'color', 'fillcolor', 'fontcolor', 'bgcolor', 'pencolor', 'penwidth', 'style', 'gradientangle',
+    'colorscheme', 'labelfontcolor', 'tooltip', 'URL', 'href', 'target', 'class', 'id', 'comment',
+))
+PINNED_ENGINE = 'neato'
+_POSITION_ATTRS = ('pos', 'lp', 'xlp', 'head_lp', 'tail_lp')
+_layout_locks = {}
+_layout_locks_guard = threading.Lock()
+
+
+def layout_source(dot):
+    return dot.filtered(drop_attrs=LAYOUT_STYLE_ATTRS).source
+
+
+def compute_layout(dot, cache=None, timeout=None):
+    # Parsed json0 layout of dot; concurrent calls for the same topology wait for one engine run.
+    layout = dot.filtered(drop_attrs=LAYOUT_STYLE_ATTRS)
+    key = hashlib.sha256(f'{dot.engine}\0{layout.source}'.encode()).hexdigest()
+    with _layout_locks_guard:
+        lock = _layout_locks.setdefault(key, threading.Lock())
+    with lock:
+        data = render_dot(layout, format='json0', cache=cache, timeout=timeout)
+    return json.loads(data)
+
+
+def apply_layout(dot, layout):
+    # Copy of dot with every node, edge and cluster pinned to the positions in a json0 layout.
+    # objects holds subgraphs and nodes in one _gvid numbering; only clusters have a bb, and a plain
+    # subgraph has neither bb nor pos, so nodes are the objects with a pos and no members.
+    nodes, clusters = {}, {}
+    for obj in layout.get('objects', ()):
+        if 'bb' in obj:
+            clusters[obj['name']] = {k: obj[k] for k in ('bb', 'lp') if k in obj}
+        elif 'pos' in obj and 'nodes' not in obj and 'subgraphs' not in obj:
+            nodes[obj['_gvid']] = obj
+    edges = {}
+    for edge in layout.get('edges', ()):
+        pair = (nodes[edge['tail']]['name'], nodes[edge['head']]['name'])
+        edges.setdefault(pair, []).append({k: edge[k] for k in _POSITION_ATTRS if k in edge})
+    by_name = {obj['name']: {k: obj[k] for k in ('pos', 'width', 'height', 'xlp') if k in obj}
+               for obj in nodes.values()}
+
+    def node_attrs(name):
+        return by_name.get(name, {})
+
+    def edge_attrs(tail, head):
+        pending = edges.get((tail, head))
+        return pending.pop(0) if pending else {}
+
+    def cluster_attrs(name):
+        return clusters.get(name, {})
+
+    pinned = dot.filtered(drop_graph_attrs=('ratio',), node_attrs=node_attrs, edge_attrs=edge_attrs,
+                          cluster_attrs=cluster_attrs)
+    pinned.attr(**{k: layout[k] for k in ('bb', 'lp') if k in layout})
+    declared = set(dot.node_ids())
+    for name, attrs in by_name.items():
+        if name not in declared:  # only ever mentioned in an edge
+            pinned.node(name, **attrs)
+    pinned.engine = PINNED_ENGINE
+    pinned.neato_no_op = 2
+    return pinned
+
+
+def render_with_layout(dot, format='png', cache=None, timeout=None, dpi=None):
+    return render_dot(apply_layout(dot, compute_layout(dot, cache, timeout)), format, cache, timeout, dpi)
+
+
+def export_view(dot, formats=('png', 'svg', 'pdf'), path=None, cache=None, timeout=None):
+    # One layout, several output formats; returns {format: bytes} and writes path.<format> when given.
+    pinned = apply_layout(dot, compute_layout(dot, cache, timeout))
+    outputs = {}
+    for fmt in formats:
+        outputs[fmt] = render_dot(pinned, fmt, cache, timeout)
+        if path:
+            with open(f'{path}.{fmt}', 'wb') as f:
+                f.write(outputs[fmt])
+    return outputs
+
+
+# --- Incremental rendering ---
+# Each view is built under model.track(), so we know exactly which elements, types and adjacency lists
+# it read. Model edits (or a reloaded model file) invalidate only the views whose reads they touch.
+class IncrementalRenderer:
+    def __init__(self, model=None, views=None, format=None, out_dir=None):
+        self.views = list(VIEWS) if views is None else list(views)
+        self.format = format or OUTPUT_FORMAT
+        self.out_dir = out_dir
+        self.results = {}
+        self.dirty = set(self.views)
+        self._reads = {}     # view -> tokens it read on its last build
+        self._watchers = {}  # token -> views that read it
+        self.model = None
+        self.set_model(MODEL if model is None else model)
+
+    def set_model(self, model):
+        if self.model is not None:
+            self.model.unsubscribe(self.invalidate)
+            self.invalidate(changed_tokens(self.model, model))
+        self.model = model
+        model.subscribe(self.invalidate)
+
+    def invalidate(self, tokens):
+        for token in tokens:
+            self.dirty.update(self._watchers.get(token, ()))
+
+    def render(self, force=False):
+        # Re-render dirty views (all views with force=True); returns the names that were rendered
+        todo = [view for view in self.views if force or view in self.dirty]
+        for view in todo:
+            for token in self._reads.pop(view, ()):
+                self._watchers[token].discard(view)
+            start = time.perf_counter()
+            with self.model.track() as reads:
+                try:
+                    dot, error = VIEWS[view](self.model), None
+                except Exception as exc:
+                    dot, error = None, exc
+            result = RenderResult(view, self.format, error=error, build_seconds=time.perf_counter() - start)
+            if dot is not None:
+                _render_job(dot, result, self.out_dir)
+            self.results[view] = result
+            self._reads[view] = reads
+            for token in reads:
+                self._watchers.setdefault(token, set()).add(view)
+            self.dirty.discard(view)
+        return todo
+
+
+def watch(path, views=None, format=None, out_dir='.', debounce=0.5, interval=0.25, on_render=None):
+    # Poll the model file and re-render dirty views once it has been quiet for `debounce` seconds.
+    # Runs until interrupted; on_render(names, renderer) is called after every pass.
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    renderer = IncrementalRenderer(load_model(path), views, format, out_dir)
+    on_render = on_render or (lambda names, _: print(f'rendered: {", ".join(names) or "nothing"}'))
+    on_render(renderer.render(), renderer)
+    last_seen = os.stat(path).st_mtime_ns
+    changed_at = None
+    try:
+        while True:
+            time.sleep(interval)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue  # editors often replace the file; pick it up on the next poll
+            if mtime != last_seen:
+                last_seen, changed_at = mtime, time.monotonic()
+            if changed_at is None or time.monotonic() - changed_at < debounce:
+                continue
+            changed_at = None
+            try:
+                renderer.set_model(load_model(path))
+            except (OSError, ValueError, KeyError) as exc:
+                print(f'could not load {path}: {exc}')
+                continue
+            on_render(renderer.render(), renderer)
+    except KeyboardInterrupt:
+        pass
+    return renderer
+
+
+# --- Render server ---
+# A local HTTP server for the diagrams: GET /views/<name>.<format> for any VIEWS or FIGURES name, with
+# optional ?layer=, ?state= and ?type= filters (comma-separated; shared elements and legends always stay)
+# and ?dpi= for raster formats. Responses carry a strong ETag hashed from the model's content, this
+# module's source (which holds every style) and the request, so a client revalidating with
+# If-None-Match gets 304 Not Modified without anything being built. Concurrent identical requests share
+# one render; renders run on a bounded worker pool and requests beyond SERVER_MAX_PENDING get 503.
+# Only the standard library and the local Graphviz binary are used.
+SERVER_PORT = int(os.environ.get('LEANIX_SERVER_PORT', '8765'))
+SERVER_MAX_PENDING = int(os.environ.get('LEANIX_SERVER_MAX_PENDING', '64'))
+SERVER_CACHE_ITEMS = int(os.environ.get('LEANIX_SERVER_CACHE_ITEMS', '256'))
+SERVER_CONTENT_TYPES = {
+    'svg': 'image/svg+xml', 'svgz': 'image/svg+xml', 'png': 'image/png', 'pdf': 'application/pdf',
+    'jpg': 'image/jpeg', 'json': 'application/json',
+}
+SERVER_FILTERS = ('layer', 'state', 'type')
+_figure_lock = threading.Lock()  # pyplot keeps global state
+
+
+class RenderServer:
+    def __init__(self, model=None, host='127.0.0.1', port=SERVER_PORT, jobs=None, timeout=None,
+                 max_pending=SERVER_MAX_PENDING, verbose=False):
+        from concurrent.futures import ThreadPoolExecutor
+        from http.server import ThreadingHTTPServer
+
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.verbose = verbose
+        self.responses = RenderCache(directory=None, max_items=SERVER_CACHE_ITEMS)  # ETag -> body
+        self.counts = {'requests': 0, 'not_modified': 0, 'cached': 0, 'coalesced': 0, 'renders': 0,
+                       'rejected': 0, 'errors': 0}
+        self._lock = threading.Lock()
+        self._inflight = {}  # ETag -> Future of the render
+        self._pool = ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1)
+        with open(__file__, 'rb') as f:
+            self._code_digest = hashlib.sha256(f.read()).hexdigest()
+        self.model = self._model_digest = None
+        self.set_model(MODEL if model is None else model)
+        self.httpd = ThreadingHTTPServer((host, port), _render_handler(self))
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def set_model(self, model):
+        with self._lock:
+            if self.model is not None:
+                self.model.unsubscribe(self._on_change)
+            self.model, self._model_digest = model, None
+            model.subscribe(self._on_change)
+
+    def _on_change(self, tokens):
+        self._model_digest = None
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def start(self):
+        # Serve from a background thread (notebooks, tests, the load test)
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        if self._thread is not None:
+            self.httpd.shutdown()
+        self.httpd.server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.model.unsubscribe(self._on_change)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counts, inflight=len(self._inflight), cache=self.responses.stats())
+
+    def model_digest(self):
+        # Content hash of the model, recomputed after an edit on the next request that needs it
+        digest = self._model_digest
+        if digest is None:
+            model = self.model
+            h = hashlib.sha256()
+            for e in model.elements.values():
+                h.update(f'{e.id}\0{e.type}\0{e.label}\0{e.layer}\0{e.state}\0{_props_key(e.props)}\n'.encode())
+            for r in model.relations:
+                h.update(f'{r.source}\0{r.target}\0{r.type}\0{r.label}\0{_props_key(r.props)}\n'.encode())
+            digest = self._model_digest = h.hexdigest()
+        return digest
+
+    def etag(self, name, format, params):
+        key = '\0'.join([self.model_digest(), self._code_digest, name, format,
+                         *(f'{k}={v}' for k, v in sorted(params.items()))])
+        return '"' + hashlib.sha256(key.encode()).hexdigest()[:40] + '"'
+
+    def get(self, path, if_none_match=None):
+        # One request: returns (status, headers, body). Separate from the HTTP handler so it can be
+        # called directly.
+        from urllib.parse import parse_qsl, urlsplit
+
+        url = urlsplit(path)
+        with self._lock:
+            self.counts['requests'] += 1
+        if url.path in ('/', '/views', '/views/'):
+            return _json_response({name: [f'/views/{name}.{fmt}' for fmt in ('svg', 'png')]
+                                   for name in [*VIEWS, *FIGURES]})
+        if url.path == '/stats':
+            return _json_response(self.stats())
+        match = re.fullmatch(r'/views/([\w-]+)\.(\w+)', url.path)
+        if not match or match.group(1) not in VIEWS and match.group(1) not in FIGURES:
+            return _text_response(404, f'no such view: {url.path}')
+        name, format = match.groups()
+        if format not in SERVER_CONTENT_TYPES:
+            return _text_response(400, f'unsupported format {format!r}; use one of {", ".join(SERVER_CONTENT_TYPES)}')
+        params = dict(parse_qsl(url.query))
+        unknown = [k for k in params if k not in SERVER_FILTERS + ('dpi',)]
+        if unknown:
+            return _text_response(400, f'unknown parameter(s): {", ".join(unknown)}')
+        if name in FIGURES and any(k in params for k in SERVER_FILTERS):
+            return _text_response(400, f'{name} is a chart and takes no filters')
+        if 'dpi' in params and not params['dpi'].isdigit():
+            return _text_response(400, 'dpi must be a whole number')
+
+        etag = self.etag(name, format, params)
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(',')] + ['*']:
+            with self._lock:
+                self.counts['not_modified'] += 1
+            return 304, headers, b''
+        try:
+            body = self._body(etag, name, format, params)
+        except _ServerBusy:
+            return _text_response(503, 'render queue full, retry shortly', {'Retry-After': '1'})
+        except LayoutTimeout as exc:
+            return _text_response(504, str(exc))
+        except ValidationError as exc:
+            return _text_response(422, str(exc))
+        except Exception as exc:
+            with self._lock:
+                self.counts['errors'] += 1
+            return _text_response(500, f'{type(exc).__name__}: {exc}')
+        headers['Content-Type'] = SERVER_CONTENT_TYPES[format]
+        if format == 'svgz':
+            headers['Content-Encoding'] = 'gzip'
+        return 200, headers, body
+
+    def _body(self, etag, name, format, params):
+        body = self.responses.get(etag)
+        if body is not None:
+            with self._lock:
+                self.counts['cached'] += 1
+            return body
+        with self._lock:
+            future, owner = self._inflight.get(etag), False
+            if future is not None:
+                self.counts['coalesced'] += 1
+            elif len(self._inflight) >= self.max_pending:
+                self.counts['rejected'] += 1
+                raise _ServerBusy()
+            else:
+                future = self._inflight[etag] = self._pool.submit(self._render, name, format, params, self.model)
+                self.counts['renders'] += 1
+                owner = True
+        if owner:
+            # Outside the lock: a render that already finished runs the callback right here
+            future.add_done_callback(lambda done: self._finished(etag, done))
+        return future.result()
+
+    def _finished(self, etag, future):
+        if not future.cancelled() and future.exception() is None:
+            self.responses.put(etag, future.result())
+        with self._lock:
+            self._inflight.pop(etag, None)
+
+    def _render(self, name, format, params, model):
+        dpi = int(params['dpi']) if 'dpi' in params else None
+        if name in FIGURES:
+            import io
+
+            import matplotlib.pyplot as plt
+
+            buffer = io.BytesIO()
+            with _figure_lock:
+                fig = FIGURES[name]()
+                try:
+                    fig.savefig(buffer, format='svg' if format == 'svgz' else format, dpi=dpi or 'figure')
+                finally:
+                    plt.close(fig)
+            return _gzip(buffer.getvalue()) if format == 'svgz' else buffer.getvalue()
+        dot = VIEWS[name](model)
+        filters = {k: set(params[k].split(',')) for k in SERVER_FILTERS if k in params}
+        if filters:
+            elements = model.elements
+
+            def keep(id):
+                e = elements.get(id)
+                return e is None or all(getattr(e, k) is None or getattr(e, k) in v for k, v in filters.items())
+
+            dot = dot.filtered(keep)
+        return render_dot(auto_engine(dot), format, timeout=self.timeout, dpi=dpi)
+
+
+class _ServerBusy(Exception):
+    pass
+
+
+def _json_response(data):
+    return 200, {'Content-Type': 'application/json'}, json.dumps(data, indent=1).encode()
+
+
+def _text_response(status, text, headers=None):
+    return status, {'Content-Type': 'text/plain; charset=utf-8', **(headers or {})}, text.encode() + b'\n'
+
+
+def _render_handler(server):
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive; every response has a Content-Length
+        disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+        def do_GET(self):
+            self._reply(server.get(self.path, self.headers.get('If-None-Match')))
+
+        def do_HEAD(self):
+            self._reply(server.get(self.path, self.headers.get('If-None-Match')), body=False)
+
+        def _reply(self, response, body=True):
+            status, headers, data = response
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            if body and data:
+                self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            if server.verbose:
+                super().log_message(format, *args)
+
+    return Handler
+
+
+def serve(model=None, host='127.0.0.1', port=SERVER_PORT, jobs=None, timeout=None, verbose=True):
+    # Blocking; Ctrl-C stops it
+    with RenderServer(model, host, port, jobs, timeout, verbose=verbose) as server:
+        print(f'serving {", ".join([*VIEWS, *FIGURES])} at {server.url}/views/<name>.<format>')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+# --- Command line ---
+# python -m leanix render --views app_arch,roadmap_plot --format svg,png --out diagrams --jobs 4
+# python -m leanix serve --port 8765 --model landscape.lxs
+# Headless: matplotlib runs on Agg, nothing is displayed and no viewer is opened. Outputs whose source
+# hash is unchanged since the last run are skipped (--force re-renders). Exits 1 if anything failed.
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='python -m leanix', description='Export LeanIX architecture diagrams')
+    commands = parser.add_subparsers(dest='command', required=True)
+    render = commands.add_parser('render', help='render views to files')
+    render.add_argument('--views', default='all',
+                        help=f'comma-separated names from {", ".join([*VIEWS, *FIGURES])} (default: all)')
+    render.add_argument('--format', default=OUTPUT_FORMAT, help='comma-separated output formats, e.g. svg,png')
+    render.add_argument('--out', default='diagrams', help='output directory')
+    render.add_argument('--jobs', type=int, default=None, help='parallel Graphviz processes (default: CPUs)')
+    render.add_argument('--model', help='model from save_model() or save_snapshot() (default: the example model)')
+    render.add_argument('--dpi', type=int, default=OUTPUT_DPI, help='resolution of raster formats')
+    render.add_argument('--timeout', type=float, default=None, help='bound on each Graphviz run, in seconds')
+    render.add_argument('--partition', action='store_true', help='split large views by capability domain')
+    render.add_argument('--force', action='store_true', help='re-render outputs that are up to date')
+    server = commands.add_parser('serve', help='serve views over HTTP at /views/<name>.<format>')
+    server.add_argument('--host', default='127.0.0.1')
+    server.add_argument('--port', type=int, default=SERVER_PORT)
+    server.add_argument('--model', help='model from save_model() or save_snapshot() (default: the example model)')
+    server.add_argument('--jobs', type=int, default=None, help='concurrent renders (default: CPUs)')
+    server.add_argument('--timeout', type=float, default=None, help='bound on each Graphviz run, in seconds')
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        import matplotlib
+
+        matplotlib.use('Agg')
+        serve(load_model(args.model) if args.model else None, args.host, args.port, args.jobs, args.timeout)
+        return 0
 
-    plt.tight_layout()
-    plt.show()
+    names = [*VIEWS, *FIGURES] if args.views == 'all' else [v.strip() for v in args.views.split(',') if v.strip()]
+    unknown = [name for name in names if name not in VIEWS and name not in FIGURES]
+    if unknown:
+        parser.error(f'unknown view(s): {", ".join(unknown)}')
+    formats = [f.strip() for f in args.format.split(',') if f.strip()]
 
+    set_display(lambda data, format: None)
+    results = []
+    views = [name for name in names if name in VIEWS]
+    if views:
+        results += render_all(views, formats, jobs=args.jobs, out_dir=args.out,
+                              model=load_model(args.model) if args.model else None, partition=args.partition,
+                              timeout=args.timeout, dpi=args.dpi, skip_unchanged=not args.force)
+    figures = [name for name in names if name in FIGURES]
+    if figures:
+        import matplotlib
 
+        matplotlib.use('Agg')
+        results += export_figures(figures, formats, args.out, dpi=args.dpi, skip_unchanged=not args.force)
 
+    for r in results:
+        status = 'FAILED' if not r.ok else 'skipped' if r.skipped else 'ok'
+        detail = f'  {type(r.error).__name__}: {r.error}' if not r.ok else ''
+        print(f'{status:>7}  {r.path or f"{r.view}.{r.format}"}  {r.seconds:.2f}s{detail}')
+    failed = sum(not r.ok for r in results)
+    skipped = sum(r.skipped for r in results)
+    print(f'{len(results) - failed - skipped} rendered, {skipped} up to date, {failed} failed')
+    return 1 if failed else 0
 
 
+if __name__ == '__main__':
+    sys.exit(main())
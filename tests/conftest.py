@@ -0,0 +1,79 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Stand-in for the Graphviz engines: reads the DOT text, logs the call, and writes a small output that
+# depends on the input. svg output carries an <image> per image= attribute, like the real thing.
+FAKE_ENGINE = r'''#!{python}
+import hashlib, os, re, sys, time
+source = sys.stdin.buffer.read()
+args = sys.argv[1:]
+with open(os.environ['FAKE_GRAPHVIZ_LOG'], 'a') as log:
+    log.write(f"{{os.path.basename(sys.argv[0])}} {{' '.join(args)}} {{os.getpid()}}\n")
+time.sleep(float(os.environ.get('FAKE_GRAPHVIZ_SLEEP', '0')))
+fail = os.environ.get('FAKE_GRAPHVIZ_FAIL')
+if fail and fail.encode() in source:
+    sys.stderr.write('syntax error in line 1\n')
+    sys.exit(1)
+fmt = next(a[2:] for a in args if a.startswith('-T')).split(':')[0]
+digest = hashlib.sha256(source).hexdigest()
+if fmt == 'json0':
+    out = b'{{"objects": [], "edges": []}}'
+elif fmt == 'svg':
+    images = ''.join(f'<image xlink:href="{{m.group(1) or m.group(2)}}" width="10" height="10"/>'
+                     for m in re.finditer(r'image="([^"]*)"|image=([^\s,\]]+)', source.decode()))
+    out = (f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">'
+           f'<!-- {{digest}} -->{{images}}</svg>\n').encode()
+else:
+    out = b'\x89FAKE-' + fmt.encode() + b'\n' + digest.encode()
+sys.stdout.buffer.write(out)
+'''
+
+
+class FakeGraphviz:
+    def __init__(self, directory, monkeypatch):
+        self.directory = directory
+        self.log = directory / 'calls.log'
+        self.log.write_text('')
+        script = FAKE_ENGINE.format(python=sys.executable)
+        for engine in ('dot', 'neato', 'sfdp', 'fdp'):
+            path = directory / engine
+            path.write_text(script)
+            path.chmod(0o755)
+        monkeypatch.setenv('PATH', f'{directory}{os.pathsep}{os.environ.get("PATH", "")}')
+        monkeypatch.setenv('FAKE_GRAPHVIZ_LOG', str(self.log))
+        self._monkeypatch = monkeypatch
+
+    def calls(self):
+        # (engine, args, pid) per engine run so far
+        runs = []
+        for line in self.log.read_text().splitlines():
+            engine, rest = line.split(' ', 1)
+            args, pid = rest.rsplit(' ', 1)
+            runs.append((engine, args, int(pid)))
+        return runs
+
+    def sleep(self, seconds):
+        self._monkeypatch.setenv('FAKE_GRAPHVIZ_SLEEP', str(seconds))
+
+    def fail_on(self, text):
+        # Engine runs whose DOT source contains text exit 1
+        self._monkeypatch.setenv('FAKE_GRAPHVIZ_FAIL', text)
+
+
+@pytest.fixture
+def fake_graphviz(tmp_path_factory, monkeypatch):
+    return FakeGraphviz(tmp_path_factory.mktemp('graphviz'), monkeypatch)
+
+
+@pytest.fixture
+def render_cache(tmp_path, monkeypatch):
+    # A private render cache (memory + disk in tmp_path) for the code paths that use RENDER_CACHE
+    import leanix
+
+    cache = leanix.RenderCache(str(tmp_path / 'cache'))
+    monkeypatch.setattr(leanix, 'RENDER_CACHE', cache)
+    return cache
@@ -0,0 +1,68 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+import leanix
+
+VIEWS = ['biz_arch', 'app_arch', 'technology_arch', 'roadmap']
+
+
+def alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def test_timeout_kills_the_engine(fake_graphviz, render_cache):
+    fake_graphviz.sleep(30)
+    start = time.perf_counter()
+    with pytest.raises(leanix.LayoutTimeout):
+        asyncio.run(leanix.render_dot_async(leanix.build_app_arch(), 'svg', timeout=0.5))
+    assert time.perf_counter() - start < 10
+    [(engine, args, pid)] = fake_graphviz.calls()
+    assert (engine, args) == ('dot', '-Tsvg') and not alive(pid)
+    assert render_cache.stats()['memory_items'] == 0
+
+
+def test_cancellation_kills_the_engine(fake_graphviz, render_cache):
+    fake_graphviz.sleep(30)
+
+    async def cancel():
+        task = asyncio.ensure_future(leanix.render_dot_async(leanix.build_app_arch(), 'svg'))
+        while not fake_graphviz.calls():
+            await asyncio.sleep(0.02)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel())
+    [(_, _, pid)] = fake_graphviz.calls()
+    assert not alive(pid)
+
+
+def test_fan_out_runs_concurrently_within_the_limit(fake_graphviz, render_cache, monkeypatch):
+    fake_graphviz.sleep(1)
+    monkeypatch.setattr(leanix, 'ASYNC_RENDER_JOBS', len(VIEWS))
+    start = time.perf_counter()
+    results = asyncio.run(leanix.render_all_async(VIEWS, 'svg'))
+    assert time.perf_counter() - start < len(VIEWS) * 0.75  # one at a time would take len(VIEWS) seconds
+    assert list(results) == [(view, 'svg') for view in VIEWS]
+    assert all(data.startswith(b'<svg') for data in results.values())
+    assert len({data for data in results.values()}) == len(VIEWS)
+
+    render_cache.clear(disk=True)
+    monkeypatch.setattr(leanix, 'ASYNC_RENDER_JOBS', 1)
+    start = time.perf_counter()
+    asyncio.run(leanix.render_all_async(VIEWS, 'svg'))
+    assert time.perf_counter() - start >= len(VIEWS)
+
+
+def test_failures_are_returned_per_job(fake_graphviz, render_cache):
+    fake_graphviz.fail_on('Roadmap')
+    results = asyncio.run(leanix.render_all_async(['app_arch', 'roadmap'], ['svg', 'png']))
+    assert [type(r).__name__ for r in results.values()] == ['bytes', 'bytes', 'RuntimeError', 'RuntimeError']
+    assert 'syntax error in line 1' in str(results['roadmap', 'svg'])
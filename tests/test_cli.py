@@ -0,0 +1,70 @@
+import pytest
+
+import leanix
+
+
+@pytest.fixture
+def run(fake_graphviz, render_cache, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(leanix, '_display_hook', None)  # main() installs a no-op hook
+
+    def run(*args):
+        code = leanix.main(['render', '--out', str(tmp_path / 'out'), *args])
+        lines = capsys.readouterr().out.splitlines()
+        return code, [line.split()[:2] for line in lines[:-1]], lines[-1]
+    return run
+
+
+def test_views_and_formats(run, tmp_path):
+    code, lines, summary = run('--views', 'app_arch, roadmap,', '--format', 'svg,png')
+    out = tmp_path / 'out'
+    assert code == 0 and summary == '4 rendered, 0 up to date, 0 failed'
+    assert lines == [['ok', str(out / name)] for name in ('app_arch.svg', 'app_arch.png', 'roadmap.svg', 'roadmap.png')]
+    assert (out / 'app_arch.svg').read_bytes().startswith(b'<svg')
+    assert (out / 'roadmap.png').read_bytes().startswith(b'\x89FAKE-png')
+
+
+def test_failed_render_exits_1(run, fake_graphviz, tmp_path):
+    fake_graphviz.fail_on('Roadmap')
+    code, lines, summary = run('--views', 'app_arch,roadmap', '--format', 'svg')
+    assert code == 1 and summary == '1 rendered, 0 up to date, 1 failed'
+    assert [line[0] for line in lines] == ['ok', 'FAILED']
+    assert (tmp_path / 'out' / 'app_arch.svg').exists() and not (tmp_path / 'out' / 'roadmap.svg').exists()
+
+
+def test_unknown_view(run, capsys):
+    with pytest.raises(SystemExit) as exit:
+        leanix.main(['render', '--views', 'app_arch,nope'])
+    assert exit.value.code == 2
+    assert 'unknown view(s): nope' in capsys.readouterr().err
+
+
+def test_skips_unchanged_outputs(run, fake_graphviz, tmp_path):
+    model_path = str(tmp_path / 'model.json')
+    model = leanix.example_model()
+    leanix.save_model(model, model_path)
+    args = ('--views', 'app_arch,roadmap', '--format', 'svg', '--model', model_path)
+    assert run(*args)[2] == '2 rendered, 0 up to date, 0 failed'
+    assert (tmp_path / 'out' / leanix.OUTPUT_MANIFEST).exists()
+    engine_runs = len(fake_graphviz.calls())
+    code, lines, summary = run(*args)
+    assert code == 0 and summary == '0 rendered, 2 up to date, 0 failed'
+    assert [line[0] for line in lines] == ['skipped', 'skipped'] and len(fake_graphviz.calls()) == engine_runs
+
+    model.update('APP1', label='Order Portal')
+    leanix.save_model(model, model_path)
+    assert [line[0] for line in run(*args)[1]] == ['ok', 'skipped']
+    (tmp_path / 'out' / 'roadmap.svg').unlink()
+    assert [line[0] for line in run(*args)[1]] == ['skipped', 'ok']
+    assert run(*args, '--force')[2] == '2 rendered, 0 up to date, 0 failed'
+
+
+def test_matplotlib_figures(run, tmp_path):
+    pytest.importorskip('matplotlib')
+    pytest.importorskip('pandas')
+    code, lines, summary = run('--views', 'roadmap_plot,user_journey', '--format', 'png,svg')
+    out = tmp_path / 'out'
+    assert code == 0 and summary == '4 rendered, 0 up to date, 0 failed'
+    for name in ('roadmap_plot', 'user_journey'):
+        assert (out / f'{name}.png').read_bytes().startswith(b'\x89PNG')
+        assert b'<svg' in (out / f'{name}.svg').read_bytes()
+    assert run('--views', 'roadmap_plot,user_journey', '--format', 'png,svg')[2] == '0 rendered, 4 up to date, 0 failed'
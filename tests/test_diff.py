@@ -0,0 +1,41 @@
+import leanix
+
+
+def ids(elements):
+    return {e.id for e in elements}
+
+
+def test_snapshot_diff():
+    old, new = leanix.example_model(), leanix.example_model()
+    neighbours = {r.target for r in new.outgoing('APP3')} | {r.source for r in new.incoming('APP3')}
+    new.update('APP1', label='Order Portal 2')
+    new.remove('APP3')
+    new.add('APP9', 'application', 'New App', 'application', 'to-be')
+    new.relate('APP9', 'RT1', 'uses')
+    relabelled = new.outgoing('APP2')[0]
+    relabelled.label = 'renamed'
+
+    diff = leanix.diff_models(old, new)
+    assert ids(diff.added) == {'APP9'}
+    assert ids(diff.removed) == {'APP3'}
+    assert [(a.id, a.label, b.label) for a, b in diff.changed] == [('APP1', 'OrderPortalApp', 'Order Portal 2')]
+    assert set(diff.rewired) == (neighbours - {'APP3'}) | {'RT1'}
+    assert [(r.source, r.target, r.type) for r in diff.added_relations] == [('APP9', 'RT1', 'uses')]
+    assert {(r.source, r.target) for r in diff.removed_relations} == \
+           {(r.source, r.target) for r in old.relations if 'APP3' in (r.source, r.target)}
+    assert [(a.label, b.label) for a, b in diff.changed_relations] == [(old.outgoing('APP2')[0].label, 'renamed')]
+    assert diff.summary()['added'] == 1
+
+
+def test_identical_models():
+    diff = leanix.diff_models(leanix.example_model(), leanix.example_model())
+    assert diff.summary() == dict.fromkeys(diff.summary(), 0)
+    assert len(diff.matched) == len(leanix.MODEL)
+
+
+def test_as_is_vs_to_be_follows_declared_replacements():
+    diff = leanix.diff_states(leanix.example_model())
+    assert ('APP1', 'TOBE_APP1') in diff.replaced and ('INF3', 'AWS_DYNAMODB') in diff.replaced
+    replaced_old, replaced_new = {a for a, _ in diff.replaced}, {b for _, b in diff.replaced}
+    assert not replaced_old & ids(diff.removed) and not replaced_new & ids(diff.added)
+    assert all(e.state == 'to-be' for e in diff.added) and all(e.state == 'as-is' for e in diff.removed)
@@ -0,0 +1,65 @@
+import pytest
+
+import leanix
+
+graphviz = pytest.importorskip('graphviz')
+
+NODES = [
+    ('APP1', 'Order Portal', {'shape': 'component', 'style': 'filled', 'fillcolor': '#e1f5fe'}),
+    ('my node', 'label with "quotes" and \\ backslash', {'shape': 'box'}),
+    ('node', 'keyword id', {}),
+    ('HTML', '<<B>Bold</B><BR/>line>', {'shape': 'plaintext'}),
+    ('Ünïcode', 'Ünïcode label', {'fontsize': '9'}),
+    ('bare', None, {}),
+    ('-1.5', 'numeral id', {}),
+]
+EDGES = [('APP1', 'my node', 'uses DB', {'color': 'gray40'}), ('node', 'HTML', None, {}),
+         ('Ünïcode', 'bare', 'a -> b', {'style': 'dashed', 'fontsize': '8'}), ('APP1', 'APP1', None, {})]
+
+
+def build(dot):
+    dot.attr(rankdir='LR', fontsize='12', label='<<B>Title</B>>')
+    dot.attr('node', shape='box')
+    for name, label, attrs in NODES:
+        dot.node(name, label, **attrs)
+    with dot.subgraph(name='cluster_apps') as c:
+        c.attr(label='Applications', style='dashed')
+        c.node('inner', 'Inner', shape='box3d')
+        c.edge('inner', 'APP1', label='calls')
+    with dot.subgraph() as s:
+        s.attr(rank='same')
+        s.node('APP1')
+        s.node('bare')
+    for tail, head, label, attrs in EDGES:
+        dot.edge(tail, head, label, **attrs)
+    return dot.source
+
+
+def test_per_call_api_matches_graphviz():
+    expected = build(graphviz.Digraph('Views', format='png'))
+    assert build(leanix.BulkDigraph('Views', format='png')) == expected
+
+
+def test_table_api_matches_graphviz():
+    names, labels = [n for n, _, _ in NODES], [label for _, label, _ in NODES]
+    tails, heads, edge_labels = [e[0] for e in EDGES], [e[1] for e in EDGES], [e[2] for e in EDGES]
+    reference = graphviz.Digraph('Tables')
+    for name, label in zip(names, labels):
+        reference.node(name, label, shape='note', fontsize='9')
+    for tail, head, label in zip(tails, heads, edge_labels):
+        reference.edge(tail, head, label, color='gray40')
+    bulk = leanix.BulkDigraph('Tables')
+    bulk.nodes(names, labels, shape='note', fontsize='9')
+    bulk.edges(tails, heads, edge_labels, color='gray40')
+    assert bulk.source == reference.source
+
+
+def test_copy_and_filtered_leave_the_original_alone():
+    dot = leanix.BulkDigraph('Views')
+    source = build(dot)
+    copy = dot.copy()
+    assert copy.source == source
+    copy.attr(overlap='prism')
+    assert dot.source == source != copy.source
+    kept = dot.filtered(lambda id: id != 'bare')
+    assert 'bare' not in kept.node_ids() and 'bare' in dot.node_ids()
@@ -0,0 +1,60 @@
+import matplotlib
+import pytest
+
+matplotlib.use('Agg')
+
+import leanix  # noqa: E402
+
+pd = pytest.importorskip('pandas')
+
+
+@pytest.fixture
+def frame():
+    return leanix.roadmap_frame()
+
+
+def bars(fig):
+    # (x0, x1, row) of every bar, per colour; each bar is a closed 4-corner polygon in the compound path
+    from matplotlib.collections import PathCollection
+
+    out = {}
+    for collection in fig.axes[0].collections:
+        if isinstance(collection, PathCollection):
+            corners = collection.get_paths()[0].vertices.reshape(-1, 5, 2)[:, :4]
+            color = matplotlib.colors.to_hex(collection.get_facecolor()[0])
+            out[color] = sorted((c[:, 0].min(), c[:, 0].max(), round(c[:, 1].mean(), 6)) for c in corners)
+    return out
+
+
+def test_gantt_draws_one_bar_per_phase(frame):
+    import matplotlib.dates as mdates
+    import matplotlib.pyplot as plt
+
+    fig = leanix.plot_gantt(frame)
+    try:
+        drawn = bars(fig)
+        components = sorted(frame['Component'].astype(str).unique())
+        expected = {}
+        for row in frame.itertuples():
+            color = matplotlib.colors.to_hex(leanix.ROADMAP_COLORS.get(row.Type, '#CFD8DC'))
+            expected.setdefault(color, []).append((mdates.date2num(row.Start), mdates.date2num(row.End),
+                                                   float(components.index(row.Component))))
+        assert drawn == {color: sorted(rows) for color, rows in expected.items()}
+        assert [t.get_text() for t in fig.axes[0].get_yticklabels()] == components
+    finally:
+        plt.close(fig)
+
+
+def test_gantt_window_clips_bars(frame):
+    import matplotlib.dates as mdates
+    import matplotlib.pyplot as plt
+
+    lo, hi = frame['Start'].min() + pd.Timedelta(days=60), frame['Start'].min() + pd.Timedelta(days=120)
+    fig = leanix.plot_gantt(frame, window=(lo, hi))
+    try:
+        drawn = [bar for rows in bars(fig).values() for bar in rows]
+        overlapping = frame[(frame['End'] >= lo) & (frame['Start'] <= hi)]
+        assert len(drawn) == len(overlapping) > 0
+        assert all(mdates.date2num(lo) <= x0 <= x1 <= mdates.date2num(hi) for x0, x1, _ in drawn)
+    finally:
+        plt.close(fig)
@@ -0,0 +1,94 @@
+import base64
+import os
+import re
+import shutil
+
+import pytest
+
+import leanix
+
+
+def test_icons_resolve_outside_the_package_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    index = leanix.IconIndex()
+    assert os.path.isabs(index.root)
+    assert os.path.isfile(index.path('Lambda'))
+    assert index.lookup('sns').name.endswith('Simple-Notification-Service')
+
+
+def test_missing_icons_dir(tmp_path):
+    index = leanix.IconIndex(str(tmp_path / 'no-icons'))
+    with pytest.raises(FileNotFoundError, match='LEANIX_ICONS_DIR'):
+        index.lookup('Lambda')
+    assert not (tmp_path / 'no-icons').exists()
+
+
+ICONS = ('Lambda', 'DynamoDB', 'S3', 'SNS', 'API Gateway', 'Cognito', 'CloudWatch')
+
+
+@pytest.fixture
+def icon_tree(tmp_path, monkeypatch):
+    # A small copy of icons/ (the PNG sizes of the icons the example model uses) with its own manifest
+    # and icon store
+    root = tmp_path / 'icons'
+    for name in ICONS:
+        for size in (16, 32, 48, 64):
+            entry = leanix.ICON_INDEX.lookup(name, size)
+            (root / entry.path).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(os.path.join(leanix.ICON_INDEX.root, entry.path), root / entry.path)
+    index = leanix.IconIndex(str(root))
+    monkeypatch.setattr(leanix, 'ICON_INDEX', index)
+    monkeypatch.setattr(leanix, 'ICON_STORE_DIR', str(tmp_path / 'store'))
+    monkeypatch.setattr(leanix, '_prepared_icons', {})
+    monkeypatch.setattr(leanix, '_inlined_images', {})
+    return index
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    # image files Pillow decodes
+    Image = pytest.importorskip('PIL.Image')
+    files, open_image = [], Image.open
+    monkeypatch.setattr(Image, 'open', lambda fp, *args, **kwargs: files.append(fp) or open_image(fp, *args, **kwargs))
+    return files
+
+
+def test_icons_are_resized_once(icon_tree, opened, tmp_path, monkeypatch):
+    from PIL import Image
+
+    path = leanix.prepared_icon('Lambda', inches=0.5)
+    entry = icon_tree.lookup('Lambda', size=36)
+    assert path == str(tmp_path / 'store' / f'{entry.hash}-36.png')
+    assert (tmp_path / 'icons' / '.manifest.json').exists()
+    assert opened == [os.path.join(icon_tree.root, entry.path)]
+    assert leanix.prepared_icon('Lambda', inches=0.5) == path
+    assert leanix.prepared_icon(os.path.join(icon_tree.root, entry.path), inches=0.5) == path  # same content
+    monkeypatch.setattr(leanix, '_prepared_icons', {})  # a new session reuses the store
+    assert leanix.prepared_icon('Lambda', inches=0.5) == path
+    assert len(opened) == 1
+    assert leanix.prepared_icon('Lambda', inches=1) != path and len(opened) == 2
+    large = icon_tree.lookup('Lambda', size=72)  # resized from the nearest master size
+    assert large.size == 64
+    stored = {p.name for p in (tmp_path / 'store').iterdir()}
+    assert stored == {f'{entry.hash}-36.png', f'{large.hash}-72.png'}
+    with Image.open(path) as img:
+        assert img.size == (36, 36) and img.mode == 'RGBA'
+
+
+def test_svg_output_inlines_prepared_icons(icon_tree, opened, fake_graphviz, render_cache, tmp_path):
+    svg = leanix.render_dot(leanix.build_tobe_tech_arch(), 'svg')
+    store = str(tmp_path / 'store')
+    assert len(opened) == len(set(opened)) == len(os.listdir(store))  # one resize per icon, however often drawn
+    assert b'<image' in svg and store.encode() not in svg
+    uris = set(re.findall(rb'xlink:href="data:image/png;base64,([^"]+)"', svg))
+    stored = {base64.b64encode((tmp_path / 'store' / name).read_bytes()) for name in os.listdir(store)}
+    assert uris == stored
+
+
+def test_inline_svg_images():
+    icon = leanix.ICON_INDEX.path('Lambda', 16)
+    svg = f'<svg><image xlink:href="{icon}"/><image href="/no/such.png"/></svg>'.encode()
+    with open(icon, 'rb') as f:
+        payload = base64.b64encode(f.read())
+    assert leanix._inline_svg_images(svg) == (b'<svg><image xlink:href="data:image/png;base64,' + payload +
+                                              b'"/><image href="/no/such.png"/></svg>')
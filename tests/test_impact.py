@@ -0,0 +1,87 @@
+import pytest
+
+import leanix
+
+
+@pytest.fixture
+def model():
+    m = leanix.ArchitectureModel()
+    m.add('CAP', 'capability', 'Ordering', 'business')
+    for id in ('APP1', 'APP2', 'APP3'):
+        m.add(id, 'application', id.title(), 'application')
+    m.add('DB', 'infrastructure', 'Postgres', 'technology')
+    m.relate('CAP', 'APP1', 'serves')
+    m.relate('APP1', 'DB', 'uses')
+    m.relate('APP2', 'DB', 'uses')
+    m.relate('APP1', 'APP3', 'invokes')  # APP1 and APP3 depend on each other: one component
+    m.relate('APP3', 'APP1', 'invokes')
+    return m
+
+
+def fresh(model, *ids, **kwargs):
+    index = leanix.ImpactIndex(model)
+    try:
+        return index.impacted(*ids, **kwargs)
+    finally:
+        index.close()
+
+
+def test_transitive_impact_in_model_order(model):
+    assert leanix.impacted('DB', model=model) == ['CAP', 'APP1', 'APP2', 'APP3']
+    assert leanix.impacted('APP2', model=model) == []
+    assert leanix.impact_index(model) is leanix.impact_index(model)
+
+
+def test_cycle_members_impact_each_other(model):
+    index = leanix.ImpactIndex(model)
+    assert index.impacted('APP1') == ['CAP', 'APP3']
+    assert index.impacted('APP3') == ['CAP', 'APP1']
+    assert index.depends_on('APP1', 'APP3') and index.depends_on('APP3', 'APP1')
+    assert not index.depends_on('DB', 'APP1')
+
+
+def test_types_filter(model):
+    index = leanix.ImpactIndex(model)
+    assert index.impacted('DB', types='capability') == ['CAP']
+    assert index.impacted('DB', types=('capability', 'application')) == ['CAP', 'APP1', 'APP2', 'APP3']
+    assert index.count('DB', types='application') == 3
+    assert index.impacted('DB', types='infrastructure') == []
+
+
+def test_memoised_sets_follow_model_edits(model):
+    index = leanix.ImpactIndex(model)
+    assert index.impacted('DB') == ['CAP', 'APP1', 'APP2', 'APP3']  # memoise every component's set
+
+    model.add('APP4', 'application', 'App4', 'application')
+    model.relate('APP4', 'APP2', 'invokes')
+    assert index.impacted('DB') == fresh(model, 'DB') == ['CAP', 'APP1', 'APP2', 'APP3', 'APP4']
+
+    model.unrelate(next(r for r in model.outgoing('APP3') if r.target == 'APP1'))  # splits the cycle
+    assert index.impacted('APP1') == fresh(model, 'APP1') == ['CAP']
+    assert index.impacted('APP3') == fresh(model, 'APP3') == ['CAP', 'APP1']
+
+    model.relate('APP2', 'APP4', 'invokes')  # new cycle APP2 <-> APP4
+    assert index.impacted('APP4') == fresh(model, 'APP4') == ['APP2']
+
+    model.unrelate(next(r for r in model.outgoing('APP1') if r.target == 'DB'))
+    assert index.impacted('DB') == fresh(model, 'DB') == ['APP2', 'APP4']
+
+    model.remove('APP2')
+    assert index.impacted('DB') == fresh(model, 'DB') == []
+    assert index.impacted('APP4') == []
+
+
+def test_impact_view_is_an_instrumented_validated_view(model):
+    events = []
+    sink = leanix.add_sink(events.append)
+    try:
+        dot = leanix.build_impact_view(['DB'], model, types=('capability', 'application'))
+    finally:
+        leanix.remove_sink(sink)
+    assert dot.view == 'impact'
+    assert dot.node_ids() == ['CAP', 'APP1', 'APP2', 'APP3', 'DB']
+    assert [(e['phase'], e['view'], e['nodes']) for e in events] == [('build', 'impact', 5)]
+
+    model.relate('APP2', 'GONE', 'uses')  # checked against the model passed in, not MODEL
+    with pytest.raises(leanix.ValidationError, match='GONE'):
+        leanix.build_impact_view('DB', model)
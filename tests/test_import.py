@@ -0,0 +1,23 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('graphviz', 'IPython', 'matplotlib', 'pandas', 'numpy', 'PIL', 'openpyxl')
+
+
+def test_import_stays_light():
+    probe = (f'import sys, leanix; print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules)); '
+             f'print(len(leanix.MODEL), len(leanix.VIEWS))')
+    out = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    loaded, sizes = out.stdout.splitlines()
+    assert loaded == ''
+    assert all(int(n) > 0 for n in sizes.split())
+
+
+def test_views_build_without_heavy_imports():
+    probe = ('import sys, leanix\n'
+             'for build in leanix.VIEWS.values(): build().source\n'
+             'print(",".join(m for m in ("matplotlib", "pandas", "IPython") if m in sys.modules))')
+    out = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ''
@@ -0,0 +1,73 @@
+import threading
+import time
+
+import pytest
+
+import leanix
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    # views passed to render_dot, in order
+    views = []
+    monkeypatch.setattr(leanix, 'render_dot', lambda dot, **kwargs: views.append(dot.view) or b'out')
+    return views
+
+
+def test_edits_rerender_dependent_views_only(rendered):
+    model = leanix.example_model()
+    renderer = leanix.IncrementalRenderer(model)
+    assert renderer.render() == rendered == list(leanix.VIEWS)
+    rendered.clear()
+    model.update('APP1', label='Order Portal')
+    assert renderer.render() == rendered == ['app_arch', 'data_flow', 'technology_arch', 'sidebyside_view']
+    assert 'Order Portal' in leanix.build_app_arch(model).source
+    assert renderer.results['roadmap'].data == b'out'  # untouched: kept from the first pass
+    assert renderer.render() == [] and rendered == ['app_arch', 'data_flow', 'technology_arch', 'sidebyside_view']
+    assert renderer.render(force=True) == list(leanix.VIEWS)
+
+
+def test_reloaded_model_invalidates_by_content(rendered):
+    renderer = leanix.IncrementalRenderer(leanix.example_model())
+    renderer.render()
+    renderer.set_model(leanix.example_model())
+    assert renderer.render() == []  # same content
+    model = leanix.example_model()
+    model.update(model.of_type('task')[0].id, label='Kick-off')
+    renderer.set_model(model)
+    assert renderer.render() == ['sidebyside_view', 'roadmap']  # the diff reads every element
+
+
+def test_watch_debounces_a_burst_of_saves(rendered, tmp_path):
+    path = str(tmp_path / 'model.json')
+    model = leanix.example_model()
+    leanix.save_model(model, path)
+    passes, stop = [], threading.Event()
+
+    def on_render(names, renderer):
+        passes.append(names)
+        if stop.is_set():
+            raise KeyboardInterrupt
+
+    thread = threading.Thread(target=leanix.watch, args=(path,), daemon=True,
+                              kwargs={'out_dir': str(tmp_path / 'out'), 'debounce': 0.4, 'interval': 0.02,
+                                      'on_render': on_render})
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not passes and time.monotonic() < deadline:
+        time.sleep(0.01)
+    for i in range(5):  # quieter than debounce between saves
+        model.update('APP1', label=f'Order Portal {i}')
+        leanix.save_model(model, path)
+        time.sleep(0.05)
+    while len(passes) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.6)
+    assert passes[1:] == [['app_arch', 'data_flow', 'technology_arch', 'sidebyside_view']]
+    assert (tmp_path / 'out' / 'app_arch.svg').read_bytes() == b'out'
+
+    stop.set()
+    model.update('APP1', label='Order Portal')
+    leanix.save_model(model, path)
+    thread.join(10)
+    assert not thread.is_alive() and len(passes) == 3
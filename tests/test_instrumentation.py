@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+import leanix
+
+
+def edges(dot):
+    return sum(1 for _ in dot.edge_pairs())
+
+
+@pytest.fixture
+def show(fake_graphviz, render_cache, monkeypatch):
+    shown = []
+    monkeypatch.setattr(leanix, '_display_hook', lambda data, format: shown.append(data))
+    monkeypatch.setattr(leanix, 'OUTPUT_FORMAT', 'svg')
+    monkeypatch.setattr(leanix, '_sinks', [])
+    return shown
+
+
+def test_json_lines_sink(show, tmp_path):
+    sink = leanix.add_sink(leanix.JsonLinesSink(str(tmp_path / 'render.log')))
+    leanix.show_app_arch()
+    leanix.show_app_arch()
+    leanix.remove_sink(sink)
+    sink.close()
+    leanix.show_app_arch()  # not recorded
+
+    events = [json.loads(line) for line in (tmp_path / 'render.log').read_text().splitlines()]
+    assert [(e['view'], e['phase'], e.get('cache')) for e in events] == [
+        ('app_arch', 'build', None), ('app_arch', 'render', 'miss'), ('app_arch', 'display', None),
+        ('app_arch', 'build', None), ('app_arch', 'render', 'hit'), ('app_arch', 'display', None)]
+    dot = leanix.build_app_arch()
+    build, render, display = events[:3]
+    assert (build['nodes'], build['edges'], build['dot_bytes']) == (len(dot.node_ids()), edges(dot), len(dot.source))
+    assert render['format'] == display['format'] == 'svg'
+    assert render['output_bytes'] == display['output_bytes'] == len(show[0])
+    assert all(e['seconds'] >= 0 and e['ts'] > 0 for e in events)
+
+
+def test_prometheus_sink(show):
+    pytest.importorskip('prometheus_client')
+    sink = leanix.add_sink(leanix.PrometheusSink())
+    leanix.show_app_arch()
+    leanix.show_app_arch()
+    text = sink.exposition().decode()
+    lines = set(text.splitlines())
+    dot = leanix.build_app_arch()
+    assert '# TYPE leanix_phase_seconds histogram' in lines
+    for phase in ('build', 'render', 'display'):
+        assert f'leanix_phase_seconds_count{{phase="{phase}",view="app_arch"}} 2.0' in lines
+    assert f'leanix_view_nodes{{view="app_arch"}} {float(len(dot.node_ids()))}' in lines
+    assert f'leanix_view_edges{{view="app_arch"}} {float(edges(dot))}' in lines
+    assert f'leanix_dot_bytes_sum{{view="app_arch"}} {float(4 * len(dot.source))}' in lines  # build + render
+    assert f'leanix_output_bytes_sum{{format="svg",view="app_arch"}} {float(4 * len(show[0]))}' in lines
+    assert 'leanix_render_cache_total{result="miss",view="app_arch"} 1.0' in lines
+    assert 'leanix_render_cache_total{result="hit",view="app_arch"} 1.0' in lines
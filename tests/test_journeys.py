@@ -0,0 +1,43 @@
+import io
+from pathlib import Path
+
+import pytest
+
+import leanix
+
+pytest.importorskip('matplotlib')
+
+
+def journeys(count):
+    # varying lengths, so a reused figure has to hide the artists of longer journeys
+    return [leanix.Journey(f'journey_{i}', leanix.JOURNEY_DATA[:2 + i % 4], title=f'Journey {i}') for i in range(count)]
+
+
+def png(renderer, journey):
+    out = io.BytesIO()
+    renderer.save(journey, out, 'png', dpi=40)
+    return out.getvalue()
+
+
+def test_reused_figure_gives_distinct_images():
+    renderer = leanix.JourneyRenderer()
+    long, short = leanix.Journey('long', leanix.JOURNEY_DATA), journeys(1)[0]
+    first, second = png(renderer, long), png(renderer, short)
+    assert first.startswith(b'\x89PNG') and second.startswith(b'\x89PNG')
+    assert first != second
+    assert sum(marker.get_visible() for marker in renderer.markers) == len(short.stages)
+    assert png(renderer, long) == first  # nothing of the short journey is left behind
+    assert png(leanix.JourneyRenderer(), long) == first
+
+
+def test_process_pool_matches_serial(tmp_path, monkeypatch):
+    monkeypatch.setattr(leanix, '_journey_renderer', None)
+    batch = journeys(6)
+    serial = leanix.export_journeys(batch, 'png', str(tmp_path / 'serial'), jobs=1, dpi=40)
+    pooled = leanix.export_journeys(batch, 'png', str(tmp_path / 'pool'), jobs=2, dpi=40)
+    assert all(r.ok for r in serial + pooled)
+    assert [(r.view, r.format) for r in pooled] == [(r.view, r.format) for r in serial] == [
+        (journey.name, 'png') for journey in batch]
+    images = [Path(r.path).read_bytes() for r in serial]
+    assert images == [Path(r.path).read_bytes() for r in pooled]
+    assert len(set(images)) == len(batch)
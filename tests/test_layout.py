@@ -0,0 +1,29 @@
+import leanix
+
+
+def test_apply_layout_skips_plain_subgraphs():
+    dot = leanix.BulkDigraph('G')
+    with dot.subgraph(name='same_rank') as s:
+        s.attr(rank='same')
+        s.node('a', 'A')
+    with dot.subgraph(name='cluster_apps') as c:
+        c.node('b', 'B')
+    dot.edge('a', 'b')
+    layout = {  # json0 as dot writes it: subgraphs first, then nodes, all numbered by _gvid
+        'bb': '0,0,100,100',
+        'objects': [
+            {'_gvid': 0, 'name': 'same_rank', 'rank': 'same', 'nodes': [2]},
+            {'_gvid': 1, 'name': 'cluster_apps', 'bb': '40,0,100,50', 'lp': '70,40', 'nodes': [3]},
+            {'_gvid': 2, 'name': 'a', 'pos': '20,80', 'width': '0.75', 'height': '0.5'},
+            {'_gvid': 3, 'name': 'b', 'pos': '70,20', 'width': '0.75', 'height': '0.5'},
+        ],
+        'edges': [{'_gvid': 0, 'tail': 2, 'head': 3, 'pos': 'e,70,38 20,62 20,50 70,50'}],
+    }
+    pinned = leanix.apply_layout(dot, layout)
+    assert pinned.node_ids() == ['a', 'b']  # the subgraph did not become a node
+    source = pinned.source
+    assert 'same_rank [' not in source
+    assert 'pos="20,80"' in source
+    assert 'pos="70,20"' in source and 'bb="40,0,100,50"' in source
+    assert 'pos="e,70,38 20,62 20,50 70,50"' in source
+    assert pinned.engine == leanix.PINNED_ENGINE and pinned.neato_no_op == 2
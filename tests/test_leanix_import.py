@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+import leanix
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+JSON, CSV, XLSX = (os.path.join(FIXTURES, name) for name in ('workspace.json', 'it_components.csv', 'processes.xlsx'))
+
+
+def edges(model):
+    return {(r.source, r.target, r.type) for r in model.relations}
+
+
+def test_json_relations_resolve_by_id_and_name():
+    importer = leanix.LeanIXImporter().load(JSON).load(CSV)
+    model = importer.finish()
+    assert ('bc-1', 'app-1', 'serves') in edges(model)  # reversed field
+    assert ('app-1', 'if-1', 'exposes') in edges(model)
+    assert ('if-1', 'app-2', 'invokes') in edges(model)  # consumer field, reversed
+    assert ('app-1', 'itc-1', 'uses') in edges(model)  # referenced by name
+    assert model['if-1'].props['kind'] == 'REST'
+    assert (model['app-1'].state, model['app-2'].state) == ('as-is', 'to-be')
+
+
+def test_user_groups_depend_on_applications():
+    model = leanix.import_leanix(JSON)
+    assert ('ug-1', 'app-1', 'serves') in edges(model)
+    assert ('app-1', 'ug-1', 'serves') not in edges(model)
+    assert leanix.impacted('app-1', model=model, types='actor') == ['ug-1']
+
+
+def test_dedup_across_files():
+    model = leanix.import_leanix(JSON, CSV, XLSX)
+    ids = [e.id for e in model.elements.values()]
+    assert len(ids) == len(set(ids))
+    assert model['app-1'].label == 'Order Portal'
+    # listed from both ends (provider -> interface and interface -> provider) but added once
+    assert [(r.target, r.type) for r in model.outgoing('app-1') if r.target == 'if-1'] == [('if-1', 'exposes')]
+    # relations of a fact sheet seen again in a later file are still imported
+    assert ('app-1', 'itc-2', 'uses') in edges(model)
+
+
+def test_skipped_and_unresolved():
+    importer = leanix.LeanIXImporter().load(JSON).load(CSV)
+    importer.finish()
+    assert importer.skipped == {'Provider': 1, 'TechnicalStack': 1, 'relApplicationToProject': 1}
+    assert importer.unresolved == 1  # relToSuccessor -> app-gone
+    assert 'prv-1' not in importer.model and 'tc-1' not in importer.model
+
+
+def test_excel_export():
+    pytest.importorskip('openpyxl')
+    model = leanix.import_leanix(JSON, XLSX)
+    assert model['proc-1'].layer == 'business'
+    assert ('bc-1', 'proc-1', 'realizes') in edges(model)  # resolved by name
+    assert ('prj-2', 'prj-1', 'precedes') in edges(model)
+    assert leanix.validate_model(model) == []
+
+
+def test_json_streams_across_chunk_boundaries(monkeypatch):
+    expected = list(leanix._json_fact_sheets(JSON))
+    for chunk in (7, 16, 61, 200):
+        monkeypatch.setattr(leanix, '_JSON_CHUNK', chunk)
+        assert list(leanix._json_fact_sheets(JSON)) == expected
+    assert [sheet['id'] for sheet in expected] == ['bc-1', 'app-1', 'app-2', 'if-1', 'ug-1', 'prv-1']
+
+
+def test_imported_elements_appear_in_layer_views():
+    # fact sheets without a lifecycle (interfaces, capabilities, user groups) belong to both states
+    model = leanix.import_leanix(JSON, CSV, XLSX)
+    assert model['if-1'].state is None and model['bc-1'].state is None
+    asis = leanix.build_app_arch(model).node_ids()
+    tobe = leanix.build_tobe_app_arch(model).node_ids()
+    assert {'bc-1', 'if-1', 'app-1'} <= set(asis) and 'app-2' not in asis
+    assert {'bc-1', 'if-1', 'app-2'} <= set(tobe) and 'app-1' not in tobe
+    assert 'bc-1' in leanix.build_biz_arch(model).node_ids()
+    assert {'ug-1', 'app-1'} <= set(leanix.build_data_flow(model).node_ids())
+    assert 'replaces' not in leanix.build_sidebyside_view(model).source
@@ -0,0 +1,39 @@
+import leanix
+
+
+def indexes(model):
+    return (list(model.relations),
+            {t: list(rs) for t, rs in model._by_relation_type.items() if rs},
+            {k: list(rs) for k, rs in model._out.items() if rs},
+            {k: list(rs) for k, rs in model._in.items() if rs})
+
+
+def test_remove_drops_incident_relations_from_every_index():
+    model = leanix.example_model()
+    hub = max(model.elements, key=lambda id: len(model.outgoing(id)) + len(model.incoming(id)))
+    loop = model.relate(hub, hub, 'composes')
+    incident = {r for r in model.relations if hub in (r.source, r.target)}
+    assert loop in incident and len(incident) > 2
+    kept = [r for r in model.relations if r not in incident]
+    relations, uses = model.relations, model._by_relation_type['uses']
+
+    events = []
+    model.subscribe(events.append)
+    model.remove(hub)
+
+    expected = leanix.ArchitectureModel()
+    expected._load(list(model.elements.values()), kept)
+    assert indexes(model) == indexes(expected)
+    assert model.relations is relations and model._by_relation_type['uses'] is uses  # updated in place
+    assert hub not in model and all(hub not in (r.source, r.target) for r in model.relations)
+    assert len(events) == 1 and ('element', hub) in events[0]
+    assert leanix.validate_model(model) == []
+
+
+def test_remove_isolated_element():
+    model = leanix.ArchitectureModel()
+    model.add('A', 'application', 'A', 'application')
+    model.add('B', 'application', 'B', 'application')
+    relation = model.relate('A', 'A', 'invokes')
+    model.remove('B')
+    assert model.relations == [relation] and model.outgoing('A') == [relation]
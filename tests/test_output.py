@@ -0,0 +1,51 @@
+import asyncio
+import gzip
+import io
+
+import leanix
+
+
+def graph():
+    dot = leanix.BulkDigraph('G')
+    dot.node('a', 'A')
+    dot.node('b', 'B')
+    dot.edge('a', 'b')
+    return dot
+
+
+def test_svgz_is_gzipped_svg(fake_graphviz, render_cache, tmp_path):
+    svg = leanix.render_dot(graph(), 'svg')
+    leanix.write_view(graph(), str(tmp_path / 'streamed.svgz'), 'svgz')
+    render_cache.clear(disk=True)
+    leanix.write_view(graph(), tmp_path / 'uncached.svgz', 'svgz')
+    data = (tmp_path / 'streamed.svgz').read_bytes()
+    assert data[:2] == b'\x1f\x8b' and gzip.decompress(data) == svg
+    assert (tmp_path / 'uncached.svgz').read_bytes() == data  # no timestamp in the gzip header
+    assert leanix.render_dot(graph(), 'svgz') == data
+
+
+def test_raster_dpi(fake_graphviz, render_cache, monkeypatch):
+    def written(format, dpi=None):
+        out = io.BytesIO()
+        leanix.write_view(graph(), out, format, dpi=dpi)
+        return out.getvalue()
+
+    assert written('png', 150) == leanix.render_dot(graph(), 'png', dpi=150)
+    assert written('png', 150) != written('png', 300)
+    monkeypatch.setattr(leanix, 'OUTPUT_DPI', 300)
+    assert written('png') == written('png', 300)  # OUTPUT_DPI by default
+    assert written('svg', 150) == written('svg', 300) == leanix.render_dot(graph(), 'svg')  # vector: no dpi
+    dot = graph()
+    leanix.write_view(dot, io.BytesIO(), 'png', dpi=150)
+    assert dot.source == graph().source  # dpi is set on a copy
+
+
+def test_defaults_follow_output_format(fake_graphviz, render_cache, tmp_path, monkeypatch):
+    monkeypatch.setattr(leanix, 'OUTPUT_FORMAT', 'svgz')
+    monkeypatch.chdir(tmp_path)
+    leanix.show_roadmap()
+    leanix.show_biz_arch(file=True)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['business_layer_with_legend.svgz', 'roadmap_diagram.svgz']
+    results = asyncio.run(leanix.render_all_async(['app_arch']))
+    assert list(results) == [('app_arch', 'svgz')]
+    assert leanix.IncrementalRenderer(views=['app_arch']).format == 'svgz'
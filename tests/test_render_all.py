@@ -0,0 +1,78 @@
+import json
+import time
+
+import leanix
+
+
+def test_timeout_fallback_renders_a_private_copy(tmp_path, monkeypatch):
+    rendered = []
+
+    def fake_render(dot, format='svg', timeout=None, dpi=None):
+        rendered.append((dot, dot.engine, dot.source))
+        if dot.engine != leanix.SCALABLE_ENGINE:
+            raise leanix.LayoutTimeout(f'{dot.engine} timed out')
+        return dot.source.encode()
+
+    monkeypatch.setattr(leanix, 'render_dot', fake_render)
+    formats = ['svg', 'pdf', 'png']
+    results = leanix.render_all(['app_arch'], formats, out_dir=str(tmp_path), timeout=1, reuse_layout=False,
+                                skip_unchanged=True)
+    assert all(r.ok for r in results)
+
+    original = [dot for dot, engine, _ in rendered if engine != leanix.SCALABLE_ENGINE]
+    fallbacks = [(dot, source) for dot, engine, source in rendered if engine == leanix.SCALABLE_ENGINE]
+    assert len(original) == len(fallbacks) == len(formats)
+    assert len({id(dot) for dot in original}) == 1  # one graph shared by the format jobs ...
+    assert original[0].engine == 'dot' and 'overlap' not in original[0].source  # ... left untouched
+    assert len({id(dot) for dot, _ in fallbacks}) == len(formats)
+    assert all(source.count('overlap=prism') == 1 for _, source in fallbacks)
+
+    manifest = json.loads((tmp_path / leanix.OUTPUT_MANIFEST).read_text())
+    fallback = fallbacks[0][0]
+    assert manifest['app_arch.svg'] == leanix._output_key(fallback, 'svg')
+
+    rendered.clear()
+    again = leanix.render_all(['app_arch'], formats, out_dir=str(tmp_path), timeout=1, reuse_layout=False,
+                              skip_unchanged=True)
+    assert all(r.skipped for r in again) and not rendered
+
+
+def test_failures_do_not_stop_the_others(tmp_path, monkeypatch):
+    delays = {'biz_arch': 0.4, 'app_arch': 0.0, 'roadmap': 0.2}
+
+    def fake_render(dot, format='svg', timeout=None, dpi=None):
+        time.sleep(delays.get(dot.view, 0))
+        if dot.view == 'app_arch' and format == 'pdf':
+            raise RuntimeError('dot failed: syntax error in line 1')
+        return f'{dot.view}.{format}'.encode()
+
+    def broken(model=None):
+        raise KeyError('no such element')
+
+    monkeypatch.setattr(leanix, 'render_dot', fake_render)
+    monkeypatch.setitem(leanix.VIEWS, 'broken', broken)
+    views, formats = ['biz_arch', 'broken', 'app_arch', 'roadmap'], ['svg', 'pdf']
+    start = time.perf_counter()
+    results = leanix.render_all(views, formats, jobs=8, out_dir=str(tmp_path), reuse_layout=False,
+                                skip_unchanged=True)
+    elapsed = time.perf_counter() - start
+
+    assert [(r.view, r.format) for r in results] == [(v, f) for v in views for f in formats]  # input order
+    failed = {(r.view, r.format): r.error for r in results if not r.ok}
+    assert list(failed) == [('broken', 'svg'), ('broken', 'pdf'), ('app_arch', 'pdf')]
+    assert isinstance(failed['broken', 'svg'], KeyError) and 'syntax error' in str(failed['app_arch', 'pdf'])
+    for r in results:
+        assert (r.path is not None) == r.ok
+        if r.ok:
+            assert (tmp_path / f'{r.view}.{r.format}').read_bytes() == f'{r.view}.{r.format}'.encode()
+    assert not (tmp_path / 'app_arch.pdf').exists()
+
+    timings = {(r.view, r.format): r for r in results}
+    assert all(r.build_seconds > 0 and r.seconds == r.build_seconds + r.render_seconds for r in results
+               if r.view != 'broken')
+    assert timings['biz_arch', 'svg'].render_seconds >= 0.4 and timings['roadmap', 'pdf'].render_seconds >= 0.2
+    assert timings['app_arch', 'svg'].render_seconds < 0.2
+    assert elapsed < sum(delays.values()) * len(formats)  # the jobs overlapped
+
+    manifest = json.loads((tmp_path / leanix.OUTPUT_MANIFEST).read_text())
+    assert sorted(manifest) == ['app_arch.svg', 'biz_arch.pdf', 'biz_arch.svg', 'roadmap.pdf', 'roadmap.svg']
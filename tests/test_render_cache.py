@@ -0,0 +1,98 @@
+import os
+
+import leanix
+
+
+def graph(name='G', label='A', **attrs):
+    dot = leanix.BulkDigraph(name)
+    dot.node('a', label, **attrs)
+    dot.node('b', 'B')
+    dot.edge('a', 'b')
+    return dot
+
+
+def test_memory_hits(fake_graphviz, tmp_path):
+    cache = leanix.RenderCache(str(tmp_path / 'cache'))
+    first = leanix.render_dot(graph(), 'svg', cache)
+    assert leanix.render_dot(graph(), 'svg', cache) == first
+    assert len(fake_graphviz.calls()) == 1
+    assert leanix.render_dot(graph(), 'png', cache) != first  # the format is part of the key
+    assert len(fake_graphviz.calls()) == 2
+    stats = cache.stats()
+    assert (stats['hits'], stats['disk_hits'], stats['misses'], stats['memory_items']) == (1, 0, 2, 2)
+
+
+def test_disk_hits_after_a_restart(fake_graphviz, tmp_path):
+    directory = str(tmp_path / 'cache')
+    first = leanix.render_dot(graph(), 'svg', leanix.RenderCache(directory))
+    key = leanix.RenderCache(directory).key(graph().source, 'dot', 'svg')
+    assert os.path.isfile(os.path.join(directory, key[:2], key))  # sharded by the key's first two characters
+
+    restarted = leanix.RenderCache(directory)
+    assert leanix.render_dot(graph(), 'svg', restarted) == first
+    assert leanix.render_dot(graph(), 'svg', restarted) == first
+    assert len(fake_graphviz.calls()) == 1
+    stats = restarted.stats()
+    assert (stats['hits'], stats['disk_hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0, 1.0)
+
+    memory_only = leanix.RenderCache(None)
+    leanix.render_dot(graph(), 'svg', memory_only)
+    assert len(fake_graphviz.calls()) == 2
+
+
+def test_memory_lru(fake_graphviz, tmp_path):
+    cache = leanix.RenderCache(str(tmp_path / 'cache'), max_items=2)
+    for label in ('A', 'B', 'C'):
+        leanix.render_dot(graph(label=label), 'svg', cache)
+    assert cache.stats()['memory_items'] == 2
+    leanix.render_dot(graph(label='A'), 'svg', cache)  # dropped from memory, still on disk
+    assert (cache.disk_hits, cache.hits) == (1, 0)
+    assert len(fake_graphviz.calls()) == 3
+
+
+def test_disk_eviction_keeps_the_tier_under_its_budget(fake_graphviz, tmp_path):
+    directory = str(tmp_path / 'cache')
+    size = len(leanix.render_dot(graph(label='size probe'), 'svg', leanix.RenderCache(None)))
+    cache = leanix.RenderCache(directory, max_disk_bytes=size * 3)
+    keys = []
+    for i in range(6):
+        dot = graph(label=f'node {i:05d}')
+        leanix.render_dot(dot, 'svg', cache)
+        keys.append(cache.key(dot.source, 'dot', 'svg'))
+        os.utime(os.path.join(directory, keys[-1][:2], keys[-1]), ns=(i * 10 ** 9, i * 10 ** 9))
+    on_disk = {name for _, _, names in os.walk(directory) for name in names}
+    assert cache.stats()['disk_bytes'] <= size * 3
+    assert keys[-1] in on_disk and keys[0] not in on_disk  # least recently used go first
+    assert len(on_disk) < len(keys)
+
+    restarted = leanix.RenderCache(directory, max_disk_bytes=size * 3)
+    leanix.render_dot(graph(label='node 00000'), 'svg', restarted)
+    assert restarted.stats()['misses'] == 1
+
+
+def test_icon_changes_change_the_key(fake_graphviz, tmp_path):
+    icon = tmp_path / 'icon.png'
+    icon.write_bytes(b'first')
+    cache = leanix.RenderCache(str(tmp_path / 'cache'))
+    dot = graph(image=str(icon), shape='none')
+    before = cache.key(dot.source, 'dot', 'png')
+    leanix.render_dot(dot, 'png', cache)
+
+    st = icon.stat()
+    os.utime(icon, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    after = cache.key(dot.source, 'dot', 'png')
+    assert after != before
+    leanix.render_dot(dot, 'png', cache)
+    assert len(fake_graphviz.calls()) == 2
+
+    icon.unlink()
+    assert cache.key(dot.source, 'dot', 'png') not in (before, after)
+
+
+def test_clear(fake_graphviz, tmp_path):
+    cache = leanix.RenderCache(str(tmp_path / 'cache'))
+    leanix.render_dot(graph(), 'svg', cache)
+    cache.clear(disk=True)
+    assert cache.stats()['memory_items'] == 0
+    leanix.render_dot(graph(), 'svg', cache)
+    assert len(fake_graphviz.calls()) == 2
@@ -0,0 +1,31 @@
+import pytest
+
+import leanix
+
+pd = pytest.importorskip('pandas')
+
+
+@pytest.fixture
+def frame():
+    return leanix.roadmap_frame()
+
+
+def test_load_roadmap_in_chunks(frame, tmp_path):
+    path = tmp_path / 'roadmap.csv'
+    frame.to_csv(path, index=False)
+    whole = leanix.load_roadmap(str(path), chunk_rows=len(frame) + 1)
+    leanix._roadmap_frames.clear()
+    chunked = leanix.load_roadmap(str(path), chunk_rows=3)
+    pd.testing.assert_frame_equal(chunked, whole, check_categorical=False)  # same values, category order may differ
+    pd.testing.assert_frame_equal(chunked.astype(str), frame.astype(str))
+    assert all(str(chunked[c].dtype) == 'category' for c in ('Component', 'Phase', 'Type'))
+    assert leanix.load_roadmap(str(path), chunk_rows=3) is chunked  # unchanged file: cached frame
+
+
+def test_load_roadmap_rejects_bad_rows(frame, tmp_path):
+    bad = frame.copy()
+    bad.loc[4, 'End'] = bad.loc[4, 'Start'] - pd.Timedelta(days=1)
+    path = tmp_path / 'bad.csv'
+    bad.to_csv(path, index=False)
+    with pytest.raises(ValueError, match=r'roadmap rows \[4\]'):
+        leanix.load_roadmap(str(path), chunk_rows=3)
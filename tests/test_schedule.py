@@ -0,0 +1,27 @@
+import pytest
+
+import leanix
+
+
+def test_critical_path_of_the_example_roadmap():
+    s = leanix.schedule(leanix.example_model())
+    assert s.length == 90
+    assert s.critical_path() == ['T1', 'T2', 'T3', 'T4', 'T5', 'M3']
+    assert s.critical_edges() == {('T1', 'T2'), ('T2', 'T3'), ('T3', 'T4'), ('T4', 'T5'), ('T5', 'M3')}
+    assert {id for id in s.order if not s.is_critical(id)} == {'M1', 'T6', 'M2'}
+    assert (s.earliest_start['T3'], s.earliest_finish('T3')) == (25, 65)
+    assert s.slack('T6') == s.latest_start['T6'] - s.earliest_start['T6'] > 0
+    # every dependency is respected
+    for a in s.order:
+        for b in s.successors[a]:
+            assert s.earliest_finish(a) <= s.earliest_start[b]
+            assert s.latest_finish(a) <= s.latest_start[b]
+
+
+def test_dependency_cycle_is_reported():
+    model = leanix.example_model()
+    model.relate('T5', 'T2', 'precedes')
+    with pytest.raises(leanix.ScheduleCycleError) as info:
+        leanix.schedule(model)
+    cycle = info.value.cycle
+    assert cycle[0] == cycle[-1] and {'T2', 'T3', 'T4', 'T5'} <= set(cycle)
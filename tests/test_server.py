@@ -0,0 +1,111 @@
+import http.client
+import threading
+import time
+
+import pytest
+
+import leanix
+
+
+class FakeRender:
+    # Graphviz stand-in: the "rendered" body is the DOT source, so filters show up in it. Clearing
+    # gate holds every render until it is set again.
+    def __init__(self):
+        self.calls = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, dot, format='png', cache=None, timeout=None, dpi=None):
+        self.calls.append((leanix._view_of(dot), format))
+        self.gate.wait(5)
+        return dot.source.encode()
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    fake = FakeRender()
+    monkeypatch.setattr(leanix, 'render_dot', fake)
+    return fake
+
+
+@pytest.fixture
+def server():
+    with leanix.RenderServer(leanix.example_model(), port=0, jobs=2) as server:
+        yield server
+
+
+def test_render_etag_and_not_modified(server, renders):
+    status, headers, body = server.get('/views/app_arch.svg')
+    assert status == 200 and headers['Content-Type'] == 'image/svg+xml'
+    assert body.startswith(b'digraph') and b'APP1' in body
+    etag = headers['ETag']
+    assert server.get('/views/app_arch.svg') == (200, headers, body)  # served from the response cache
+    assert server.get('/views/app_arch.svg', if_none_match=etag)[0] == 304
+    assert server.get('/views/app_arch.svg', if_none_match=f'"other", {etag}')[0] == 304
+    assert renders.calls == [('app_arch', 'svg')]
+
+    server.model.update('APP1', label='Renamed')
+    status, headers, body = server.get('/views/app_arch.svg', if_none_match=etag)
+    assert status == 200 and headers['ETag'] != etag and b'Renamed' in body
+
+
+def test_filters(server, renders):
+    _, _, body = server.get('/views/app_arch.svg?type=application,capability')
+    assert b'\tAPP1 [' in body and b'\tCAP1 [' in body
+    assert b'IF1' not in body and b'EXT1' not in body
+    assert b'L1 [' in body  # ids that are not model elements (the legend) are kept
+    assert server.get('/views/app_arch.svg?type=application')[1]['ETag'] != \
+           server.get('/views/app_arch.svg?type=application,capability')[1]['ETag']
+
+
+def test_bad_requests(server, renders):
+    assert server.get('/views/nope.svg')[0] == 404
+    assert server.get('/elsewhere')[0] == 404
+    assert server.get('/views/app_arch.bmp')[0] == 400
+    assert server.get('/views/app_arch.svg?colour=red')[0] == 400
+    assert server.get('/views/app_arch.png?dpi=high')[0] == 400
+    assert renders.calls == []
+    assert server.stats()['requests'] == 5
+
+
+def test_invalid_view_is_unprocessable(server, renders):
+    server.model.relate('APP1', 'MISSING', 'uses')
+    status, _, body = server.get('/views/app_arch.svg')
+    assert status == 422 and b'MISSING' in body and renders.calls == []
+
+
+def test_coalescing_and_queue_limit(renders):
+    renders.gate.clear()
+    results = []
+    with leanix.RenderServer(leanix.example_model(), port=0, jobs=1, max_pending=1) as server:
+        waiters = [threading.Thread(target=lambda: results.append(server.get('/views/app_arch.svg')))
+                   for _ in range(3)]
+        for thread in waiters:
+            thread.start()
+        deadline = time.time() + 5
+        while server.stats()['coalesced'] < 2 and time.time() < deadline:  # all three wait on one render
+            time.sleep(0.01)
+        status, headers, _ = server.get('/views/biz_arch.svg')  # the one render slot is taken
+        assert status == 503 and headers['Retry-After'] == '1'
+        renders.gate.set()
+        for thread in waiters:
+            thread.join(5)
+        stats = server.stats()
+    assert [status for status, _, _ in results] == [200, 200, 200]
+    assert renders.calls == [('app_arch', 'svg')]
+    assert (stats['renders'], stats['coalesced'], stats['rejected']) == (1, 2, 1)
+
+
+def test_http(server, renders):
+    server.start()
+    connection = http.client.HTTPConnection(*server.httpd.server_address[:2], timeout=5)
+    connection.request('GET', '/views/roadmap.svg')
+    response = connection.getresponse()
+    body, etag = response.read(), response.getheader('ETag')
+    assert response.status == 200 and body.startswith(b'digraph')
+    connection.request('GET', '/views/roadmap.svg', headers={'If-None-Match': etag})
+    response = connection.getresponse()
+    assert response.status == 304 and response.read() == b''
+    connection.request('GET', '/views/roadmap.svg?type=nothing,at-all')
+    assert connection.getresponse().status == 200
+    connection.close()
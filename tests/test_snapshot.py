@@ -0,0 +1,75 @@
+import struct
+
+import pytest
+
+import leanix
+
+
+def dump(model):
+    return ([(e.id, e.type, e.label, e.layer, e.state, e.props) for e in model.elements.values()],
+            [(r.source, r.target, r.type, r.label, r.props) for r in model.relations])
+
+
+@pytest.fixture
+def saved(tmp_path):
+    model = leanix.example_model()
+    model.update('APP1', label='Order Portal – ünïcode', owner=None, tags=['a', 'b'], cost=12.5)
+    path = str(tmp_path / 'model.lxs')
+    leanix.save_snapshot(model, path)
+    return model, path
+
+
+def test_round_trip(saved):
+    model, path = saved
+    assert dump(leanix.load_snapshot(path, verify=True)) == dump(model)
+    assert dump(leanix.load_model(path)) == dump(model)  # detected by its magic bytes
+    with leanix.Snapshot(path) as snapshot:
+        assert set(snapshot.types()) == {e.type for e in model.elements.values()}
+        roadmap = snapshot.model(('task', 'milestone'))
+    assert {e.type for e in roadmap.elements.values()} == {'task', 'milestone'}
+    assert all(r.source in roadmap and r.target in roadmap for r in roadmap.relations)
+    assert leanix.schedule(roadmap).critical_path() == leanix.schedule(model).critical_path()
+
+
+def test_pathlib_paths(tmp_path):
+    model = leanix.example_model()
+    leanix.save_snapshot(model, tmp_path / 'model.lxs')
+    assert dump(leanix.load_snapshot(tmp_path / 'model.lxs')) == dump(model)
+    assert [p.name for p in tmp_path.iterdir()] == ['model.lxs']
+
+
+def corrupt(path, offset, data):
+    with open(path, 'r+b') as f:
+        f.seek(offset)
+        f.write(data)
+
+
+def test_wrong_magic_and_version(saved, tmp_path):
+    _, path = saved
+    other = tmp_path / 'model.json'
+    other.write_text('{"elements": [], "relations": []}' + ' ' * 64)
+    with pytest.raises(leanix.SnapshotError, match='not a leanix snapshot'):
+        leanix.load_snapshot(str(other))
+    corrupt(path, len(leanix.SNAPSHOT_MAGIC), struct.pack('<I', leanix.SNAPSHOT_VERSION + 1))
+    with pytest.raises(leanix.SnapshotError, match='snapshot version'):
+        leanix.load_snapshot(path)
+
+
+def test_truncated_and_corrupt_files(saved, tmp_path):
+    _, path = saved
+    data = open(path, 'rb').read()
+    truncated = tmp_path / 'truncated.lxs'
+    truncated.write_bytes(data[:10])
+    with pytest.raises(leanix.SnapshotError, match='truncated'):
+        leanix.load_snapshot(str(truncated))
+
+    directory = tmp_path / 'directory.lxs'
+    directory.write_bytes(data[:20] + bytes([data[20] ^ 0xFF]) + data[21:])
+    with pytest.raises(leanix.SnapshotError, match='corrupt section directory'):
+        leanix.load_snapshot(str(directory))
+
+    corrupt(path, len(data) - 3, bytes([data[-3] ^ 0xFF]))  # inside the last section
+    leanix.Snapshot(path).close()  # opening only checks the directory ...
+    with pytest.raises(leanix.SnapshotError, match='checksum'):
+        leanix.load_snapshot(path, verify=True)  # ... verify checks every section
+    assert isinstance(leanix.SnapshotError('x'), ValueError)
@@ -0,0 +1,82 @@
+import pytest
+
+import leanix
+
+
+def kinds(issues):
+    return sorted(issue.kind for issue in issues)
+
+
+def test_example_model_and_views_are_clean():
+    assert leanix.validate_model(leanix.example_model()) == []
+    for build in leanix.VIEWS.values():
+        assert leanix.validate_view(build(), leanix.MODEL) == []
+
+
+def test_bad_relations_are_reported_together():
+    model = leanix.example_model()
+    model.relate('APP1', 'CAP1', 'hosted_on')  # application -> business
+    model.relate('VC1', 'INF3', 'realizes')  # business -> technology
+    model.relate('APP1', 'INF8', 'frobs')
+    model.relate('APP1', 'NOPE', 'uses')
+    existing = model.outgoing('APP1')[0]
+    model.relate(existing.source, existing.target, existing.type, existing.label)  # already related
+    issues = leanix.validate_model(model)
+    assert kinds(issues) == ['dangling reference', 'duplicate relation', 'layer violation', 'layer violation',
+                             'unknown relation type']
+    violation = next(issue for issue in issues if issue.kind == 'layer violation')
+    assert violation.ids == ('APP1', 'CAP1') and 'application' in violation.message
+
+    with pytest.raises(leanix.ValidationError) as info:
+        leanix.build_app_arch(model)
+    assert info.value.view == 'app_arch'
+    assert {'dangling reference', 'duplicate relation', 'layer violation', 'unknown relation type'} <= \
+           set(kinds(info.value.issues))
+    assert all(issue.kind + ': ' + issue.message in str(info.value) for issue in info.value.issues)
+
+
+def test_same_layer_relations():
+    model = leanix.ArchitectureModel()
+    model.add('A', 'application', 'A', 'application')
+    model.add('T', 'infrastructure', 'T', 'technology')
+    model.relate('A', 'T', 'replaces')
+    assert kinds(leanix.validate_model(model)) == ['layer violation']
+
+
+def test_view_level_checks():
+    dot = leanix.BulkDigraph('G')
+    dot.node('a', 'A')
+    dot.node('a', 'B')
+    dot.node('b')
+    dot.node('b', 'B')  # a label for a node first declared without one is fine
+    dot.edge('a', 'zz')
+    dot.edge('a', 'zz')
+    with dot.subgraph(name='cluster_legend') as legend:
+        legend.node('APP1', 'Legend entry')
+    assert kinds(leanix.validate_view(dot)) == ['dangling reference', 'duplicate edge', 'id collision']
+    assert kinds(leanix.validate_view(dot, leanix.MODEL)) == ['dangling reference', 'duplicate edge',
+                                                              'id collision', 'id collision']
+
+
+def test_model_checks_follow_edits(monkeypatch):
+    model = leanix.example_model()
+    assert leanix.validate_view(leanix.build_app_arch(model), model) == []
+    relation = model.relate('APP1', 'NOPE', 'uses')
+    assert kinds(leanix.validate_view(leanix.build_tobe_app_arch(model), model)) == []  # APP1 not drawn
+    model.unrelate(relation)
+    assert leanix.validate_view(leanix.build_app_arch(model), model) == []
+    monkeypatch.setattr(leanix, 'VALIDATE_VIEWS', False)
+    model.relate('APP1', 'NOPE', 'uses')
+    leanix.build_app_arch(model)  # switched off
+
+
+def test_views_are_validated_against_the_model_they_draw(monkeypatch):
+    seen = []
+    validate_view = leanix.validate_view
+    monkeypatch.setattr(leanix, 'validate_view',
+                        lambda dot, model=None: seen.append(model) or validate_view(dot, model))
+    empty = leanix.ArchitectureModel()
+    leanix.build_app_arch(empty)
+    leanix.build_app_arch(model=empty)
+    leanix.build_app_arch()
+    assert seen[0] is empty and seen[1] is empty and seen[2] is leanix.MODEL